@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Requests and bytes for a synthetic session: one POST per event vs the
+batched NDJSON format (lib/batch.py), with and without gzip.
+
+Usage:
+    python3 bench_batch.py [--events 2000] [--batch 100]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from collector import start_collector
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "hooks"))
+
+from lib import batch  # noqa: E402
+from lib.send_event import MonitorConnection, serialize_event  # noqa: E402
+
+COMMON = {
+    "session_id": "6f1c3e0e-7d6b-4d59-9a5e-2f0c5f1f7a11",
+    "transcript_path": "/home/dev/.claude/projects/app/6f1c3e0e.jsonl",
+    "cwd": "/home/dev/src/app",
+    "project": "app",
+    "aiox_repo_root": "/home/dev/src/app",
+    "aiox_git_branch": "feature/story-4.2",
+    "aiox_agent": "dev",
+    "aiox_story_id": "4.2",
+}
+
+
+def session_events(count: int) -> list[bytes]:
+    """A tool-heavy session: Pre/Post pairs with the odd prompt."""
+    events = []
+    for i in range(count):
+        if i % 50 == 0:
+            events.append(serialize_event("UserPromptSubmit", {**COMMON, "user_prompt": f"@dev continue task {i}"}))
+        elif i % 2:
+            events.append(serialize_event("PreToolUse", {
+                **COMMON,
+                "tool_name": "Read",
+                "tool_use_id": f"toolu_{i:06d}",
+                "tool_input": {"file_path": f"/home/dev/src/app/src/module_{i % 40}.py"},
+            }))
+        else:
+            events.append(serialize_event("PostToolUse", {
+                **COMMON,
+                "tool_name": "Read",
+                "tool_use_id": f"toolu_{i - 1:06d}",
+                "tool_input": {"file_path": f"/home/dev/src/app/src/module_{i % 40}.py"},
+                "tool_result": f"def handler_{i % 40}(request):\n    return respond(request)\n" * 12,
+            }))
+    return events
+
+
+def measure(events: list[bytes], batch_size: int, gzip: bool | None) -> tuple[int, int, float]:
+    """(requests, bytes, seconds) against a fresh collector. gzip None = unbatched."""
+    collector = start_collector()
+    conn = MonitorConnection(collector.url, 2000)
+    start = time.perf_counter()
+    if gzip is None:
+        for payload in events:
+            conn.post("/events", payload)
+    else:
+        batch.GZIP = gzip
+        for i in range(0, len(events), batch_size):
+            batch.post_events(conn, events[i:i + batch_size])
+    elapsed = time.perf_counter() - start
+    conn.close()
+    collector.shutdown()
+    return collector.requests, collector.bytes, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--batch", type=int, default=batch.MAX_EVENTS)
+    args = parser.parse_args()
+
+    events = session_events(args.events)
+    print(f"{'format':<16}{'requests':>10}{'bytes':>12}{'ms':>10}")
+    for label, gzip in (("single", None), ("ndjson", False), ("ndjson+gzip", True)):
+        requests, size, elapsed = measure(events, args.batch, gzip)
+        print(f"{label:<16}{requests:>10}{size:>12}{elapsed * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Per-event hook cost with and without the hook daemon.
+
+Runs every hook script N times in-process (direct delivery) and N times
+with AIOX_MONITOR_DAEMON=1 against a running daemon.py, both pointed at a
+local stand-in collector, and prints the median wall time per event type.
+
+Usage:
+    python3 bench_daemon.py [--runs 30]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from collector import start_collector
+
+HOOKS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "hooks")
+
+SAMPLES = {
+    "PreToolUse": ("pre_tool_use", {"tool_name": "Bash", "tool_input": {"command": "ls -la"}}),
+    "PostToolUse": ("post_tool_use", {"tool_name": "Read", "tool_input": {"file_path": "README.md"}, "tool_result": "x" * 4000}),
+    "UserPromptSubmit": ("user_prompt_submit", {"user_prompt": "@dev implement the story"}),
+    "Stop": ("stop", {}),
+    "SubagentStop": ("subagent_stop", {}),
+    "Notification": ("notification", {"message": "Waiting for input"}),
+    "PreCompact": ("pre_compact", {"trigger": "auto"}),
+}
+
+
+def time_hook(script: str, payload: bytes, env: dict[str, str], runs: int) -> float:
+    """Median wall time (ms) of one hook process."""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, script], input=payload, env=env, check=True)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=30)
+    args = parser.parse_args()
+
+    collector = start_collector()
+    state_dir = tempfile.mkdtemp(prefix="aiox-bench-")
+    env = {
+        **os.environ,
+        "AIOX_MONITOR_URL": collector.url,
+        "AIOX_MONITOR_STATE_DIR": state_dir,
+        "AIOX_MONITOR_DELIVERY": "direct",
+    }
+    daemon_env = {**env, "AIOX_MONITOR_DAEMON": "1"}
+
+    daemon = subprocess.Popen(
+        [sys.executable, os.path.join(HOOKS_DIR, "daemon.py")],
+        env=env, stderr=subprocess.DEVNULL,
+    )
+    socket_path = os.path.join(state_dir, "daemon.sock")
+    while not os.path.exists(socket_path):
+        time.sleep(0.01)
+
+    try:
+        print(f"{'event':<18} {'in-process ms':>14} {'daemon ms':>10} {'speedup':>8}")
+        for event_type, (hook, sample) in SAMPLES.items():
+            script = os.path.join(HOOKS_DIR, f"{hook}.py")
+            payload = json.dumps({"session_id": "bench", "cwd": os.getcwd(), **sample}).encode()
+            direct = time_hook(script, payload, env, args.runs)
+            forwarded = time_hook(script, payload, daemon_env, args.runs)
+            print(f"{event_type:<18} {direct:>14.1f} {forwarded:>10.1f} {direct / forwarded:>7.1f}x")
+    finally:
+        daemon.terminate()
+        daemon.wait()
+
+    print(f"\ncollector received {collector.requests} requests ({collector.bytes} bytes)")
+
+
+if __name__ == "__main__":
+    main()
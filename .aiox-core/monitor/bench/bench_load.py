@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Hook throughput and latency under parallel load.
+
+Runs the hook scripts as separate processes, the way Claude does, with
+1 to 64 of them in flight at once, against a local stand-in collector
+(optionally slow or failing, see collector.py). Payloads cycle through
+synthetic profiles (payloads.py). Hooks run with AIOX_MONITOR_TIMINGS=1,
+so besides hooks/s and p50/p95/p99 wall time per concurrency level the
+median of every hook phase (lib/timing.PHASES) is reported.
+
+Usage:
+    python3 bench_load.py [--levels 1,4,16,64] [--requests 128]
+        [--profiles prompt-small,pre-tool,post-small,post-1m]
+        [--latency-ms 20] [--fail-rate 0.05]
+"""
+
+import argparse
+import math
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from collector import start_collector
+from payloads import HOOKS, PROFILES, generate
+
+HOOKS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "hooks")
+sys.path.insert(0, HOOKS_DIR)
+
+from lib.timing import PHASES  # noqa: E402
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of sorted values."""
+    return values[max(0, min(len(values), math.ceil(pct / 100 * len(values))) - 1)]
+
+
+def run_hook(script: str, payload: bytes, env: dict[str, str]) -> float:
+    """Wall time (ms) of one hook process."""
+    env = {**env, "AIOX_MONITOR_SPAWN_NS": str(time.time_ns())}
+    start = time.perf_counter()
+    subprocess.run([sys.executable, script], input=payload, env=env, check=True)
+    return (time.perf_counter() - start) * 1000
+
+
+def run_level(level: int, jobs: list[tuple[str, bytes]], env: dict[str, str]) -> tuple[list[float], float]:
+    """(sorted hook wall times in ms, elapsed s) with level hooks in flight."""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=level) as pool:
+        times = list(pool.map(lambda job: run_hook(job[0], job[1], env), jobs))
+    return sorted(times), time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--levels", default="1,2,4,8,16,32,64", help="Concurrency levels")
+    parser.add_argument("--requests", type=int, default=128, help="Hook runs per level")
+    parser.add_argument("--profiles", default="prompt-small,pre-tool,post-small,post-1m")
+    parser.add_argument("--latency-ms", type=float, default=0, help="Collector delay per request")
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Share of collector requests failing")
+    parser.add_argument("--fail-status", type=int, default=503)
+    args = parser.parse_args()
+
+    profiles = args.profiles.split(",")
+    for name in profiles:
+        if name not in PROFILES:
+            parser.error(f"unknown profile {name!r} (see payloads.py --list)")
+    payloads = {name: generate(name) for name in profiles}
+    jobs = []
+    for i in range(args.requests):
+        name = profiles[i % len(profiles)]
+        jobs.append((os.path.join(HOOKS_DIR, f"{HOOKS[PROFILES[name][0]]}.py"), payloads[name]))
+
+    collector = start_collector(
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+        fail_rate=args.fail_rate, fail_status=args.fail_status, keep=True,
+    )
+    env = {
+        **os.environ,
+        "AIOX_MONITOR_URL": collector.url,
+        "AIOX_MONITOR_STATE_DIR": tempfile.mkdtemp(prefix="aiox-bench-"),
+        "AIOX_MONITOR_DELIVERY": "direct",
+        "AIOX_MONITOR_TIMINGS": "1",
+    }
+    env.pop("AIOX_MONITOR_DAEMON", None)
+
+    sizes = ", ".join(f"{name} {len(payloads[name]) / 1024:.0f} KiB" for name in profiles)
+    print(f"{args.requests} hooks per level ({sizes})")
+    phases = "".join(f" {phase + ' ms':>11}" for phase in PHASES)
+    print(f"{'level':>5} {'hooks/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}{phases}")
+    try:
+        for level in (int(n) for n in args.levels.split(",")):
+            with collector.lock:
+                collector.bodies.clear()
+            times, elapsed = run_level(level, jobs, env)
+
+            timings = [e["data"] for e in collector.events() if e.get("type") == "HookTimings"]
+            medians = ""
+            for phase in PHASES:
+                values = [t["phases"][phase] for t in timings if phase in t.get("phases", {})]
+                medians += f" {statistics.median(values):>11.2f}" if values else f" {'-':>11}"
+            print(
+                f"{level:>5} {len(times) / elapsed:>8.1f} {percentile(times, 50):>8.1f} "
+                f"{percentile(times, 95):>8.1f} {percentile(times, 99):>8.1f} {times[-1]:>8.1f}{medians}"
+            )
+    finally:
+        collector.shutdown()
+
+    print(f"\ncollector: {collector.requests} requests, {collector.failures} failed, {collector.bytes} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Hook cold-start import budget.
+
+Runs dispatch.py once per event type under `python -X importtime` (direct
+delivery to a local stand-in collector), sums the cumulative import time of
+everything the hook loads beyond a bare interpreter, and fails if any event
+type exceeds its budget from startup_budget.json.
+
+Usage:
+    python3 bench_startup.py [--runs 5] [--budget startup_budget.json] [--no-compile]
+
+Exit codes:
+    0 - All event types within budget
+    1 - At least one event type over budget
+"""
+
+import argparse
+import compileall
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from collector import start_collector
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+HOOKS_DIR = os.path.join(BENCH_DIR, "..", "hooks")
+
+SAMPLES = {
+    "PreToolUse": {"tool_name": "Bash", "tool_input": {"command": "ls -la"}},
+    "PostToolUse": {"tool_name": "Read", "tool_input": {"file_path": "README.md"}, "tool_result": "x" * 4000},
+    "UserPromptSubmit": {"user_prompt": "@dev implement the story"},
+    "Stop": {},
+    "SubagentStop": {},
+    "Notification": {"message": "Waiting for input"},
+    "PreCompact": {"trigger": "auto"},
+}
+
+
+def top_level_imports(stderr: str) -> dict[str, int]:
+    """Parse -X importtime output into {top-level module: cumulative us}."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        # Nested imports are indented under their importer
+        if not name[1:].startswith(" "):
+            modules[name.strip()] = int(cumulative)
+    return modules
+
+
+def import_time_ms(args: list[str], payload: bytes, env: dict[str, str], baseline: set[str]) -> tuple[float, list[str]]:
+    """Import time (ms) beyond the bare interpreter, and the modules counted."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        input=payload, env=env, capture_output=True, check=True,
+    )
+    modules = top_level_imports(result.stderr.decode())
+    extra = {name: us for name, us in modules.items() if name not in baseline}
+    return sum(extra.values()) / 1000, sorted(extra, key=extra.get, reverse=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hook cold-start import budget")
+    parser.add_argument("--runs", type=int, default=5, help="Best of N runs per event")
+    parser.add_argument("--budget", default=os.path.join(BENCH_DIR, "startup_budget.json"))
+    parser.add_argument("--no-compile", action="store_true", help="Measure without precompiled bytecode")
+    args = parser.parse_args()
+
+    with open(args.budget, "r", encoding="utf-8") as f:
+        budget = json.load(f)
+
+    if not args.no_compile:
+        # Same as install-monitor-hooks.sh
+        compileall.compile_dir(HOOKS_DIR, quiet=1)
+
+    collector = start_collector()
+    env = {
+        **os.environ,
+        "AIOX_MONITOR_URL": collector.url,
+        "AIOX_MONITOR_STATE_DIR": tempfile.mkdtemp(prefix="aiox-bench-"),
+        "AIOX_MONITOR_DELIVERY": "direct",
+    }
+    env.pop("AIOX_MONITOR_DAEMON", None)
+
+    baseline = set(top_level_imports(subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "pass"],
+        capture_output=True, check=True,
+    ).stderr.decode()))
+
+    failed = False
+    print(f"{'event':<18} {'import ms':>10} {'budget ms':>10}  heaviest imports")
+    for event_type, sample in SAMPLES.items():
+        payload = json.dumps({"session_id": "bench", "cwd": os.getcwd(), **sample}).encode()
+        runs = [
+            import_time_ms([os.path.join(HOOKS_DIR, "dispatch.py"), event_type], payload, env, baseline)
+            for _ in range(args.runs)
+        ]
+        ms, modules = min(runs)
+        limit = budget.get("events", {}).get(event_type, budget["default_ms"])
+        status = "" if ms <= limit else "  OVER BUDGET"
+        failed |= ms > limit
+        print(f"{event_type:<18} {ms:>10.1f} {limit:>10.1f}  {', '.join(modules[:4])}{status}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
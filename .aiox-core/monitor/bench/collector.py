@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the monitor server's /events endpoint.
+
+Accepts and counts events so hook benchmarks don't depend on a running
+monitor server. Server behaviour can be degraded on purpose: every request
+is delayed by --latency-ms (plus up to --jitter-ms), and a --fail-rate
+share of them is answered with --fail-status (503 by default) or, with
+status 0, by closing the connection without a response.
+
+Usage:
+    python3 collector.py --port 4001 [--latency-ms 50] [--fail-rate 0.1]
+"""
+
+import argparse
+import http.server
+import random
+import threading
+import time
+
+
+class CollectorHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        server = self.server
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with server.lock:
+            server.requests += 1
+            server.bytes += len(body)
+            delay = server.latency_ms + server.random.random() * server.jitter_ms
+            failed = server.random.random() < server.fail_rate
+            if failed:
+                server.failures += 1
+            elif server.keep:
+                server.bodies.append((self.path, self.headers.get("Content-Encoding"), body))
+
+        if delay:
+            time.sleep(delay / 1000)
+        if failed and not server.fail_status:
+            self.close_connection = True
+            return
+        self.send_response(server.fail_status if failed else 200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class Collector(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        port: int = 0,
+        latency_ms: float = 0,
+        jitter_ms: float = 0,
+        fail_rate: float = 0.0,
+        fail_status: int = 503,
+        keep: bool = False,
+        seed: int = 0,
+    ):
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.bytes = 0
+        self.failures = 0
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.fail_rate = fail_rate
+        self.fail_status = fail_status
+        self.keep = keep
+        self.bodies: list[tuple[str, str | None, bytes]] = []  # (path, encoding, body) with keep
+        self.random = random.Random(seed)
+        super().__init__(("127.0.0.1", port), CollectorHandler)
+
+    def events(self) -> list[dict]:
+        """Events of the accepted requests (keep=True), batches unpacked."""
+        import gzip
+        import json
+
+        events = []
+        for path, encoding, body in self.bodies:
+            if encoding == "gzip":
+                body = gzip.decompress(body)
+            if path.endswith("/batch"):
+                lines = body.splitlines()
+                common = json.loads(lines[0]).get("common", {})
+                for line in lines[1:]:
+                    event = json.loads(line)
+                    event["data"] = {**common, **event.get("data", {})}
+                    events.append(event)
+            else:
+                events.append(json.loads(body))
+        return events
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+def start_collector(port: int = 0, **options) -> Collector:
+    """Start a collector on a background thread (port 0 = ephemeral)."""
+    collector = Collector(port, **options)
+    threading.Thread(target=collector.serve_forever, daemon=True).start()
+    return collector
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stand-in AIOX monitor /events collector")
+    parser.add_argument("--port", type=int, default=4001)
+    parser.add_argument("--latency-ms", type=float, default=0, help="Delay before every response")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="Extra random delay, up to this")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Share of requests that fail (0-1)")
+    parser.add_argument("--fail-status", type=int, default=503, help="Status of failed requests (0 = drop the connection)")
+    args = parser.parse_args()
+
+    collector = Collector(
+        args.port, args.latency_ms, args.jitter_ms, args.fail_rate, args.fail_status,
+    )
+    print(f"Collecting on {collector.url}/events")
+    try:
+        collector.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n{collector.requests} requests ({collector.failures} failed), {collector.bytes} bytes")
+
+
+if __name__ == "__main__":
+    main()
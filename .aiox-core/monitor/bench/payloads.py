@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Synthetic hook payloads, from small prompts to multi-MB tool results.
+
+Each profile is an event type and the approximate size of its stdin
+payload. Content looks like real sessions (source lines, shell output,
+paths, non-ASCII text and characters that need JSON escaping) and is
+deterministic per seed, so runs are comparable.
+
+Usage:
+    python3 payloads.py --list
+    python3 payloads.py post-1m [--seed 1] > payload.json
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+
+KIB = 1024
+MIB = 1024 * KIB
+
+# Profile -> (event type, target payload bytes)
+PROFILES = {
+    "prompt-small": ("UserPromptSubmit", 200),
+    "prompt-large": ("UserPromptSubmit", 64 * KIB),
+    "pre-tool": ("PreToolUse", 1 * KIB),
+    "post-small": ("PostToolUse", 4 * KIB),
+    "post-100k": ("PostToolUse", 100 * KIB),
+    "post-1m": ("PostToolUse", 1 * MIB),
+    "post-8m": ("PostToolUse", 8 * MIB),
+    "stop": ("Stop", 200),
+}
+
+# Hook script per event type (dispatch.py wrappers)
+HOOKS = {
+    "PreToolUse": "pre_tool_use",
+    "PostToolUse": "post_tool_use",
+    "UserPromptSubmit": "user_prompt_submit",
+    "Stop": "stop",
+    "SubagentStop": "subagent_stop",
+    "Notification": "notification",
+    "PreCompact": "pre_compact",
+}
+
+_LINES = (
+    'def handle_{n}(request):\n    return respond(request, status=200)\n',
+    '-rw-r--r--  1 dev  staff  {n:>6} Oct 18 09:12 src/module_{n}.py\n',
+    '    "key_{n}": "value with \\"quotes\\" and a \\\\ backslash",\n',
+    'ERROR [{n}] conexão recusada — tentando novamente em 5s\n',
+    '\tat com.example.Service.call(Service.java:{n})\n',
+    '// TODO({n}): naïve O(n²) loop, revisit 🚧\n',
+)
+
+
+def filler(size: int, rng: random.Random) -> str:
+    """Text of about size chars made of varied, realistic lines."""
+    block = "".join(rng.choice(_LINES).format(n=rng.randrange(10000)) for _ in range(64))
+    repeats, rest = divmod(size, len(block))
+    return block * repeats + block[:rest]
+
+
+def generate(profile: str, seed: int = 0) -> bytes:
+    """Hook stdin payload (JSON bytes) for a profile."""
+    event_type, size = PROFILES[profile]
+    rng = random.Random(seed)
+    session = f"bench-{seed:04d}"
+    data = {
+        "session_id": session,
+        "transcript_path": f"/home/dev/.claude/projects/app/{session}.jsonl",
+        "cwd": os.getcwd(),
+        "hook_event_name": event_type,
+    }
+    base = len(json.dumps(data))
+
+    if event_type == "UserPromptSubmit":
+        data["user_prompt"] = "@dev " + filler(max(0, size - base - 40), rng)
+    elif event_type == "PreToolUse":
+        data.update({
+            "tool_name": "Bash",
+            "tool_use_id": f"toolu_{seed:06d}",
+            "tool_input": {"command": filler(max(0, size - base - 120), rng)},
+        })
+    elif event_type == "PostToolUse":
+        data.update({
+            "tool_name": "Read",
+            "tool_use_id": f"toolu_{seed:06d}",
+            "tool_input": {"file_path": "/home/dev/src/app/src/service.py"},
+            "tool_result": filler(max(0, size - base - 200), rng),
+        })
+    return json.dumps(data).encode("utf-8")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("profile", nargs="?", choices=PROFILES)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--list", action="store_true", help="List profiles and payload sizes")
+    args = parser.parse_args()
+
+    if args.list or not args.profile:
+        for name in PROFILES:
+            print(f"{name:<14} {PROFILES[name][0]:<18} {len(generate(name)):>10} bytes")
+        return
+    sys.stdout.buffer.write(generate(args.profile, args.seed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Hook daemon - keeps the hook pipeline warm behind a Unix domain socket.
+
+Each hook normally pays a full interpreter start plus the lib imports for a
+single event. With the daemon running and AIOX_MONITOR_DAEMON=1 set for
+Claude, hooks only forward their raw stdin to the socket and exit; parsing,
+truncation, enrichment and a keep-alive connection to the monitor server
+live here. Hooks fall back to in-process handling if the daemon is absent.
+
+When the event queue is full, forwarded hooks are dropped; the count per
+event type is reported in a MonitorDropSummary event (reason queue_full)
+once the worker catches up, and the total is printed on shutdown.
+
+Usage:
+    python3 daemon.py        # foreground; socket at AIOX_MONITOR_SOCKET
+"""
+
+import os
+import queue
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import time
+
+# Add lib to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from dispatch import HANDLERS, admit, derived_events, dropped_events, load, process
+from lib.ipc import SOCKET_PATH, parse_header
+from lib import batch
+from lib.policy import SUMMARY_EVENT
+from lib.send_event import DELIVERY, MonitorConnection, prepare_event, publish, send_event
+
+QUEUE_SIZE = int(os.environ.get("AIOX_MONITOR_DAEMON_QUEUE", "10000"))
+
+
+class HookHandler(socketserver.StreamRequestHandler):
+    """Parses one forwarded hook event per connection and queues it."""
+
+    def handle(self):
+        event_type, cwd, environ = parse_header(self.rfile.readline(65536))
+        if event_type not in HANDLERS:
+            return
+        try:
+            # Streamed with bounded memory, like the in-process path
+            data = load(event_type, self.rfile)
+        except ValueError:
+            return
+        if isinstance(data, dict):
+            data.setdefault("cwd", cwd)
+        try:
+            self.server.events.put_nowait((event_type, environ, data))
+        except queue.Full:
+            self.server.count_dropped(event_type)
+
+
+class HookDaemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: str):
+        self.events = queue.Queue(maxsize=QUEUE_SIZE)
+        self.dropped: dict[str, int] = {}  # Per event type, since the last summary
+        self.dropped_since = 0.0
+        self.dropped_total = 0
+        self.lock = threading.Lock()
+        super().__init__(path, HookHandler)
+
+    def count_dropped(self, event_type: str) -> None:
+        """Count a hook event dropped because the queue was full."""
+        with self.lock:
+            if not self.dropped:
+                self.dropped_since = time.time()
+            self.dropped[event_type] = self.dropped.get(event_type, 0) + 1
+            self.dropped_total += 1
+
+    def take_dropped(self) -> dict | None:
+        """
+        Returns:
+            MonitorDropSummary data for the drops counted since the last
+            call (as lib/policy.py reports its own), or None if none
+        """
+        with self.lock:
+            if not self.dropped:
+                return None
+            dropped, self.dropped = self.dropped, {}
+            since = self.dropped_since
+        return {
+            "dropped": {event_type: {"queue_full": count} for event_type, count in dropped.items()},
+            "since": int(since * 1000),
+            "until": int(time.time() * 1000),
+        }
+
+
+def process_events(server: HookDaemon) -> None:
+    """
+    Single worker: keeps event order and one outbound connection. Direct
+    deliveries are batched (lib/batch.py) unless AIOX_MONITOR_BATCH=0.
+    """
+    events = server.events
+    conn = MonitorConnection()
+    batcher = batch.Batcher(conn) if batch.ENABLED and DELIVERY == "direct" else None
+
+    def post(payload: bytes) -> None:
+        conn.post("/events", payload)
+
+    def send(event_type, data) -> None:
+        if batcher is None:
+            sent = send_event(event_type, data, post)
+        else:
+            try:
+                payload, pending = prepare_event(event_type, data)
+                publish(payload)
+                sent = batcher.add(payload, pending)
+            except Exception:
+                sent = False
+        if not sent:
+            conn.close()  # Reconnect on the next event
+
+    while True:
+        try:
+            event_type, environ, data = events.get(timeout=batcher and batcher.time_left())
+        except queue.Empty:
+            if not batcher.flush():
+                conn.close()
+            continue
+
+        admitted, summary = admit(event_type, data)
+        dropped = server.take_dropped()
+        if dropped:
+            summary.append((SUMMARY_EVENT, dropped))
+        if not admitted:
+            try:
+                extra = dropped_events(event_type, data, environ)
+            except Exception:
+                extra = []  # Metrics are best effort
+            for event in [*summary, *extra]:
+                send(*event)
+            continue
+        try:
+            data = process(event_type, data, environ)
+        except Exception:
+            continue
+        try:
+            extra = derived_events(event_type, data)
+        except Exception:
+            extra = []  # Metrics are best effort
+        for event in [*summary, (event_type, data), *extra]:
+            send(*event)
+
+
+def bind_socket(path: str) -> HookDaemon | None:
+    """Bind the socket, replacing a stale one. None if a daemon is live."""
+    if os.path.exists(path):
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(path)
+            return None
+        except OSError:
+            os.remove(path)
+        finally:
+            probe.close()
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    old_umask = os.umask(0o177)
+    try:
+        return HookDaemon(path)
+    finally:
+        os.umask(old_umask)
+
+
+def main():
+    server = bind_socket(SOCKET_PATH)
+    if server is None:
+        print(f"Hook daemon already running on {SOCKET_PATH}", file=sys.stderr)
+        sys.exit(1)
+
+    threading.Thread(target=process_events, args=(server,), daemon=True).start()
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+
+    print(f"Hook daemon listening on {SOCKET_PATH}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except (KeyboardInterrupt, SystemExit):
+        pass
+    finally:
+        server.server_close()
+        if server.dropped_total:
+            print(f"Hook daemon dropped {server.dropped_total} events (queue full)", file=sys.stderr)
+        try:
+            os.remove(SOCKET_PATH)
+        except OSError:
+            pass
+
+
+if __name__ == "__main__":
+    main()
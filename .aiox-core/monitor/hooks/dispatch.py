@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Hook dispatcher - single entry point for every monitor hook event.
+
+Usage (in Claude settings):
+    python3 dispatch.py <EventType>     # e.g. dispatch.py PreToolUse
+
+Each event type maps to the truncation rules applied while its payload is
+streamed from stdin (lib/payload.py). Imports are deferred to the code
+path that needs them: a hook forwarded to the daemon never loads
+enrichment or sending code, and spooled events never open a socket. The
+per-event scripts (pre_tool_use.py, ...) are kept as thin wrappers around
+main() for existing settings.
+"""
+
+import os
+import sys
+
+# Add lib to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+# Prompts are parsed whole (up to this size) so agent detection sees all of
+# them, then cut back to their ENRICHED_LIMITS after enrichment
+PROMPT_SCAN_CHARS = int(os.environ.get("AIOX_MONITOR_PROMPT_SCAN_CHARS", "65536"))
+
+# Per-event handler table: truncation rules applied while stdin is parsed,
+# as {top-level field: (max chars, suffix)} for every string under that
+# field. Other strings get the AIOX_MONITOR_MAX_STRING default.
+HANDLERS = {
+    "PreToolUse": {"tool_input": (500, "...")},
+    "PostToolUse": {"tool_result": (1000, "...[truncated]"), "tool_input": (500, "...")},
+    "UserPromptSubmit": {"user_prompt": (PROMPT_SCAN_CHARS, "...")},
+    "Stop": {},
+    "SubagentStop": {},
+    "Notification": {},
+    "PreCompact": {},
+}
+
+# Pre/PostToolUse correlation into ToolMetrics events (lib/metrics.py)
+TOOL_METRICS = os.environ.get("AIOX_MONITOR_TOOL_METRICS", "1") not in ("", "0")
+METRIC_TYPES = ("PreToolUse", "PostToolUse")
+# Events after which a session may go quiet: pending drop summaries go out
+FLUSH_TYPES = ("Stop", "SubagentStop")
+
+# Fields read in full for enrichment, truncated before sending
+ENRICHED_LIMITS = {
+    "UserPromptSubmit": {"user_prompt": (1000, "...")},
+}
+
+# Per-phase timings sent as HookTimings events (lib/timing.py)
+TIMINGS = os.environ.get("AIOX_MONITOR_TIMINGS", "0") not in ("", "0")
+
+
+class _NoTimer:
+    """PhaseTimer stand-in while timings are off (lib.timing not imported)."""
+
+    def mark(self, phase):
+        pass
+
+
+def load(event_type, stream):
+    """Parse a hook payload with bounded memory, truncating as it streams."""
+    from lib.payload import read_payload
+
+    data, meta = read_payload(stream, HANDLERS[event_type])
+    if isinstance(data, dict):
+        # Original payload size and what was cut
+        data["aiox_payload"] = meta
+    return data
+
+
+def process(event_type, data, environ=None, timer=_NoTimer()):
+    """Redact and enrich a loaded event (also used by daemon.py)."""
+    from lib.enrich import enrich_event
+    from lib.redact import redact_event
+
+    # Strip secrets before anything reads or forwards the payload
+    data = redact_event(data)
+    timer.mark("redact")
+
+    # Enrich with AIOX context
+    data = enrich_event(data, environ)
+    timer.mark("enrich")
+
+    for field, (limit, suffix) in ENRICHED_LIMITS.get(event_type, {}).items():
+        value = data.get(field)
+        if isinstance(value, str) and len(value) > limit:
+            data[field] = value[:limit] + suffix
+            meta = data.get("aiox_payload")
+            if isinstance(meta, dict):
+                meta.setdefault("truncated", {}).setdefault(field, len(value))
+    timer.mark("truncate")
+    return data
+
+
+def admit(event_type, data):
+    """
+    Apply the sampling/rate-limit policy (lib/policy.py) to a loaded event
+    (also used by daemon.py).
+
+    Returns:
+        (admitted, events) - events holds a drop summary to send when due,
+        or whenever drops are pending on Stop/SubagentStop
+    """
+    from lib.policy import SUMMARY_EVENT, admit as policy_admit, flush_summary
+
+    try:
+        admitted, summary = policy_admit(event_type, data)
+        if summary is None and event_type in FLUSH_TYPES:
+            summary = flush_summary()
+    except Exception:
+        return True, []  # A broken policy never loses events
+    return admitted, [(SUMMARY_EVENT, summary)] if summary else []
+
+
+def derived_events(event_type, data):
+    """
+    Extra events derived from a processed hook event (also used by
+    daemon.py). Call before sending it, while its timing is current.
+
+    Returns:
+        List of (event_type, data) to send after the hook event
+    """
+    if not TOOL_METRICS or not isinstance(data, dict):
+        return []
+
+    if event_type == "PreToolUse":
+        from lib.metrics import record_start
+
+        record_start(data)
+    elif event_type == "PostToolUse":
+        from lib.metrics import METRICS_EVENT, tool_metrics
+
+        metrics = tool_metrics(data)
+        if metrics:
+            return [(METRICS_EVENT, metrics)]
+    return []
+
+
+def dropped_events(event_type, data, environ=None):
+    """
+    Events still due for a hook event the policy dropped (also used by
+    daemon.py): its ToolMetrics, so sampling and the rate limit never skew
+    latency percentiles. Only enriches the event (no redaction, it is not
+    sent).
+
+    Returns:
+        List of (event_type, data) to send
+    """
+    if not TOOL_METRICS or event_type not in METRIC_TYPES or not isinstance(data, dict):
+        return []
+    from lib.enrich import enrich_event
+
+    return derived_events(event_type, enrich_event(data, environ))
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 1 or argv[0] not in HANDLERS:
+        print(f"usage: dispatch.py {{{','.join(HANDLERS)}}}", file=sys.stderr)
+        sys.exit(1)
+    event_type = argv[0]
+
+    if TIMINGS:
+        from lib.timing import PhaseTimer
+
+        timer = PhaseTimer()
+    else:
+        timer = _NoTimer()
+
+    # Event arrives on stdin
+    stdin = sys.stdin.buffer
+
+    # Hand off to the hook daemon when one is running
+    from lib.ipc import forward_to_daemon
+
+    if forward_to_daemon(event_type, stdin):
+        return
+
+    from lib.send_event import send_event
+
+    data = load(event_type, stdin)
+    timer.mark("parse")
+    admitted, summary = admit(event_type, data)
+    for summary_type, summary_data in summary:
+        send_event(summary_type, summary_data)
+    if not admitted:
+        try:
+            extra = dropped_events(event_type, data)
+        except Exception:
+            extra = []  # Metrics are best effort
+        for extra_type, extra_data in extra:
+            send_event(extra_type, extra_data)
+        return
+    timer.mark("policy")
+
+    data = process(event_type, data, timer=timer)
+    try:
+        extra = derived_events(event_type, data)
+    except Exception:
+        extra = []  # Metrics are best effort
+    timer.mark("metrics")
+
+    # Send to monitor server
+    send_event(event_type, data)
+    timer.mark("send")
+    for extra_type, extra_data in extra:
+        send_event(extra_type, extra_data)
+
+    if TIMINGS:
+        from lib.timing import TIMINGS_EVENT
+
+        send_event(TIMINGS_EVENT, timer.event(event_type, data))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Spool flusher - drains the local event spool to the monitor server.
+
+Started automatically by hooks running with AIOX_MONITOR_DELIVERY=spool, or
+run manually / as a service:
+
+    python3 flush.py              # drain, exit after AIOX_MONITOR_FLUSH_IDLE_S idle
+    python3 flush.py --once       # drain what is spooled now and exit
+    python3 flush.py --forever    # never exit (service mode)
+
+Only one flusher runs at a time (flock on flush.lock). Delivery is
+at-least-once: the committed offset only advances past delivered events.
+Each read batch goes out as one /events/batch request (lib/batch.py) unless
+AIOX_MONITOR_BATCH=0.
+The flusher shares the hooks' circuit breaker and waits while it is open.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add lib to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from lib import batch, breaker, spool
+from lib.send_event import STORE_ALL, MonitorConnection, is_outage, is_poison, serialize_event
+from lib.state import state_path
+
+BATCH_SIZE = int(os.environ.get("AIOX_MONITOR_FLUSH_BATCH", "100"))
+IDLE_EXIT_S = float(os.environ.get("AIOX_MONITOR_FLUSH_IDLE_S", "10"))
+POLL_S = 0.2
+MAX_BACKOFF_S = 30.0
+
+
+def acquire_lock() -> int | None:
+    """Take the flusher lock. Returns the held fd, or None if taken."""
+    try:
+        import fcntl
+    except ImportError:
+        return -1  # No flock: trust the caller to run a single flusher
+
+    fd = os.open(state_path("flush.lock"), os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        os.close(fd)
+        return None
+    return fd
+
+
+def release_lock(fd: int) -> None:
+    """Release the flusher lock taken by acquire_lock()."""
+    if fd >= 0:
+        os.close(fd)
+
+
+def drain_segment(segment: str, conn: MonitorConnection) -> int:
+    """
+    Deliver a segment from its committed offset. Raises on delivery failure
+    after committing everything delivered so far.
+
+    Returns:
+        Number of events delivered
+    """
+    offset = spool.read_offset(segment)
+    delivered = 0
+
+    while True:
+        lines, end = spool.read_batch(segment, offset, BATCH_SIZE)
+        if end == offset:
+            return delivered
+
+        events = [line.rstrip(b"\n") for line in lines if line.strip()]
+        if batch.ENABLED:
+            # One request per read batch; committed once it is delivered
+            if events:
+                batch.post_events(conn, events)
+                if STORE_ALL:
+                    from lib.store import keep
+
+                    keep(events, sent=True)
+            delivered += len(events)
+            spool.commit_offset(segment, end)
+            offset = end
+            continue
+
+        position = offset
+        try:
+            for line in lines:
+                if line.strip():
+                    try:
+                        conn.post("/events", line.rstrip(b"\n"))
+                    except Exception as e:
+                        if not is_poison(e):
+                            raise
+                    delivered += 1
+                position += len(line)
+        finally:
+            spool.commit_offset(segment, position)
+        offset = end
+
+
+def report_recovery(conn: MonitorConnection) -> None:
+    """Close the circuit after a successful drain, reporting the outage."""
+    recovered = breaker.record_success()
+    if recovered:
+        try:
+            conn.post("/events", serialize_event("MonitorRecovered", recovered))
+        except Exception:
+            pass
+        from lib.store import ensure_replay
+
+        ensure_replay()
+
+
+def run(once: bool = False, forever: bool = False) -> int:
+    """Flush loop. Returns process exit code."""
+    lock = acquire_lock()
+    if lock is None:
+        return 0  # Another flusher is running
+
+    conn = MonitorConnection()
+    backoff = POLL_S
+    last_progress = time.monotonic()
+
+    while True:
+        pending = False
+        if breaker.allow() == breaker.OPEN:
+            pending = True  # Server down; a hook or we will probe later
+        else:
+            try:
+                for segment in spool.claim_segments():
+                    if drain_segment(segment, conn):
+                        last_progress = time.monotonic()
+                        report_recovery(conn)
+                    if time.time() - spool.claimed_at(segment) < spool.CLAIM_GRACE_S:
+                        pending = True  # Late writers may still append
+                        break
+                    if os.path.getsize(segment) > spool.read_offset(segment):
+                        pending = True
+                        break
+                    spool.remove_segment(segment)
+                backoff = POLL_S
+            except Exception as e:
+                conn.close()
+                if is_outage(e):
+                    breaker.record_failure()
+                pending = True
+                backoff = min(backoff * 2, MAX_BACKOFF_S)
+
+        if once and not pending:
+            return 0
+        if not forever and time.monotonic() - last_progress > IDLE_EXIT_S:
+            # A hook that appended while we held the lock saw it taken and
+            # started no flusher: look at the spool again once it is released
+            release_lock(lock)
+            if not spool.has_active():
+                return 0  # Hooks restart us on the next spooled event
+            lock = acquire_lock()
+            if lock is None:
+                return 0  # A new flusher took over
+            last_progress = time.monotonic()
+            continue
+        time.sleep(backoff)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Drain the AIOX monitor event spool")
+    parser.add_argument("--once", action="store_true", help="Exit when the spool is empty")
+    parser.add_argument("--forever", action="store_true", help="Never exit when idle")
+    args = parser.parse_args()
+
+    sys.exit(run(once=args.once, forever=args.forever))
+
+
+if __name__ == "__main__":
+    main()
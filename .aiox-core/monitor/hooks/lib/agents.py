@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Agent registry and sticky per-session agent attribution.
+
+Agents are the definitions installed in the project
+(.aiox-core/development/agents/*.md and squads/*/agents/*.md); the file stem
+is the agent id. Their ids are compiled once into a single alternation
+regex, so "@id" activations are found in one pass over the prompt. The id
+list is cached in agents/registry-<root>.json in the state dir and rebuilt
+when one of the agent directories changes.
+
+The last agent activated in a session is kept in agents/session-<id>.json,
+so tool events that follow a prompt are attributed without re-detection.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import zlib
+
+from .state import read_json, state_path, write_json
+
+CORE_AGENTS_DIR = os.path.join(".aiox-core", "development", "agents")
+SQUADS_DIR = "squads"
+# Used when the project has no agent definitions
+DEFAULT_AGENTS = ("dev", "architect", "qa", "pm", "po", "sm", "analyst", "devops", "aiox-master")
+PRUNE_EVERY = 50  # Prune stale files on ~1 in N session writes
+
+_matchers: dict[str, tuple[dict[str, float | None], re.Pattern]] = {}
+
+
+def _key(value: str) -> str:
+    return f"{zlib.crc32(value.encode('utf-8', 'replace')):08x}"
+
+
+def _mtime(path: str) -> float | None:
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+def _agent_dirs(root: str) -> list[str]:
+    """Directories holding agent definitions (existing or not)."""
+    dirs = [os.path.join(root, CORE_AGENTS_DIR)]
+    try:
+        squads = sorted(os.listdir(os.path.join(root, SQUADS_DIR)))
+    except OSError:
+        squads = []
+    for squad in squads:
+        if not squad.startswith((".", "_")):
+            dirs.append(os.path.join(root, SQUADS_DIR, squad, "agents"))
+    return dirs
+
+
+def _fresh(watched: dict[str, float | None]) -> bool:
+    return all(_mtime(path) == mtime for path, mtime in watched.items())
+
+
+def scan_agents(root: str) -> tuple[list[str], dict[str, float | None]]:
+    """
+    List the agent ids installed under a project root.
+
+    Returns:
+        (ids, watched) where watched maps the scanned directories (and the
+        squads dir, for new squads) to their mtimes
+    """
+    watched = {os.path.join(root, SQUADS_DIR): _mtime(os.path.join(root, SQUADS_DIR))}
+    ids = set()
+    for directory in _agent_dirs(root):
+        watched[directory] = _mtime(directory)
+        try:
+            names = os.listdir(directory)
+        except OSError:
+            continue
+        ids.update(name[:-3].lower() for name in names if name.endswith(".md"))
+    return sorted(ids), watched
+
+
+def compile_matcher(ids: list[str] | tuple[str, ...]) -> re.Pattern:
+    """
+    One regex for every "@id" activation.
+
+    Longest ids first and a trailing boundary, so "@devops" is not read as
+    "@dev".
+    """
+    alternation = "|".join(re.escape(i) for i in sorted(ids, key=len, reverse=True))
+    return re.compile(rf"@({alternation})(?![\w-])", re.IGNORECASE)
+
+
+def matcher(root: str | None) -> re.Pattern:
+    """Compiled matcher for the agents of a project, from cache when valid."""
+    if not root:
+        return compile_matcher(DEFAULT_AGENTS)
+
+    memo = _matchers.get(root)
+    if memo and _fresh(memo[0]):
+        return memo[1]
+
+    path = state_path("agents", f"registry-{_key(root)}.json")
+    cached = read_json(path)
+    if (
+        isinstance(cached, dict)
+        and cached.get("root") == root
+        and _fresh(cached.get("watched") or {})
+    ):
+        ids, watched = cached["ids"], cached["watched"]
+    else:
+        ids, watched = scan_agents(root)
+        try:
+            write_json(path, {"root": root, "ids": ids, "watched": watched})
+        except OSError:
+            pass
+
+    pattern = compile_matcher(ids or DEFAULT_AGENTS)
+    _matchers[root] = (watched, pattern)
+    return pattern
+
+
+def detect(prompt: str, root: str | None = None) -> str | None:
+    """First agent activated in a prompt ("@id"), or None."""
+    match = matcher(root).search(prompt)
+    return match.group(1).lower() if match else None
+
+
+def session_agent(session_id: str | None) -> str | None:
+    """Agent last activated in a session, or None."""
+    if not session_id:
+        return None
+    state = read_json(state_path("agents", f"session-{_key(session_id)}.json"))
+    if isinstance(state, dict) and state.get("session_id") == session_id:
+        return state.get("agent")
+    return None
+
+
+def set_session_agent(session_id: str | None, agent: str) -> None:
+    """Remember the agent activated in a session (no-op if unchanged)."""
+    if not session_id or session_agent(session_id) == agent:
+        return
+
+    import random
+
+    path = state_path("agents", f"session-{_key(session_id)}.json")
+    write_json(path, {"session_id": session_id, "agent": agent})
+    if random.randrange(PRUNE_EVERY) == 0:
+        from .context import prune
+
+        prune(os.path.dirname(path))
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Batched NDJSON wire format for long-lived senders (daemon.py, flush.py).
+
+One POST to /events/batch carries many events as newline-delimited JSON:
+
+    {"v": 1, "count": 3, "common": {"session_id": "...", "project": "..."}}
+    {"type": "PreToolUse", "timestamp": 1700000000000, "data": {...}}
+    ...
+
+The first line is the envelope. "common" holds the data fields that are
+identical in every event of the batch (session, project, branch, agent,
+...); they are removed from each event's data and the server merges them
+back. Bodies of at least GZIP_MIN_BYTES are gzipped (Content-Encoding:
+gzip) unless AIOX_MONITOR_GZIP=0.
+
+Servers without the batch endpoint (404/405/415/501) get the events one by
+one on /events; the endpoint is retried after BATCH_RETRY_S. A batch
+rejected as a whole is also resent one by one, so a single bad event
+cannot poison its neighbours.
+
+With AIOX_MONITOR_BATCH=0 senders post every event on its own. Batcher
+accumulates events until AIOX_MONITOR_BATCH_MAX_EVENTS,
+AIOX_MONITOR_BATCH_MAX_BYTES or AIOX_MONITOR_BATCH_MAX_AGE_MS is reached.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+
+from .send_event import STORE_ALL, HTTPStatusError, deliver, is_poison
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:  # typing adds ~10 ms to hook cold start
+    from typing import Any
+    from .send_event import MonitorConnection
+
+BATCH_PATH = "/events/batch"
+BATCH_VERSION = 1
+ENABLED = os.environ.get("AIOX_MONITOR_BATCH", "1") not in ("", "0")
+MAX_EVENTS = int(os.environ.get("AIOX_MONITOR_BATCH_MAX_EVENTS", "100"))
+MAX_BYTES = int(os.environ.get("AIOX_MONITOR_BATCH_MAX_BYTES", str(256 * 1024)))
+MAX_AGE_MS = int(os.environ.get("AIOX_MONITOR_BATCH_MAX_AGE_MS", "200"))
+GZIP = os.environ.get("AIOX_MONITOR_GZIP", "1") not in ("", "0")
+GZIP_MIN_BYTES = 1024
+BATCH_RETRY_S = 600.0
+UNSUPPORTED = (404, 405, 415, 501)
+
+# Data fields worth factoring out when equal across a batch
+COMMON_FIELDS = (
+    "session_id", "transcript_path", "cwd", "project", "aiox_repo_root",
+    "aiox_git_branch", "aiox_agent", "aiox_story_id", "aiox_task_id",
+)
+
+_unsupported_until = 0.0
+
+
+def encode_batch(payloads: list[bytes]) -> tuple[bytes, dict[str, str]]:
+    """
+    Encode serialized events (serialize_event) as one batch body.
+
+    Returns:
+        (body, headers)
+    """
+    events = [json.loads(payload) for payload in payloads]
+    datas = [e.get("data") if isinstance(e.get("data"), dict) else None for e in events]
+
+    common: dict[str, Any] = {}
+    if all(d is not None for d in datas):
+        first = datas[0]
+        for field in COMMON_FIELDS:
+            if field in first and all(field in d and d[field] == first[field] for d in datas):
+                common[field] = first[field]
+    if common:
+        for data in datas:
+            for field in common:
+                del data[field]
+
+    lines = [json.dumps({"v": BATCH_VERSION, "count": len(events), "common": common})]
+    lines.extend(json.dumps(event) for event in events)
+    body = ("\n".join(lines) + "\n").encode("utf-8")
+
+    headers = {"Content-Type": "application/x-ndjson"}
+    if GZIP and len(body) >= GZIP_MIN_BYTES:
+        import gzip
+
+        body = gzip.compress(body, compresslevel=6, mtime=0)
+        headers["Content-Encoding"] = "gzip"
+    return body, headers
+
+
+def post_events(conn: MonitorConnection, payloads: list[bytes]) -> int:
+    """
+    POST serialized events as one batch, falling back to /events.
+
+    Events the server rejects individually (4xx) are skipped. Raises on
+    transport errors and 5xx.
+
+    Returns:
+        Number of events posted
+    """
+    global _unsupported_until
+
+    if len(payloads) > 1 and time.monotonic() >= _unsupported_until:
+        try:
+            body, headers = encode_batch(payloads)
+            conn.post(BATCH_PATH, body, headers)
+            return len(payloads)
+        except ValueError:
+            pass  # Corrupt event: let the server reject it alone
+        except HTTPStatusError as e:
+            if e.code in UNSUPPORTED:
+                _unsupported_until = time.monotonic() + BATCH_RETRY_S
+            elif not is_poison(e):
+                raise
+            # Resend one by one below
+
+    for payload in payloads:
+        try:
+            conn.post("/events", payload)
+        except Exception as e:
+            if not is_poison(e):
+                raise
+    return len(payloads)
+
+
+class Batcher:
+    """
+    Accumulates serialized events and delivers them in batches through the
+    circuit breaker (send_event.deliver).
+    """
+
+    def __init__(
+        self,
+        conn: MonitorConnection,
+        max_events: int = MAX_EVENTS,
+        max_bytes: int = MAX_BYTES,
+        max_age_ms: int = MAX_AGE_MS,
+    ):
+        self.conn = conn
+        self.max_events = max_events
+        self.max_bytes = max_bytes
+        self.max_age = max_age_ms / 1000
+        self.payloads: list[bytes] = []
+        self.pending: list[Any] = []
+        self.size = 0
+        self.started = 0.0
+
+    def add(self, payload: bytes, pending: Any = None) -> bool:
+        """
+        Queue one event, flushing when a size threshold is reached.
+
+        Returns:
+            False if a flush happened and failed, else True
+        """
+        if not self.payloads:
+            self.started = time.monotonic()
+        self.payloads.append(payload)
+        self.size += len(payload)
+        if pending:
+            self.pending.append(pending)
+        if len(self.payloads) >= self.max_events or self.size >= self.max_bytes:
+            return self.flush()
+        return True
+
+    def time_left(self) -> float | None:
+        """Seconds until the age threshold flushes the batch (None if empty)."""
+        if not self.payloads:
+            return None
+        return max(0.0, self.started + self.max_age - time.monotonic())
+
+    def flush(self) -> bool:
+        """
+        Deliver the queued events.
+
+        Returns:
+            True if sent or diverted to the spool, False otherwise (the
+            events are then kept in the local store, lib/store.py)
+        """
+        if not self.payloads:
+            return True
+        payloads, pending = self.payloads, self.pending
+        self.payloads, self.pending, self.size = [], [], 0
+
+        try:
+            sent = deliver(b"\n".join(payloads), lambda body: post_events(self.conn, body.split(b"\n")))
+        except Exception:
+            sent = False
+        if not sent or STORE_ALL:
+            from .store import keep
+
+            keep(payloads, sent)
+        if sent:
+            # Only now may later events reference these blobs
+            for blobs in pending:
+                blobs.commit()
+        return sent
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Content-addressed dedup of large tool inputs and results.
+
+Agents re-read the same files and re-run the same commands, so identical
+tool_input/tool_result bodies are sent over and over. With
+AIOX_MONITOR_DEDUP=1, fields of at least AIOX_MONITOR_DEDUP_MIN_BYTES are
+hashed (sha256 of their JSON form):
+
+- first sight: the field is sent in full and its digest is listed in
+  data["aiox_blobs"] ({field: digest}) so the server can store it by digest
+- already delivered: the field is replaced by
+  {"$blob": digest, "size": bytes, "preview": first chars}
+
+A local content-addressed store (blobs/<server>/<aa>/<digest> in the state
+dir) records what the server has received. Blobs are only committed after
+the event was delivered (or spooled), and the store is trimmed to
+AIOX_MONITOR_BLOB_STORE_BYTES, least recently used first.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import random
+
+from .state import STATE_DIR
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:  # typing adds ~10 ms to hook cold start
+    from typing import Any
+
+DEDUP_FIELDS = ("tool_input", "tool_result")
+MIN_BYTES = int(os.environ.get("AIOX_MONITOR_DEDUP_MIN_BYTES", "512"))
+STORE_BYTES = int(os.environ.get("AIOX_MONITOR_BLOB_STORE_BYTES", str(64 * 1024 * 1024)))
+PREVIEW_CHARS = 120
+EVICT_EVERY = 50  # Check the store size on ~1 in N commits
+
+
+def store_dir(server_url: str) -> str:
+    """Blob store for one monitor server (what it has seen is per server)."""
+    server = hashlib.sha256(server_url.encode("utf-8")).hexdigest()[:12]
+    return os.path.join(STATE_DIR, "blobs", server)
+
+
+def _blob_path(directory: str, digest: str) -> str:
+    return os.path.join(directory, digest[7:9], digest[7:])
+
+
+class PendingBlobs:
+    """Blobs sent in full by one event, committed once it is delivered."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.blobs: dict[str, bytes] = {}
+
+    def commit(self) -> None:
+        for digest, body in self.blobs.items():
+            path = _blob_path(self.directory, digest)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(body)
+            os.replace(tmp, path)
+        if self.blobs and random.randrange(EVICT_EVERY) == 0:
+            evict(self.directory)
+
+
+def dedup(data: dict[str, Any], server_url: str) -> tuple[dict[str, Any], PendingBlobs]:
+    """
+    Replace already-delivered large fields by digest references.
+
+    Returns:
+        (data, pending) - call pending.commit() after successful delivery
+    """
+    directory = store_dir(server_url)
+    pending = PendingBlobs(directory)
+    first_sight = {}
+
+    for field in DEDUP_FIELDS:
+        value = data.get(field)
+        if value is None:
+            continue
+        body = json.dumps(value, sort_keys=True, ensure_ascii=False).encode("utf-8")
+        if len(body) < MIN_BYTES:
+            continue
+
+        digest = "sha256:" + hashlib.sha256(body).hexdigest()
+        path = _blob_path(directory, digest)
+        if os.path.exists(path):
+            try:
+                os.utime(path)  # LRU touch
+            except OSError:
+                pass
+            preview = value if isinstance(value, str) else body.decode("utf-8")
+            data[field] = {
+                "$blob": digest,
+                "size": len(body),
+                "preview": preview[:PREVIEW_CHARS],
+            }
+        else:
+            pending.blobs[digest] = body
+            first_sight[field] = digest
+
+    if first_sight:
+        data["aiox_blobs"] = first_sight
+    return data, pending
+
+
+def evict(directory: str) -> None:
+    """Trim the store to STORE_BYTES, removing least recently used blobs."""
+    entries = []
+    total = 0
+    for root, _, files in os.walk(directory):
+        for name in files:
+            path = os.path.join(root, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+    entries.sort()
+    for _, size, path in entries:
+        if total <= STORE_BYTES:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Cross-process circuit breaker for the monitor server.
+
+Every hook process shares one small state file (breaker.json in the state
+dir). After AIOX_MONITOR_BREAKER_THRESHOLD consecutive delivery failures the
+circuit opens and hooks skip the network entirely. Once the backoff expires,
+exactly one process takes a probe lease and tries a real send: success
+closes the circuit, failure reopens it with doubled backoff (capped at
+AIOX_MONITOR_BREAKER_MAX_BACKOFF_MS).
+
+While open, skipped events are counted as diverted (spooled for later
+delivery), deferred (kept in the local event store and replayed) or, with
+the store off, dropped; the counts are kept in the state file and reported
+in a MonitorRecovered event when the circuit closes.
+
+A healthy (closed) circuit has no state file, so the common path costs one
+failed open().
+"""
+
+from __future__ import annotations
+
+import os
+import time
+
+from .state import Locked, read_json, state_path, write_json
+
+THRESHOLD = int(os.environ.get("AIOX_MONITOR_BREAKER_THRESHOLD", "3"))
+BASE_BACKOFF_MS = int(os.environ.get("AIOX_MONITOR_BREAKER_BACKOFF_MS", "1000"))
+MAX_BACKOFF_MS = int(os.environ.get("AIOX_MONITOR_BREAKER_MAX_BACKOFF_MS", "60000"))
+
+CLOSED = "closed"
+OPEN = "open"
+PROBE = "probe"
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+def state() -> dict | None:
+    """Current breaker state, or None when the circuit is closed and clean."""
+    return read_json(state_path("breaker.json"))
+
+
+def allow() -> str:
+    """
+    Decide whether this process may use the network.
+
+    Returns:
+        CLOSED - send normally
+        PROBE  - send; this process holds the probe lease
+        OPEN   - skip the network
+    """
+    current = state()
+    if not current or current.get("failures", 0) < THRESHOLD:
+        return CLOSED
+
+    now = _now_ms()
+    if now < current.get("retry_at", 0) or now < current.get("probe_until", 0):
+        return OPEN
+
+    with Locked("breaker.json") as locked:
+        current = read_json(locked.path) or {}
+        if current.get("failures", 0) < THRESHOLD:
+            return CLOSED
+        if now < current.get("retry_at", 0) or now < current.get("probe_until", 0):
+            return OPEN  # Another process took the lease first
+        current["probe_until"] = now + current.get("backoff_ms", BASE_BACKOFF_MS)
+        write_json(locked.path, current)
+    return PROBE
+
+
+def record_success() -> dict | None:
+    """
+    Close the circuit.
+
+    Returns:
+        Counters accumulated while open ({"dropped", "deferred", "diverted",
+        "open_ms"}),
+        or None if the circuit was not open
+    """
+    if state() is None:
+        return None
+
+    with Locked("breaker.json") as locked:
+        current = read_json(locked.path)
+        try:
+            os.remove(locked.path)
+        except OSError:
+            pass
+
+    if not current or "opened_at" not in current:
+        return None
+    return {
+        "dropped": current.get("dropped", 0),
+        "deferred": current.get("deferred", 0),
+        "diverted": current.get("diverted", 0),
+        "open_ms": _now_ms() - current["opened_at"],
+    }
+
+
+def record_failure() -> None:
+    """Count a failed delivery; open (or reopen) the circuit at the threshold."""
+    with Locked("breaker.json") as locked:
+        current = read_json(locked.path) or {}
+        now = _now_ms()
+        current["failures"] = current.get("failures", 0) + 1
+        current.pop("probe_until", None)
+
+        if current["failures"] >= THRESHOLD:
+            backoff = current.get("backoff_ms", 0)
+            backoff = min(backoff * 2, MAX_BACKOFF_MS) if backoff else BASE_BACKOFF_MS
+            current["backoff_ms"] = backoff
+            current["retry_at"] = now + backoff
+            current.setdefault("opened_at", now)
+
+        write_json(locked.path, current)
+
+
+def record_skipped(outcome: str, count: int = 1) -> None:
+    """
+    Count events that bypassed the network while the circuit was open.
+
+    Args:
+        outcome: "diverted", "deferred" or "dropped" (see module docstring)
+        count: Number of events
+    """
+    with Locked("breaker.json") as locked:
+        current = read_json(locked.path)
+        if not current or current.get("failures", 0) < THRESHOLD:
+            return  # Closed meanwhile: never recreate the state file
+        current[outcome] = current.get(outcome, 0) + count
+        write_json(locked.path, current)
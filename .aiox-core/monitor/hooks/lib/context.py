@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Per-session project context, resolved once and memoized on disk.
+
+Every event of a session comes from the same project, so the repo root, git
+branch and active story/task are resolved on the first event only:
+
+- the root is the nearest enclosing directory with .git (or .aiox-core),
+  not the cwd itself, so subdirectories report the real project
+- the branch is read from .git/HEAD (no git subprocess)
+- the active story and task come from the AIOX dashboard status file
+  (.aiox/dashboard/status.json, or the legacy .aiox/status.json)
+
+The result is cached in context/<key>.json in the state dir, keyed by
+session_id and cwd, together with the mtimes of the files it was read from.
+Later events only stat those files; any change re-resolves the context.
+"""
+
+from __future__ import annotations
+
+import os
+import zlib
+
+from .state import read_json, state_path, write_json
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:  # typing adds ~10 ms to hook cold start
+    from typing import Any
+
+ROOT_MARKERS = (".git", ".aiox-core")
+STATUS_FILES = (
+    os.path.join(".aiox", "dashboard", "status.json"),
+    os.path.join(".aiox", "status.json"),
+)
+CACHE_TTL_S = 7 * 24 * 3600  # Context files of older sessions are pruned
+PRUNE_EVERY = 50  # Prune on ~1 in N cache misses
+
+_memo: dict[tuple[str, str], dict[str, Any]] = {}  # Long-lived processes (daemon)
+
+
+def find_root(cwd: str) -> str:
+    """Nearest enclosing directory with a root marker, else cwd."""
+    path = os.path.abspath(cwd)
+    while True:
+        for marker in ROOT_MARKERS:
+            if os.path.exists(os.path.join(path, marker)):
+                return path
+        parent = os.path.dirname(path)
+        if parent == path:
+            return os.path.abspath(cwd)
+        path = parent
+
+
+def _git_head(root: str) -> str | None:
+    """Path of the HEAD file, following .git files of worktrees/submodules."""
+    git = os.path.join(root, ".git")
+    if os.path.isfile(git):
+        try:
+            with open(git, "r", encoding="utf-8") as f:
+                line = f.readline().strip()
+        except OSError:
+            return None
+        if not line.startswith("gitdir:"):
+            return None
+        git = os.path.join(root, line[7:].strip())
+    head = os.path.join(git, "HEAD")
+    return head if os.path.exists(head) else None
+
+
+def read_branch(head: str | None) -> str | None:
+    """Current branch name, or the short commit id when detached."""
+    if not head:
+        return None
+    try:
+        with open(head, "r", encoding="utf-8") as f:
+            ref = f.readline().strip()
+    except OSError:
+        return None
+    if ref.startswith("ref:"):
+        ref = ref[4:].strip()
+        return ref[11:] if ref.startswith("refs/heads/") else ref
+    return ref[:12] or None
+
+
+def read_story(status: dict[str, Any] | None) -> tuple[str | None, str | None]:
+    """Active (story_id, task_id) from a dashboard status file."""
+    if not isinstance(status, dict):
+        return None, None
+
+    story = (status.get("activeAgent") or {}).get("currentStory")
+    if not story:
+        in_progress = (status.get("stories") or {}).get("inProgress") or []
+        story = in_progress[-1] if in_progress else None
+    if not story:
+        return None, None
+
+    progress = (status.get("planProgress") or {}).get(story) or {}
+    task = (progress.get("current") or {}).get("subtask")
+    return story, task
+
+
+def _mtime(path: str) -> float | None:
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+def _resolve(cwd: str) -> tuple[dict[str, Any], dict[str, float | None]]:
+    """Resolve the context from disk. Returns (context, watched mtimes)."""
+    root = find_root(cwd)
+    head = _git_head(root)
+    context: dict[str, Any] = {"project": os.path.basename(root), "repo_root": root}
+    watched: dict[str, float | None] = {}
+
+    branch = read_branch(head)
+    if branch:
+        context["git_branch"] = branch
+        watched[head] = _mtime(head)
+
+    for name in STATUS_FILES:
+        path = os.path.join(root, name)
+        watched[path] = _mtime(path)
+        if watched[path] is None:
+            continue
+        story, task = read_story(read_json(path))
+        if story:
+            context["story_id"] = story
+            if task:
+                context["task_id"] = task
+        break  # The dashboard file wins over the legacy one
+    return context, watched
+
+
+def _fresh(entry: dict[str, Any] | None) -> bool:
+    if not isinstance(entry, dict) or "context" not in entry:
+        return False
+    watched = entry.get("watched") or {}
+    return all(_mtime(path) == mtime for path, mtime in watched.items())
+
+
+def project_context(session_id: str | None, cwd: str) -> dict[str, Any]:
+    """
+    Project context for an event, from the session cache when valid.
+
+    Args:
+        session_id: Claude session id (cache key together with cwd)
+        cwd: Working directory of the event
+
+    Returns:
+        {"project", "repo_root"} plus "git_branch", "story_id" and
+        "task_id" when known
+    """
+    key = (session_id or "", cwd)
+    entry = _memo.get(key)
+    if _fresh(entry):
+        return entry["context"]
+
+    # crc32 instead of hashlib (~4 ms of imports); collisions only cost a miss
+    digest = zlib.crc32("\0".join(key).encode("utf-8", "replace"))
+    path = state_path("context", f"{digest:08x}.json")
+    entry = read_json(path)
+    if not _fresh(entry) or entry.get("key") != list(key):
+        import random
+
+        context, watched = _resolve(cwd)
+        entry = {"key": list(key), "context": context, "watched": watched}
+        try:
+            write_json(path, entry)
+        except OSError:
+            pass
+        if random.randrange(PRUNE_EVERY) == 0:
+            prune(os.path.dirname(path))
+
+    _memo[key] = entry
+    return entry["context"]
+
+
+def prune(directory: str, max_age_s: float = CACHE_TTL_S) -> None:
+    """Remove cache files of a state subdirectory not refreshed for max_age_s."""
+    import time
+
+    cutoff = time.time() - max_age_s
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return
+    for name in names:
+        path = os.path.join(directory, name)
+        try:
+            if os.stat(path).st_mtime < cutoff:
+                os.remove(path)
+        except OSError:
+            pass
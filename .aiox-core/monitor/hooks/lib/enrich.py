@@ -3,56 +3,102 @@
 Enrich events with AIOX context (agent, story, task, etc.)
 """
 
+from __future__ import annotations
+
 import os
-import re
-from pathlib import Path
-from typing import Any
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:  # typing adds ~10 ms to hook cold start
+    from typing import Any, Mapping
+
+
+ENV_FIELDS = (
+    ("AIOX_AGENT", "aiox_agent"),
+    ("AIOX_STORY_ID", "aiox_story_id"),
+    ("AIOX_TASK_ID", "aiox_task_id"),
+)
+CONTEXT_FIELDS = (
+    ("repo_root", "aiox_repo_root"),
+    ("git_branch", "aiox_git_branch"),
+    ("story_id", "aiox_story_id"),
+    ("task_id", "aiox_task_id"),
+)
+
+_process_env: dict[str, str] | None = None
 
 
-def enrich_event(data: dict[str, Any]) -> dict[str, Any]:
-    """Add AIOX context to event data."""
+def env_context(environ: Mapping[str, str] | None = None) -> dict[str, str]:
+    """AIOX_* context fields from an environment (os.environ read once)."""
+    global _process_env
 
-    # Project detection
-    cwd = data.get("cwd", os.getcwd())
-    data["project"] = detect_project(cwd)
+    if environ is None:
+        if _process_env is None:
+            _process_env = env_context(os.environ)
+        return _process_env
+    return {field: environ[name] for name, field in ENV_FIELDS if environ.get(name)}
 
-    # AIOX context from environment
-    if os.environ.get("AIOX_AGENT"):
-        data["aiox_agent"] = os.environ["AIOX_AGENT"]
 
-    if os.environ.get("AIOX_STORY_ID"):
-        data["aiox_story_id"] = os.environ["AIOX_STORY_ID"]
+def enrich_event(data: dict[str, Any], environ: Mapping[str, str] | None = None) -> dict[str, Any]:
+    """
+    Add AIOX context to event data.
 
-    if os.environ.get("AIOX_TASK_ID"):
-        data["aiox_task_id"] = os.environ["AIOX_TASK_ID"]
+    Args:
+        data: Event data from Claude hook
+        environ: Environment of the hook process (defaults to os.environ;
+            the daemon passes the forwarding hook's AIOX_* variables)
+    """
+    from .context import project_context
 
-    # Try to detect AIOX agent from user prompt if available
-    user_prompt = data.get("user_prompt", "")
-    if user_prompt:
-        detected_agent = detect_agent_from_prompt(user_prompt)
-        if detected_agent and not data.get("aiox_agent"):
+    # Project context (cached per session, see lib/context.py)
+    cwd = data.get("cwd") or os.getcwd()
+    context = project_context(data.get("session_id"), cwd)
+    data["project"] = context["project"]
+    for key, field in CONTEXT_FIELDS:
+        if key in context:
+            data[field] = context[key]
+
+    # AIOX context from environment (overrides the status file)
+    env = env_context(environ)
+    if env.get("aiox_story_id", context.get("story_id")) != context.get("story_id"):
+        data.pop("aiox_task_id", None)  # File task belongs to another story
+    data.update(env)
+
+    # Agent: environment, else activated in this prompt, else the last one
+    # activated in the session (sticky, see lib/agents.py)
+    if not data.get("aiox_agent"):
+        from . import agents
+
+        session_id = data.get("session_id")
+        user_prompt = data.get("user_prompt", "")
+        detected_agent = None
+        if user_prompt and isinstance(user_prompt, str):
+            detected_agent = detect_agent_from_prompt(user_prompt, context["repo_root"])
+        if detected_agent:
+            agents.set_session_agent(session_id, detected_agent)
+        else:
+            detected_agent = agents.session_agent(session_id)
+        if detected_agent:
             data["aiox_agent"] = detected_agent
 
     return data
 
 
 def detect_project(cwd: str) -> str:
-    """Detect project name from cwd."""
-    path = Path(cwd)
+    """Detect project name from cwd (name of the enclosing repo root)."""
+    from .context import find_root
+
+    return os.path.basename(find_root(cwd))
 
-    # Check for common project markers
-    markers = [".git", "package.json", "Cargo.toml", "go.mod", "pyproject.toml"]
-    for marker in markers:
-        if (path / marker).exists():
-            return path.name
 
-    return path.name
+def detect_agent_from_prompt(prompt: str, root: str | None = None) -> str | None:
+    """
+    Detect AIOX agent activation ("@id") from prompt.
 
+    Args:
+        prompt: Full user prompt
+        root: Project root whose installed agents are matched (the default
+            core agents when None)
+    """
+    from .agents import detect
 
-def detect_agent_from_prompt(prompt: str) -> str | None:
-    """Detect AIOX agent activation from prompt."""
-    # Look for @agent patterns
-    match = re.search(r'@(dev|architect|qa|pm|po|sm|analyst|devops|aiox-master)', prompt.lower())
-    if match:
-        return match.group(1)
-    return None
+    return detect(prompt, root)
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Client side of the hook daemon (daemon.py) Unix socket protocol.
+
+Wire format: one header line of NUL-separated fields (event type, cwd, then
+KEY=VALUE for each AIOX_* variable) followed by the raw hook payload; the
+client half-closes the socket and exits without waiting. The daemon uses the
+forwarded cwd and environment for enrichment instead of its own.
+
+Kept import-light on purpose (no json): a forwarded hook loads only this
+module and socket.
+"""
+
+from __future__ import annotations
+
+import os
+
+from .state import STATE_DIR
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:  # typing adds ~10 ms to hook cold start
+    from typing import BinaryIO
+
+DAEMON_ENABLED = os.environ.get("AIOX_MONITOR_DAEMON", "") not in ("", "0")
+SOCKET_PATH = os.environ.get(
+    "AIOX_MONITOR_SOCKET", os.path.join(STATE_DIR, "daemon.sock")
+)
+
+
+def parse_header(line: bytes) -> tuple[str, str, dict[str, str]]:
+    """Decode a header line into (event_type, cwd, environ)."""
+    event_type, cwd, *pairs = line.rstrip(b"\n").decode("utf-8", "surrogateescape").split("\0")
+    return event_type, cwd, dict(pair.partition("=")[::2] for pair in pairs)
+
+
+def forward_to_daemon(event_type: str, stream: BinaryIO) -> bool:
+    """
+    Stream a raw hook payload to the daemon.
+
+    The payload is copied in chunks and never held in memory; stream is
+    left untouched when the daemon can't be reached.
+
+    Returns:
+        True if the daemon accepted it, False if the caller must process
+        the event in-process (daemon disabled, absent or unreachable)
+    """
+    if not DAEMON_ENABLED:
+        return False
+
+    import socket
+
+    fields = [event_type, os.getcwd()]
+    fields += [f"{k}={v}" for k, v in os.environ.items() if k.startswith("AIOX_")]
+    header = "\0".join(fields).replace("\n", " ").encode("utf-8", "surrogateescape")
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(0.2)
+            sock.connect(SOCKET_PATH)
+            sock.sendall(header + b"\n")
+            while chunk := stream.read(65536):
+                sock.sendall(chunk)
+            sock.shutdown(socket.SHUT_WR)
+        return True
+    except (OSError, AttributeError):
+        # No daemon, stale socket, or no AF_UNIX on this platform
+        return False
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Tool-call latency from matching PreToolUse/PostToolUse hooks.
+
+PreToolUse records its start time in calls/<key> in the state dir, keyed by
+session_id and tool_use_id (one tiny file per in-flight call, so concurrent
+hook processes never contend). The matching PostToolUse takes the file and
+builds a ToolMetrics event:
+
+    {"tool_use_id", "tool_name", "session_id", "project", "aiox_agent",
+     "duration_ms", "input_size", "output_size"}
+
+Sizes are the chars of the JSON-encoded tool input/output as received by
+the hook, before truncation. Calls whose PostToolUse never arrives leave a
+start file behind; those are pruned after STALE_CALL_S.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+import zlib
+
+from .state import state_path
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:  # typing adds ~10 ms to hook cold start
+    from typing import Any
+
+METRICS_EVENT = "ToolMetrics"
+OUTPUT_FIELDS = ("tool_result", "tool_response")
+STALE_CALL_S = 24 * 3600
+PRUNE_EVERY = 200  # Prune stale start files on ~1 in N calls
+
+
+def _call_path(data: dict[str, Any]) -> str | None:
+    call_id = data.get("tool_use_id")
+    if not call_id or not isinstance(call_id, str):
+        return None
+    key = zlib.crc32(f"{data.get('session_id') or ''}\0{call_id}".encode("utf-8", "replace"))
+    return state_path("calls", f"{key:08x}")
+
+
+def record_start(data: dict[str, Any], now_ns: int | None = None) -> None:
+    """Remember when a tool call started (PreToolUse)."""
+    path = _call_path(data)
+    if path is None:
+        return
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"{now_ns or time.time_ns()}\n{data['tool_use_id']}")
+
+    import random
+
+    if random.randrange(PRUNE_EVERY) == 0:
+        from .context import prune
+
+        prune(os.path.dirname(path), STALE_CALL_S)
+
+
+def tool_metrics(data: dict[str, Any], now_ns: int | None = None) -> dict[str, Any] | None:
+    """
+    Metrics for a finished tool call (PostToolUse).
+
+    Returns:
+        ToolMetrics event data, or None if the start was not recorded
+    """
+    path = _call_path(data)
+    if path is None:
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            started, _, call_id = f.read().partition("\n")
+        os.remove(path)
+        started_ns = int(started)
+    except (OSError, ValueError):
+        return None
+    if call_id != data["tool_use_id"]:
+        return None  # Key collision with another call
+
+    sizes = (data.get("aiox_payload") or {}).get("sizes") or {}
+    output_size = next((sizes[f] for f in OUTPUT_FIELDS if f in sizes), 0)
+    metrics = {
+        "tool_use_id": call_id,
+        "tool_name": data.get("tool_name"),
+        "session_id": data.get("session_id"),
+        "project": data.get("project"),
+        "duration_ms": round(((now_ns or time.time_ns()) - started_ns) / 1e6, 3),
+        "input_size": sizes.get("tool_input", 0),
+        "output_size": output_size,
+    }
+    if data.get("aiox_agent"):
+        metrics["aiox_agent"] = data["aiox_agent"]
+    return metrics
@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+Bounded-memory streaming reader for hook payloads.
+
+json.load materializes the whole payload before anything can be truncated,
+so a multi-MB Read/Bash result costs its full size (several times over) in
+memory. read_payload parses stdin incrementally in fixed-size chunks and
+truncates while parsing:
+
+- every string is cut to its field's limit (AIOX_MONITOR_MAX_STRING by
+  default) as soon as the limit is reached; the rest is only counted
+- lists/objects keep at most AIOX_MONITOR_MAX_ITEMS entries and nesting
+  deeper than AIOX_MONITOR_MAX_DEPTH is collapsed
+- once AIOX_MONITOR_MAX_EVENT_BYTES of string content is kept, further
+  strings are emptied and containers dropped; object keys are always kept
+  whole (up to 256 chars) and do not count against the budget
+- TOP_LEVEL_RESERVE chars of the budget are set aside for top-level strings
+  (session_id, cwd, tool_use_id...), so a large tool input or result never
+  starves the fields enrichment and correlation depend on
+
+Peak memory is bounded by the chunk size plus the budget, whatever the
+size of the tool output. Original sizes are reported in the returned
+metadata (see read_payload).
+"""
+
+from __future__ import annotations
+
+import codecs
+import json
+import os
+import re
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:  # typing adds ~10 ms to hook cold start
+    from typing import Any, BinaryIO
+
+CHUNK_SIZE = 64 * 1024
+MAX_STRING = int(os.environ.get("AIOX_MONITOR_MAX_STRING", "1000"))
+MAX_ITEMS = int(os.environ.get("AIOX_MONITOR_MAX_ITEMS", "100"))
+MAX_DEPTH = int(os.environ.get("AIOX_MONITOR_MAX_DEPTH", "8"))
+MAX_EVENT_BYTES = int(os.environ.get("AIOX_MONITOR_MAX_EVENT_BYTES", "65536"))
+TOP_LEVEL_RESERVE = 4096  # Budget chars kept for top-level strings
+MAX_REPORTED = 20  # Truncated paths listed in the metadata
+DEFAULT_SUFFIX = "...[truncated]"
+
+_PLAIN = re.compile(r'[^"\\]*')
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_SCALAR = re.compile(r"-?\d+(\.\d+)?([eE][-+]?\d+)?|true|false|null")
+_STRUCTURAL = re.compile(r'[^"\[\]{},]*')
+
+
+class PayloadError(ValueError):
+    """The payload is not valid JSON."""
+
+
+class _Reader:
+    """Character buffer over a byte stream, refilled in CHUNK_SIZE reads."""
+
+    def __init__(self, stream: BinaryIO):
+        self.stream = stream
+        self.decoder = codecs.getincrementaldecoder("utf-8")("replace")
+        self.buf = ""
+        self.pos = 0
+        self.bytes_read = 0
+        self.decoded = 0  # Chars decoded so far
+        self.eof = False
+
+    def fill(self, need: int = 1) -> bool:
+        """Ensure at least need chars are buffered. False at end of input."""
+        while len(self.buf) - self.pos < need and not self.eof:
+            chunk = self.stream.read(CHUNK_SIZE)
+            self.bytes_read += len(chunk)
+            if not chunk:
+                self.eof = True
+                text = self.decoder.decode(b"", final=True)
+            else:
+                text = self.decoder.decode(chunk)
+            self.decoded += len(text)
+            self.buf = self.buf[self.pos:] + text
+            self.pos = 0
+        return len(self.buf) - self.pos >= need
+
+    def offset(self) -> int:
+        """Chars consumed from the start of the payload."""
+        return self.decoded - (len(self.buf) - self.pos)
+
+    def peek(self) -> str:
+        self.skip_whitespace()
+        if not self.fill():
+            raise PayloadError("unexpected end of payload")
+        return self.buf[self.pos]
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise PayloadError(f"expected {char!r} at byte ~{self.bytes_read}")
+        self.pos += 1
+
+    def skip_whitespace(self) -> None:
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf) or not self.fill():
+                return
+
+
+class _Parser:
+    def __init__(self, reader: _Reader, budget: int):
+        self.reader = reader
+        self.budget = budget
+        self.truncated: dict[str, int] = {}
+        self.dropped_items = 0
+
+    def note(self, path: str, original: int) -> None:
+        if len(self.truncated) < MAX_REPORTED:
+            self.truncated[path or "$"] = original
+
+    def value(self, path: str, depth: int, limit: int, suffix: str) -> Any:
+        char = self.reader.peek()
+        if char == '"':
+            return self.string(path, limit, suffix)
+        if char == "{":
+            return self.container(path, depth, limit, suffix, is_object=True)
+        if char == "[":
+            return self.container(path, depth, limit, suffix, is_object=False)
+        return self.scalar()
+
+    def scalar(self) -> Any:
+        reader = self.reader
+        reader.fill(64)  # Longest number/literal we expect
+        match = _SCALAR.match(reader.buf, reader.pos)
+        if not match:
+            raise PayloadError(f"unexpected token at byte ~{reader.bytes_read}")
+        reader.pos = match.end()
+        return json.loads(match.group(0))
+
+    def string(self, path: str | None, limit: int, suffix: str, budgeted: bool = True) -> str:
+        """
+        Parse a JSON string keeping at most ~limit chars (and no more than
+        the remaining budget, unless not budgeted).
+
+        Only the kept raw source is retained (escapes are decoded at the
+        end), so a huge string never exists in memory.
+        """
+        reader = self.reader
+        reader.expect('"')
+        limit = max(0, min(limit, self.budget) if budgeted else limit)
+        kept: list[str] = []
+        kept_len = 0
+        total = 0
+
+        while True:
+            if not reader.fill():
+                raise PayloadError("unterminated string")
+            end = _PLAIN.match(reader.buf, reader.pos).end()
+            run = end - reader.pos
+            if run:
+                if kept_len < limit:
+                    take = min(run, limit - kept_len)
+                    kept.append(reader.buf[reader.pos:reader.pos + take])
+                    kept_len += take
+                total += run
+                reader.pos = end
+            if reader.pos >= len(reader.buf):
+                continue  # Run reached the end of the buffer
+
+            char = reader.buf[reader.pos]
+            if char == '"':
+                reader.pos += 1
+                break
+            # Backslash escape: keep it whole or not at all
+            reader.fill(6)
+            length = 6 if reader.buf[reader.pos + 1:reader.pos + 2] == "u" else 2
+            escape = reader.buf[reader.pos:reader.pos + length]
+            if kept_len + length <= limit:
+                kept.append(escape)
+                kept_len += length
+            else:
+                limit = kept_len  # Keep nothing after a char that did not fit
+            total += length
+            reader.pos += length
+
+        try:
+            text = json.loads('"' + "".join(kept) + '"', strict=False)
+        except ValueError:
+            raise PayloadError("invalid string escape") from None
+        if budgeted:
+            self.budget -= len(text)
+
+        if total > kept_len:
+            if path is not None:
+                self.note(path, total)
+            return text + suffix
+        return text
+
+    def container(self, path: str, depth: int, limit: int, suffix: str, is_object: bool) -> Any:
+        reader = self.reader
+        close = "}" if is_object else "]"
+        reader.expect("{" if is_object else "[")
+
+        if depth >= MAX_DEPTH or self.budget <= 0:
+            count = self.skip_container(close)
+            self.dropped_items += count
+            self.note(path, count)
+            return {} if is_object else []
+
+        result: Any = {} if is_object else []
+        count = 0
+        if reader.peek() == close:
+            reader.pos += 1
+            return result
+
+        while True:
+            if is_object:
+                key = self.string(None, 256, "", budgeted=False)
+                reader.expect(":")
+                child = f"{path}.{key}" if path else key
+            else:
+                child = f"{path}[{count}]"
+
+            if count < MAX_ITEMS and self.budget > 0:
+                item = self.value(child, depth + 1, limit, suffix)
+                if is_object:
+                    result[key] = item
+                else:
+                    result.append(item)
+            else:
+                self.skip_value()
+                self.dropped_items += 1
+            count += 1
+
+            char = reader.peek()
+            reader.pos += 1
+            if char == close:
+                break
+            if char != ",":
+                raise PayloadError(f"expected ',' or {close!r} at byte ~{reader.bytes_read}")
+
+        if count > MAX_ITEMS or (self.budget <= 0 and count > len(result)):
+            self.note(path, count)
+        return result
+
+    def skip_value(self) -> None:
+        """Consume one value without keeping anything."""
+        char = self.reader.peek()
+        if char == '"':
+            self.string(None, 0, "")
+        elif char in "{[":
+            self.reader.pos += 1
+            self.skip_container("}" if char == "{" else "]")
+        else:
+            self.scalar()
+
+    def skip_container(self, close: str) -> int:
+        """Skip to the matching close bracket. Returns its item count."""
+        reader = self.reader
+        depth = 1
+        commas = 0
+        empty = True
+        while depth:
+            if not reader.fill():
+                raise PayloadError("unterminated container")
+            start = reader.pos
+            reader.pos = _STRUCTURAL.match(reader.buf, reader.pos).end()
+            if reader.buf[start:reader.pos].strip():
+                empty = False
+            if reader.pos >= len(reader.buf):
+                continue
+            char = reader.buf[reader.pos]
+            if char == '"':
+                self.string(None, 0, "")
+                empty = False
+                continue
+            reader.pos += 1
+            if char in "[{":
+                depth += 1
+                empty = False
+            elif char in "]}":
+                depth -= 1
+            elif depth == 1:
+                commas += 1
+        return 0 if empty else commas + 1
+
+
+def read_payload(
+    stream: BinaryIO,
+    fields: dict[str, tuple[int, str]] | None = None,
+    budget: int = MAX_EVENT_BYTES,
+) -> tuple[Any, dict[str, Any]]:
+    """
+    Parse a hook payload from a binary stream with bounded memory.
+
+    Args:
+        stream: Binary input (sys.stdin.buffer, a socket file, ...)
+        fields: Per top-level key (max chars, suffix) for strings anywhere
+            under that key; other strings use AIOX_MONITOR_MAX_STRING
+        budget: Total chars of string content kept for the whole event
+
+    Returns:
+        (data, meta) where meta is {"bytes": payload size}, "sizes"
+        ({top-level key: chars of its JSON source}) for an object payload,
+        plus "truncated" ({path: original size}) and "dropped_items" when
+        anything was cut
+    """
+    reader = _Reader(stream)
+    reserve = min(budget, TOP_LEVEL_RESERVE)
+    parser = _Parser(reader, budget - reserve)
+    fields = fields or {}
+
+    if reader.peek() == "{":
+        # Top level: apply per-field rules to each key's subtree
+        reader.pos += 1
+        data: Any = {}
+        sizes: dict[str, int] = {}
+        if reader.peek() == "}":
+            reader.pos += 1
+        else:
+            while True:
+                key = parser.string(None, 256, "", budgeted=False)
+                reader.expect(":")
+                limit, suffix = fields.get(key, (MAX_STRING, DEFAULT_SUFFIX))
+                reader.skip_whitespace()
+                start = reader.offset()
+                if reader.peek() == '"':
+                    # Top-level strings draw on the reserve first, then the shared budget
+                    parser.budget += reserve
+                    before = parser.budget
+                    data[key] = parser.value(key, 1, limit, suffix)
+                    reserve = max(0, reserve - (before - parser.budget))
+                    parser.budget -= reserve
+                else:
+                    data[key] = parser.value(key, 1, limit, suffix)
+                sizes[key] = reader.offset() - start
+                char = reader.peek()
+                reader.pos += 1
+                if char == "}":
+                    break
+                if char != ",":
+                    raise PayloadError("expected ',' or '}'")
+    else:
+        sizes = None
+        data = parser.value("", 0, MAX_STRING, DEFAULT_SUFFIX)
+
+    # Drain anything after the document so bytes reflects the full payload
+    while reader.fill(CHUNK_SIZE):
+        reader.pos = len(reader.buf)
+
+    meta: dict[str, Any] = {"bytes": reader.bytes_read}
+    if sizes:
+        meta["sizes"] = sizes
+    if parser.truncated:
+        meta["truncated"] = parser.truncated
+    if parser.dropped_items:
+        meta["dropped_items"] = parser.dropped_items
+    return data, meta
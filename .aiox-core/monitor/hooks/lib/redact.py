@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Secret redaction for hook payloads.
+
+Tool inputs and results can carry tokens, keys and passwords. Every string
+in a loaded event (after streaming truncation, before enrichment) is
+scanned once by a single regex that combines all secret patterns, and each
+secret found is replaced with [REDACTED:<pattern name>]. Counts per pattern
+are reported in aiox_payload["redacted"].
+
+PATTERNS covers common credentials. AIOX_MONITOR_REDACT_PATTERNS names a
+JSON file of {name: regex} merged over them (null removes a default). A
+pattern with a capture group only redacts that group, keeping context such
+as "Bearer ". Leading inline flags such as (?i) apply to their own pattern
+only. Groups are renumbered in the combined regex, so numbered
+backreferences (\\1) are not supported: use (?P<name>...) and (?P=name).
+A pattern that does not compile as part of the combined regex, or that
+uses numbered backreferences, is skipped with a warning on stderr; the
+others stay active.
+AIOX_MONITOR_REDACT=0 disables redaction.
+
+Speed: the branches of the combined regex start with literals and carry no
+leading groups, so the regex engine skips ahead to candidate characters
+instead of trying every pattern at every position; an empty named group at
+the end of each branch tells which pattern matched. Leading \\b assertions
+and the key names of "password=..."-style assignments (CONTEXT) are checked
+per hit: the scan itself only looks for the last letter of such a key
+followed by ":" or "=", and the key name is compared afterwards. Patterns
+that start with a literal keep the scan fast; bench/bench_redact.py checks
+the cost per KB.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import sys
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:  # typing adds ~10 ms to hook cold start
+    from typing import Any
+
+ENABLED = os.environ.get("AIOX_MONITOR_REDACT", "1") not in ("", "0")
+PATTERNS_FILE = os.environ.get("AIOX_MONITOR_REDACT_PATTERNS", "")
+MIN_SECRET_CHARS = 8  # Shorter strings cannot hold a secret worth scanning for
+_GLOBAL_FLAGS = re.compile(r"\(\?([aiLmsux]+)\)")
+# Numbered backreferences (\1, (?(1)...)); escapes and classes are skipped whole
+_PATTERN_TOKENS = re.compile(r"(?P<ref>\\[1-9]|\(\?\(\d+\))|\\.|\[\^?\]?(?:\\.|[^\]\\])*\]", re.DOTALL)
+
+PATTERNS = {
+    "private_key": r"-----BEGIN [A-Z ]{0,20}PRIVATE KEY-----[\s\S]*?(?:-----END [A-Z ]{0,20}PRIVATE KEY-----|\Z)",
+    "aws_access_key": r"\b(?:AKIA|ASIA)[0-9A-Z]{16}\b",
+    "github_token": r"\b(?:gh[pousr]_[A-Za-z0-9]{36,}|github_pat_[A-Za-z0-9_]{22,})",
+    "api_key": r"\bsk-(?:ant-|proj-)?[A-Za-z0-9_-]{20,}",
+    "slack_token": r"\bxox[abprs]-[A-Za-z0-9-]{10,}",
+    "google_api_key": r"\bAIza[0-9A-Za-z_-]{35}",
+    "jwt": r"\beyJ[A-Za-z0-9_-]{8,}\.eyJ[A-Za-z0-9_-]{8,}\.[A-Za-z0-9_-]{8,}",
+    "bearer": r"\b[Bb]earer\s+([A-Za-z0-9._~+/-]{16,}=*)",
+    "url_password": r"://[^/\s:@]{1,64}:([^/\s@]{1,128})@",
+    "assignment": r"[dDtTnNyY][\"']?\s{0,3}[:=]\s{0,3}[\"']?([^\s\"',;&]{6,})",
+}
+# Key names (lowercase) that must end with the first character of a hit
+CONTEXT = {
+    "assignment": (
+        "password", "passwd", "secret", "token", "apikey", "api_key",
+        "accesskey", "access_key", "clientsecret", "client_secret",
+    ),
+}
+
+
+class Redactor:
+    """All patterns compiled into one alternation, scanned in one pass."""
+
+    def __init__(self, patterns: dict[str, str], context: dict[str, tuple[str, ...]] = CONTEXT):
+        branches = []
+        for index, (name, pattern) in enumerate(patterns.items()):
+            if pattern.startswith("\\b"):
+                pattern = pattern[2:]
+            branches.append(f"(?:{pattern})(?P<_{index}>)")
+        self.regex = re.compile("|".join(branches)) if branches else None
+
+        # Per end-marker group: (name, group of the secret or 0, boundary?, key names)
+        self.markers: dict[int, tuple[str, int, bool, Any]] = {}
+        previous = 0
+        for index, (name, pattern) in enumerate(patterns.items()):
+            marker = self.regex.groupindex[f"_{index}"]
+            secret = previous + 1 if marker > previous + 1 else 0
+            self.markers[marker] = (name, secret, pattern.startswith("\\b"), context.get(name))
+            previous = marker
+        self.counts: dict[str, int] = {}
+
+    def confirm(self, match: re.Match) -> tuple[str, int, int] | None:
+        """(pattern name, secret start, secret end) of a scan hit, or None."""
+        name, secret, boundary, keys = self.markers[match.lastindex]
+        text, start = match.string, match.start()
+        if boundary and start and _is_word(text[start - 1]) == _is_word(text[start]):
+            return None
+        if keys and not text[max(0, start - 15):start + 1].lower().endswith(keys):
+            return None
+        return (name, *match.span(secret))
+
+    def redact_string(self, text: str) -> str:
+        pieces = []
+        done = position = 0
+        search = self.regex.search
+        while True:
+            match = search(text, position)
+            if match is None:
+                break
+            hit = self.confirm(match)
+            if hit is None:
+                position = match.start() + 1  # A secret may still start inside this hit
+                continue
+            name, secret_start, secret_end = hit
+            self.counts[name] = self.counts.get(name, 0) + 1
+            pieces.append(text[done:secret_start])
+            pieces.append(f"[REDACTED:{name}]")
+            done = position = max(secret_end, match.start() + 1)
+        if not pieces:
+            return text
+        pieces.append(text[done:])
+        return "".join(pieces)
+
+    def redact(self, value: Any) -> Any:
+        """Redact every string in a JSON-like value (returns the new value)."""
+        if isinstance(value, str):
+            if len(value) < MIN_SECRET_CHARS:
+                return value
+            return self.redact_string(value)
+        if isinstance(value, dict):
+            return {k: self.redact(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [self.redact(v) for v in value]
+        return value
+
+
+def scoped(pattern: str) -> str:
+    """Turn leading global flags ((?i)...) into a group scoped to the pattern."""
+    match = _GLOBAL_FLAGS.match(pattern)
+    if match is None:
+        return pattern
+    return f"(?{match.group(1)}:{pattern[match.end():]})"
+
+
+def numbered_reference(pattern: str) -> str | None:
+    """The first numbered backreference in a pattern, or None."""
+    for token in _PATTERN_TOKENS.finditer(pattern):
+        if token.group("ref"):
+            return token.group("ref")
+    return None
+
+
+def load_patterns(path: str = PATTERNS_FILE) -> dict[str, str]:
+    """
+    PATTERNS merged with the configured pattern file (if any).
+
+    Configured patterns that cannot be combined with the others are left
+    out, with a warning on stderr.
+    """
+    patterns = dict(PATTERNS)
+    if not path:
+        return patterns
+    try:
+        with open(path, encoding="utf-8") as f:
+            extra = json.load(f)
+    except (OSError, ValueError):
+        return patterns
+    if isinstance(extra, dict):
+        for name, pattern in extra.items():
+            if pattern is None:
+                patterns.pop(name, None)
+                continue
+            try:
+                pattern = scoped(pattern)
+                re.compile(f"(?:{pattern})")  # As a branch of the combined regex
+                reference = numbered_reference(pattern)
+                if reference:
+                    raise re.error(f"numbered backreference {reference} (use (?P<name>...) and (?P=name))")
+            except (re.error, TypeError) as e:
+                # One bad pattern must not disable the rest
+                sys.stderr.write(f"aiox-monitor: redact pattern {name!r} skipped: {e}\n")
+                continue
+            patterns[name] = pattern
+    return patterns
+
+
+_redactor: Redactor | None = None
+
+
+def _is_word(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+def redact_event(data: Any) -> Any:
+    """
+    Redact secrets from a loaded hook event.
+
+    Returns:
+        The event with secrets replaced; aiox_payload["redacted"] holds
+        {pattern name: count} when anything was found
+    """
+    global _redactor
+
+    if not ENABLED or not isinstance(data, dict):
+        return data
+    if _redactor is None:
+        try:
+            _redactor = Redactor(load_patterns())
+        except re.error as e:
+            # Configured patterns clash when combined (e.g. group names)
+            sys.stderr.write(f"aiox-monitor: custom redact patterns ignored: {e}\n")
+            _redactor = Redactor(PATTERNS)
+    if _redactor.regex is None:
+        return data
+
+    _redactor.counts = {}
+    meta = data.get("aiox_payload")
+    redacted = _redactor.redact({k: v for k, v in data.items() if k != "aiox_payload"})
+    if _redactor.counts:
+        if isinstance(meta, dict):
+            meta["redacted"] = _redactor.counts
+    if meta is not None:
+        redacted["aiox_payload"] = meta
+    return redacted
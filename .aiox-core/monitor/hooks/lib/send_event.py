@@ -2,45 +2,324 @@
 """
 Send event to AIOX Monitor server.
 Non-blocking with short timeout to avoid slowing Claude.
+
+Delivery modes (AIOX_MONITOR_DELIVERY):
+    direct - POST each event to the server from the hook (default)
+    spool  - append to the local spool and let flush.py deliver it
+
+Direct delivery goes through the shared circuit breaker (lib/breaker.py).
+While it is open, AIOX_MONITOR_ON_OPEN decides what happens to events:
+    drop   - skip sending them (default)
+    spool  - divert them to the spool, flushed once the server is back
+
+Events that are not delivered (send failed, or skipped by the open
+circuit) are kept in the local event store (lib/store.py) and replayed by
+replay.py once the server is back; with AIOX_MONITOR_STORE=off they are
+lost.
+
+Every event is also copied to the extra sinks in AIOX_MONITOR_SINKS (files,
+Unix sockets, more HTTP endpoints) on background threads, under a single
+deadline (lib/sinks.py).
+
+Hooks are one-shot processes, so the direct path writes a plain HTTP/1.1
+request on a socket instead of importing urllib.request (~50 ms of imports
+per event). https URLs and long-lived senders use http.client.
 """
 
+from __future__ import annotations
+
 import json
 import os
 import time
-import urllib.request
-from typing import Any
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:  # typing adds ~10 ms to hook cold start
+    from typing import Any
 
 SERVER_URL = os.environ.get("AIOX_MONITOR_URL", "http://localhost:4001")
 TIMEOUT_MS = int(os.environ.get("AIOX_MONITOR_TIMEOUT_MS", "500"))
+DELIVERY = os.environ.get("AIOX_MONITOR_DELIVERY", "direct")
+ON_OPEN = os.environ.get("AIOX_MONITOR_ON_OPEN", "drop")
+DEDUP = os.environ.get("AIOX_MONITOR_DEDUP", "") not in ("", "0")
+STORE_ALL = os.environ.get("AIOX_MONITOR_STORE") == "all"  # Archive delivered events too
+SINKS = os.environ.get("AIOX_MONITOR_SINKS", "").strip()  # Extra sinks (lib/sinks.py)
+
+
+class HTTPStatusError(Exception):
+    """The server answered with a 4xx/5xx status."""
+
+    def __init__(self, code: int, url: str):
+        super().__init__(f"HTTP {code} from {url}")
+        self.code = code
+
+
+def is_outage(error: Exception) -> bool:
+    """True if a delivery error means the server is down (not a bad event)."""
+    return not isinstance(error, HTTPStatusError) or error.code >= 500
+
+
+def is_poison(error: Exception) -> bool:
+    """True if the server rejected the event itself (retrying won't help)."""
+    return (
+        isinstance(error, HTTPStatusError)
+        and 400 <= error.code < 500
+        and error.code not in (408, 429)
+    )
+
+
+def split_url(url: str) -> tuple[str, str, int, str]:
+    """Split a server URL into (scheme, host, port, base_path)."""
+    scheme, _, rest = url.partition("://")
+    netloc, _, path = rest.partition("/")
+    host, port = netloc, None
+    if ":" in netloc and not netloc.endswith("]"):
+        host, _, port = netloc.rpartition(":")
+    host = host.strip("[]") or "localhost"
+    default_port = 443 if scheme == "https" else 80
+    return scheme, host, int(port) if port else default_port, ("/" + path).rstrip("/")
+
+
+def serialize_event(event_type: str, data: dict[str, Any]) -> bytes:
+    """Build the wire payload for one event (timestamped at creation)."""
+    return json.dumps({
+        "type": event_type,
+        "timestamp": int(time.time() * 1000),
+        "data": data
+    }).encode("utf-8")
+
+
+def post_payload(
+    payload: bytes,
+    path: str = "/events",
+    headers: dict[str, str] | None = None,
+    timeout_ms: int = TIMEOUT_MS,
+    url: str = SERVER_URL,
+) -> None:
+    """POST one request body to the server (or url). Raises on failure."""
+    scheme, host, port, base_path = split_url(url)
+    if scheme == "https":
+        conn = MonitorConnection(url, timeout_ms)
+        try:
+            conn.post(path, payload, headers)
+        finally:
+            conn.close()
+        return
+
+    import socket
+
+    head = (
+        f"POST {base_path}{path} HTTP/1.1\r\n"
+        f"Host: {host}:{port}\r\n"
+        "Content-Type: application/json\r\n"
+        + "".join(f"{k}: {v}\r\n" for k, v in (headers or {}).items())
+        + f"Content-Length: {len(payload)}\r\n"
+        "Connection: close\r\n\r\n"
+    )
+    # Bytes skip the idna codec import in getaddrinfo for ASCII hosts
+    address = (host.encode("ascii") if host.isascii() else host, port)
+    with socket.create_connection(address, timeout=timeout_ms / 1000) as sock:
+        sock.sendall(head.encode("latin-1") + payload)
+        status_line = b""
+        while b"\r\n" not in status_line:
+            chunk = sock.recv(256)
+            if not chunk:
+                break
+            status_line += chunk
+
+    status = int(status_line.split(b" ", 2)[1])
+    if status >= 400:
+        raise HTTPStatusError(status, url + path)
+
+
+class MonitorConnection:
+    """
+    Keep-alive HTTP connection to the monitor server.
+
+    For long-lived senders (daemon.py, flush.py); one-shot hooks use
+    post_payload instead.
+    """
+
+    def __init__(self, url: str = SERVER_URL, timeout_ms: int = TIMEOUT_MS):
+        self.url = url.rstrip("/")
+        scheme, self.host, self.port, self.base_path = split_url(url)
+        self.https = scheme == "https"
+        self.timeout = timeout_ms / 1000
+        self._conn = None
+
+    def _connect(self):
+        import http.client
+
+        cls = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+        self._conn = cls(self.host, self.port, timeout=self.timeout)
+        return self._conn
+
+    def post(self, path: str, body: bytes, headers: dict[str, str] | None = None) -> int:
+        """
+        POST body to path. Raises HTTPStatusError on 4xx/5xx and
+        OSError/HTTPException on transport errors.
+
+        Returns:
+            HTTP status code
+        """
+        import http.client
+
+        headers = {"Content-Type": "application/json", **(headers or {})}
+        for attempt in (0, 1):
+            conn = self._conn or self._connect()
+            try:
+                conn.request("POST", self.base_path + path, body=body, headers=headers)
+                response = conn.getresponse()
+                response.read()
+                break
+            except (http.client.HTTPException, OSError):
+                # Server may have closed an idle keep-alive socket: retry once
+                self.close()
+                if attempt:
+                    raise
+
+        if response.status >= 400:
+            raise HTTPStatusError(response.status, self.url + path)
+        return response.status
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+def deliver(payload: bytes, post=None, divert: bool = True) -> bool:
+    """
+    Deliver serialized events through the circuit breaker.
+
+    Args:
+        payload: Serialized event (serialize_event), or several joined by
+            newlines when post sends batches (lib/batch.py)
+        post: Transport, post_payload by default (daemon passes its
+            keep-alive connection)
+        divert: Whether ON_OPEN=spool may spool the event while open
+
+    Returns:
+        True if sent or diverted, False if skipped by an open circuit.
+        Raises the transport error if the send itself failed.
+    """
+    from . import breaker
+
+    post = post or post_payload
+
+    if breaker.allow() == breaker.OPEN:
+        diverted = divert and ON_OPEN == "spool"
+        if diverted:
+            from .spool import append
+
+            append(payload + b"\n")
+            outcome = "diverted"
+        else:
+            from .store import MODE
+
+            outcome = "dropped" if MODE == "off" else "deferred"  # The caller stores it
+        breaker.record_skipped(outcome, payload.count(b"\n") + 1)
+        return diverted
+
+    try:
+        post(payload)
+    except Exception as e:
+        if is_outage(e):
+            breaker.record_failure()
+        raise
+
+    close_circuit(post)
+    return True
+
+
+def close_circuit(post, replay: bool = True) -> None:
+    """
+    Close the circuit after a successful send. If it was open, report what
+    the outage cost (MonitorRecovered), then drain anything diverted and,
+    with replay, start replaying what was stored.
+    """
+    from . import breaker
+
+    recovered = breaker.record_success()
+    if not recovered:
+        return
+    try:
+        post(serialize_event("MonitorRecovered", recovered))
+    except Exception:
+        pass
+    if ON_OPEN == "spool":
+        from .spool import ensure_flusher
+
+        ensure_flusher()
+    if replay:
+        from .store import ensure_replay
+
+        ensure_replay()
 
 
-def send_event(event_type: str, data: dict[str, Any]) -> bool:
+def prepare_event(event_type: str, data: dict[str, Any]) -> tuple[bytes, Any]:
+    """
+    Serialize an event for delivery, deduplicating large fields.
+
+    Returns:
+        (payload, pending) - pending blobs (or None) to commit once the
+        payload is delivered
+    """
+    pending = None
+    if DEDUP and isinstance(data, dict):
+        from .blobs import dedup
+
+        data, pending = dedup(data, SERVER_URL)
+    return serialize_event(event_type, data), pending
+
+
+def publish(payload: bytes) -> None:
+    """Copy a serialized event to the extra sinks, if any (never raises)."""
+    if not SINKS:
+        return
+    try:
+        from .sinks import publish as publish_to_sinks
+
+        publish_to_sinks(payload)
+    except Exception:
+        pass
+
+
+def send_event(event_type: str, data: dict[str, Any], post=None) -> bool:
     """
     Send event to AIOX Monitor server.
 
     Args:
         event_type: Hook event type (PreToolUse, PostToolUse, etc.)
         data: Event data from Claude hook
+        post: Transport override for direct delivery (see deliver)
 
     Returns:
-        True if sent successfully, False otherwise
+        True if sent (or spooled) successfully, False otherwise
     """
     try:
-        payload = json.dumps({
-            "type": event_type,
-            "timestamp": int(time.time() * 1000),
-            "data": data
-        }).encode("utf-8")
-
-        req = urllib.request.Request(
-            f"{SERVER_URL}/events",
-            data=payload,
-            headers={"Content-Type": "application/json"},
-            method="POST"
-        )
-
-        urllib.request.urlopen(req, timeout=TIMEOUT_MS / 1000)
-        return True
+        payload, pending = prepare_event(event_type, data)
+        publish(payload)
+
+        if DELIVERY == "spool":
+            from .spool import append, ensure_flusher
+
+            append(payload + b"\n")
+            ensure_flusher()
+            sent = True
+        else:
+            try:
+                sent = deliver(payload, post)
+            except Exception:
+                sent = False
+            if not sent or STORE_ALL:
+                from .store import keep
+
+                keep([payload], sent)
+
+        if sent and pending:
+            # Only now may later events reference these blobs
+            pending.commit()
+        return sent
 
     except Exception:
         # Silent fail - never block Claude
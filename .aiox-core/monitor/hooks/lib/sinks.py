@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Fan-out of events to extra sinks (AIOX_MONITOR_SINKS).
+
+Besides the monitor server (AIOX_MONITOR_URL, with its circuit breaker,
+spool and store), every event can be copied to further sinks, listed
+comma-separated:
+
+    AIOX_MONITOR_SINKS="file:///var/log/aiox/events.jsonl,
+                        unix:///run/aiox/consumer.sock?timeout_ms=100,
+                        http://archive.local:4002?retries=2"
+
+    http(s)://...  POST to <url>/events
+    file://PATH    append one JSON line per event (O_APPEND)
+    unix://PATH    connect, write the JSON line, close
+
+Each sink has its own worker thread and bounded queue, so a slow or dead
+sink never holds up the server or the other sinks. Per-sink options, as a
+query string:
+
+    timeout_ms  per attempt (default AIOX_MONITOR_TIMEOUT_MS)
+    retries     extra attempts after a failure (default 1)
+    retry_ms    wait before the first retry, doubled per retry (default 50)
+    queue       max queued events; further events are dropped (default 1000)
+
+An event must reach its sinks within AIOX_MONITOR_SINKS_DEADLINE_MS of being
+published (default 500): attempts are cut short and retries given up at the
+deadline. On exit a hook waits for its sinks until the deadline of its last
+event at most, then abandons what is left: sinks are best effort, with no
+spool, store or replay.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+
+from .send_event import TIMEOUT_MS
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:  # typing adds ~10 ms to hook cold start
+    from typing import Any
+
+SINKS = os.environ.get("AIOX_MONITOR_SINKS", "")
+DEADLINE_MS = int(os.environ.get("AIOX_MONITOR_SINKS_DEADLINE_MS", "500"))
+DEFAULTS = {"timeout_ms": TIMEOUT_MS, "retries": 1, "retry_ms": 50, "queue": 1000}
+
+
+def parse_sinks(spec: str) -> list[tuple[str, str, dict[str, int]]]:
+    """Parse AIOX_MONITOR_SINKS into (scheme, target, options) per sink."""
+    sinks = []
+    for entry in spec.replace("\n", ",").split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        url, _, query = entry.partition("?")
+        scheme, _, target = url.partition("://")
+        options = dict(DEFAULTS)
+        for pair in query.split("&") if query else ():
+            key, _, value = pair.partition("=")
+            if key in options and value.isdigit():
+                options[key] = int(value)
+        if scheme in ("http", "https"):
+            target = url
+        elif scheme not in ("file", "unix") or not target:
+            continue  # Unknown sink: ignore, never fail the hook
+        sinks.append((scheme, target, options))
+    return sinks
+
+
+def write_file(path: str, line: bytes, timeout_ms: int) -> None:
+    """Append one line; a single O_APPEND write keeps concurrent hooks whole."""
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+    try:
+        os.write(fd, line)
+    finally:
+        os.close(fd)
+
+
+def write_unix(path: str, line: bytes, timeout_ms: int) -> None:
+    """Send one line to a Unix stream socket."""
+    import socket
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout_ms / 1000)
+        sock.connect(path)
+        sock.sendall(line)
+
+
+def post_http(url: str, line: bytes, timeout_ms: int) -> None:
+    from .send_event import post_payload
+
+    post_payload(line[:-1], timeout_ms=timeout_ms, url=url)
+
+
+WRITERS = {"file": write_file, "unix": write_unix, "http": post_http, "https": post_http}
+
+
+class Sink:
+    """One sink: a bounded queue drained by a daemon worker thread."""
+
+    def __init__(self, scheme: str, target: str, options: dict[str, int]):
+        import queue
+
+        self.name = f"{scheme}://{target}" if scheme in ("file", "unix") else target
+        self.target = target
+        self.write = WRITERS[scheme]
+        self.options = options
+        self.queue: Any = queue.Queue(maxsize=max(1, options["queue"]))
+        self.sent = 0
+        self.dropped = 0
+        threading.Thread(target=self.run, name=f"sink {self.name}", daemon=True).start()
+
+    def put(self, line: bytes, deadline: float) -> None:
+        """Queue an event without blocking; drop it if the queue is full."""
+        try:
+            self.queue.put_nowait((line, deadline))
+        except Exception:
+            self.dropped += 1
+
+    def run(self) -> None:
+        while True:
+            line, deadline = self.queue.get()
+            try:
+                self.send(line, deadline)
+            finally:
+                self.queue.task_done()
+
+    def send(self, line: bytes, deadline: float) -> None:
+        """Write one event, retrying with backoff until its deadline."""
+        delay = self.options["retry_ms"] / 1000
+        for _ in range(self.options["retries"] + 1):
+            remaining_ms = (deadline - time.monotonic()) * 1000
+            if remaining_ms <= 0:
+                break
+            try:
+                self.write(self.target, line, min(self.options["timeout_ms"], remaining_ms))
+                self.sent += 1
+                return
+            except Exception:
+                if time.monotonic() + delay >= deadline:
+                    break
+                time.sleep(delay)
+                delay *= 2
+        self.dropped += 1
+
+    def wait(self, deadline: float) -> bool:
+        """Wait until the queue is empty or deadline passes. True if empty."""
+        done = self.queue.all_tasks_done
+        with done:
+            while self.queue.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                done.wait(remaining)
+        return True
+
+
+_sinks: list[Sink] | None = None
+_deadline = 0.0  # Of the last published event
+_lock = threading.Lock()
+
+
+def sinks() -> list[Sink]:
+    """Configured sinks, started on first use."""
+    global _sinks
+
+    with _lock:
+        if _sinks is None:
+            _sinks = [Sink(*sink) for sink in parse_sinks(SINKS)]
+            if _sinks:
+                import atexit
+
+                atexit.register(drain)
+        return _sinks
+
+
+def publish(payload: bytes) -> None:
+    """Copy a serialized event (serialize_event) to every sink."""
+    global _deadline
+
+    _deadline = time.monotonic() + DEADLINE_MS / 1000
+    line = payload + b"\n"
+    for sink in sinks():
+        sink.put(line, _deadline)
+
+
+def drain(timeout_s: float | None = None) -> bool:
+    """
+    Wait for queued events to reach the sinks.
+
+    Args:
+        timeout_s: Max wait; by default until the deadline of the last
+            published event
+
+    Returns:
+        True if every queue was emptied in time
+    """
+    deadline = _deadline if timeout_s is None else time.monotonic() + timeout_s
+    return all([sink.wait(deadline) for sink in _sinks or ()])
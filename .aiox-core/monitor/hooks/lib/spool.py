@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Append-only local spool for monitor events.
+
+Hooks append one serialized event per line (a single O_APPEND write, so
+concurrent hooks never interleave). The flusher (flush.py) claims the active
+spool by renaming it to a ready segment, drains it in batches and records a
+committed byte offset after every batch, so a crashed flusher resumes where
+it left off and events are delivered at least once.
+"""
+
+import os
+import time
+
+from .state import ensure_running, state_path
+
+ACTIVE_NAME = "events.ndjson"
+READY_SUFFIX = ".ready"
+# How long a claimed segment may still receive writes from hooks that
+# opened the active spool just before it was renamed.
+CLAIM_GRACE_S = 1.0
+
+
+def spool_dir() -> str:
+    """Return the spool directory, creating it if needed."""
+    return os.path.dirname(state_path("spool", ACTIVE_NAME))
+
+
+def append(line: bytes) -> None:
+    """Append one newline-terminated event to the active spool."""
+    path = os.path.join(spool_dir(), ACTIVE_NAME)
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+    try:
+        os.write(fd, line)
+    finally:
+        os.close(fd)
+
+
+def has_active() -> bool:
+    """Whether the active spool holds events not claimed yet."""
+    try:
+        return os.path.getsize(os.path.join(spool_dir(), ACTIVE_NAME)) > 0
+    except OSError:
+        return False
+
+
+def claim_segments() -> list[str]:
+    """
+    Return ready segments in delivery order.
+
+    Leftover segments from a previous flusher come first; if there are none,
+    the active spool (when non-empty) is renamed into a new ready segment.
+    """
+    directory = spool_dir()
+    ready = sorted(
+        name for name in os.listdir(directory) if name.endswith(READY_SUFFIX)
+    )
+    if not ready:
+        active = os.path.join(directory, ACTIVE_NAME)
+        try:
+            if os.path.getsize(active) > 0:
+                name = f"events.{time.time_ns():020d}{READY_SUFFIX}"
+                os.rename(active, os.path.join(directory, name))
+                ready.append(name)
+        except OSError:
+            pass
+    return [os.path.join(directory, name) for name in ready]
+
+
+def claimed_at(segment: str) -> float:
+    """Return the time (seconds) a segment was claimed, from its name."""
+    stamp = os.path.basename(segment).split(".")[1]
+    try:
+        return int(stamp) / 1e9
+    except ValueError:
+        return 0.0
+
+
+def read_offset(segment: str) -> int:
+    """Return the committed offset of a segment (0 if never committed)."""
+    try:
+        with open(segment + ".offset", "r", encoding="utf-8") as f:
+            return int(f.read().strip() or 0)
+    except (OSError, ValueError):
+        return 0
+
+
+def commit_offset(segment: str, offset: int) -> None:
+    """Durably record that everything before offset has been delivered."""
+    tmp = f"{segment}.offset.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(str(offset))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, segment + ".offset")
+
+
+def read_batch(segment: str, offset: int, max_events: int) -> tuple[list[bytes], int]:
+    """
+    Read up to max_events complete lines starting at offset.
+
+    Returns:
+        (lines, new_offset) - a trailing partial line is left for later
+    """
+    lines = []
+    with open(segment, "rb") as f:
+        f.seek(offset)
+        while len(lines) < max_events:
+            line = f.readline()
+            if not line.endswith(b"\n"):
+                break
+            offset += len(line)
+            lines.append(line)
+    return lines, offset
+
+
+def remove_segment(segment: str) -> None:
+    """Delete a fully drained segment and its offset file."""
+    for path in (segment, segment + ".offset"):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def ensure_flusher() -> None:
+    """
+    Start flush.py in the background unless one is already running.
+
+    The flusher holds an exclusive flock on flush.lock while alive; probing
+    it costs one open + flock. Disabled with AIOX_MONITOR_FLUSHER=0 (e.g.
+    when the flusher runs as a service) and on platforms without fcntl.
+    """
+    if os.environ.get("AIOX_MONITOR_FLUSHER", "1") == "0":
+        return
+    ensure_running("flush.lock", "flush.py")
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Local state directory shared by hook processes (spool, flusher lock, etc.)
+"""
+
+from __future__ import annotations
+
+import os
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:  # typing adds ~10 ms to hook cold start
+    from typing import Any
+
+STATE_DIR = os.environ.get(
+    "AIOX_MONITOR_STATE_DIR",
+    os.path.join(os.path.expanduser("~"), ".aiox", "monitor")
+)
+
+
+def state_path(*parts: str) -> str:
+    """Return a path inside the state dir, creating parent directories."""
+    path = os.path.join(STATE_DIR, *parts)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
+
+def read_json(path: str, default: Any = None) -> Any:
+    """Read a JSON state file, returning default if missing or corrupt."""
+    import json
+
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def write_json(path: str, value: Any) -> None:
+    """Atomically replace a JSON state file (write temp + rename)."""
+    import json
+
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(value, f)
+    os.replace(tmp, path)
+
+
+class Locked:
+    """flock-guarded read-modify-write of a state file (lock on <name>.lock)."""
+
+    def __init__(self, name: str):
+        self.path = state_path(name)
+
+    def __enter__(self):
+        self.fd = os.open(self.path + ".lock", os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            import fcntl
+
+            fcntl.flock(self.fd, fcntl.LOCK_EX)
+        except ImportError:
+            pass  # Best effort without flock
+        return self
+
+    def __exit__(self, *exc):
+        os.close(self.fd)  # Releases the lock
+
+
+def ensure_running(lock_name: str, script: str, *args: str) -> None:
+    """
+    Start a hooks-dir script detached unless it is already running.
+
+    The script must hold an exclusive flock on lock_name (in the state dir)
+    while alive; probing it costs one open + flock. No-op on platforms
+    without fcntl.
+    """
+    try:
+        import fcntl
+    except ImportError:
+        return
+
+    fd = os.open(state_path(lock_name), os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return  # Already running
+    finally:
+        os.close(fd)  # Releases the probe lock (if taken)
+
+    import subprocess
+    import sys
+
+    path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), script)
+    subprocess.Popen(
+        [sys.executable, path, *args],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Durable, indexed local event store (store/ in the state dir).
+
+Events that could not be delivered - the send failed, or the circuit was
+open and they were not diverted to the spool - are appended here instead of
+being lost, and replay.py sends them once the server is back. With
+AIOX_MONITOR_STORE=all every event is archived, delivered or not (for
+offline queries); =off disables the store.
+
+Layout: segments seg-<time_ns>.log hold one serialized event per line;
+each has a seg-<time_ns>.idx of fixed-size RECORD entries:
+
+    timestamp ms, offset, length, crc32 of session_id, event type,
+    aiox_agent and tool_name, flags (MISSED = not delivered yet)
+
+so filters and replay scan the index, not the events. A new segment starts
+after AIOX_MONITOR_STORE_SEGMENT_BYTES; the oldest are removed beyond
+AIOX_MONITOR_STORE_MAX_BYTES or AIOX_MONITOR_STORE_RETENTION_DAYS. Appends
+take an flock, so concurrent hooks keep log and index in step.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import struct
+import time
+import zlib
+
+from .state import Locked, read_json, state_path, write_json
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:  # typing adds ~10 ms to hook cold start
+    from typing import Any, Iterator
+
+MODE = os.environ.get("AIOX_MONITOR_STORE", "failed")  # off | failed | all
+SEGMENT_BYTES = int(os.environ.get("AIOX_MONITOR_STORE_SEGMENT_BYTES", str(8 * 1024 * 1024)))
+MAX_BYTES = int(os.environ.get("AIOX_MONITOR_STORE_MAX_BYTES", str(256 * 1024 * 1024)))
+RETENTION_DAYS = float(os.environ.get("AIOX_MONITOR_STORE_RETENTION_DAYS", "7"))
+
+RECORD = struct.Struct("<QIIIIIII")
+MISSED = 1
+
+
+def store_dir() -> str:
+    """Return the store directory, creating it if needed."""
+    return os.path.dirname(state_path("store", "seg"))
+
+
+def key_hash(value: Any) -> int:
+    """Index key of a field value (0 when absent)."""
+    if value is None or value == "":
+        return 0
+    return zlib.crc32(str(value).encode("utf-8", "replace")) or 1
+
+
+def segments() -> list[str]:
+    """Segment base paths (without .log/.idx), oldest first."""
+    directory = store_dir()
+    names = sorted(n[:-4] for n in os.listdir(directory) if n.startswith("seg-") and n.endswith(".log"))
+    return [os.path.join(directory, n) for n in names]
+
+
+def _index_record(payload: bytes, offset: int, flags: int) -> bytes:
+    try:
+        event = json.loads(payload)
+        data = event.get("data") if isinstance(event.get("data"), dict) else {}
+        timestamp = int(event.get("timestamp") or time.time() * 1000)
+    except (ValueError, AttributeError, TypeError):
+        event, data, timestamp = {}, {}, int(time.time() * 1000)
+    return RECORD.pack(
+        timestamp,
+        offset,
+        len(payload),
+        key_hash(data.get("session_id")),
+        key_hash(event.get("type")),
+        key_hash(data.get("aiox_agent")),
+        key_hash(data.get("tool_name")),
+        flags,
+    )
+
+
+def append(payloads: list[bytes], missed: bool = True) -> None:
+    """Store serialized events (serialize_event), one log line each."""
+    if MODE == "off" or not payloads:
+        return
+
+    with Locked(os.path.join("store", "append")):
+        existing = segments()
+        base = existing[-1] if existing else None
+        offset = os.path.getsize(base + ".log") if base else 0
+        if base is None or offset >= SEGMENT_BYTES:
+            base = os.path.join(store_dir(), f"seg-{time.time_ns():020d}")
+            offset = 0
+            enforce_retention(existing)
+
+        records = []
+        for payload in payloads:
+            records.append(_index_record(payload, offset, MISSED if missed else 0))
+            offset += len(payload) + 1
+        # Log first: an index entry never points past the end of its log
+        with open(base + ".log", "ab") as f:
+            f.write(b"".join(p + b"\n" for p in payloads))
+        with open(base + ".idx", "ab") as f:
+            f.write(b"".join(records))
+
+
+def enforce_retention(existing: list[str] | None = None) -> None:
+    """Remove the oldest segments beyond MAX_BYTES or RETENTION_DAYS."""
+    existing = segments() if existing is None else existing
+    cutoff = time.time() - RETENTION_DAYS * 86400
+    sizes = []
+    for base in existing:
+        try:
+            stat = os.stat(base + ".log")
+        except OSError:
+            continue
+        sizes.append((base, stat.st_size, stat.st_mtime))
+
+    total = sum(size for _, size, _ in sizes)
+    for base, size, mtime in sizes:
+        if total <= MAX_BYTES and mtime >= cutoff:
+            break
+        for suffix in (".log", ".idx"):
+            try:
+                os.remove(base + suffix)
+            except OSError:
+                pass
+        total -= size
+
+
+def read_index(base: str, start: int = 0) -> Iterator[tuple[int, tuple]]:
+    """Yield (record number, RECORD fields) of a segment from start on."""
+    try:
+        with open(base + ".idx", "rb") as f:
+            f.seek(start * RECORD.size)
+            raw = f.read()
+    except OSError:
+        return
+    usable = len(raw) - len(raw) % RECORD.size  # Ignore a torn last record
+    for number, record in enumerate(RECORD.iter_unpack(raw[:usable]), start):
+        yield number, record
+
+
+class SegmentReader:
+    """Random access to the events of one segment log (mmap)."""
+
+    def __init__(self, base: str):
+        import mmap
+
+        self.file = open(base + ".log", "rb")
+        size = os.fstat(self.file.fileno()).st_size
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+
+    def event(self, offset: int, length: int) -> bytes:
+        return self.map[offset:offset + length]
+
+    def close(self) -> None:
+        if self.map:
+            self.map.close()
+        self.file.close()
+
+
+def read_cursor() -> dict[str, Any]:
+    """Replay position: {"segment": name, "record": next record number}."""
+    cursor = read_json(os.path.join(store_dir(), "replay.json"))
+    if isinstance(cursor, dict) and "segment" in cursor:
+        return cursor
+    return {"segment": "", "record": 0}
+
+
+def write_cursor(segment: str, record: int) -> None:
+    write_json(os.path.join(store_dir(), "replay.json"), {"segment": segment, "record": record})
+
+
+def keep(payloads: list[bytes], sent: bool) -> None:
+    """Store undelivered events; with MODE=all, archive delivered ones too."""
+    if not sent:
+        append(payloads, missed=True)
+    elif MODE == "all":
+        append(payloads, missed=False)
+
+
+def ensure_replay() -> None:
+    """Start replay.py in the background (AIOX_MONITOR_REPLAY=0 disables)."""
+    if MODE == "off" or os.environ.get("AIOX_MONITOR_REPLAY", "1") == "0":
+        return
+    from .state import ensure_running
+
+    ensure_running("replay.lock", "replay.py")
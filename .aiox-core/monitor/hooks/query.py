@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+Offline queries over the local event store (lib/store.py).
+
+Works without the monitor server, on the events the hooks kept locally
+(all of them with AIOX_MONITOR_STORE=all, else the undelivered ones).
+
+    python3 query.py --session ID --since 2h                 # list events
+    python3 query.py --agent dev --type ToolMetrics --group-by tool --sort p95
+    python3 query.py --group-by story --json                 # aggregate as JSON
+
+Session, type, agent, tool and time filters are answered from the segment
+indexes, which hold a CRC32 of each key; only the events they select are
+read, and checked for the value itself, so a hash collision never returns
+another session's or tool's events. Indexed --group-by keys (session, type,
+agent, tool) group on the hash alone: two values whose hashes collide
+(about one pair in 4 billion) would share a row. Listing streams one line
+per event.
+Aggregates report count, bytes and, for events with a duration_ms
+(ToolMetrics), p50/p95/p99/max duration per group.
+"""
+
+import argparse
+import array
+import json
+import math
+import os
+import re
+import sys
+import time
+from collections import Counter, defaultdict
+
+# Add lib to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from lib import store
+from lib.metrics import METRICS_EVENT
+
+# Filters answered from the index: option -> (RECORD position, data field)
+INDEXED = {
+    "session": (3, "session_id"),
+    "type": (4, None),
+    "agent": (5, "aiox_agent"),
+    "tool": (6, "tool_name"),
+}
+FIELDS = {position: field for position, field in INDEXED.values()}
+# Group keys: name -> data field (None = event type)
+GROUP_KEYS = {
+    "session": "session_id",
+    "type": None,
+    "agent": "aiox_agent",
+    "tool": "tool_name",
+    "project": "project",
+    "story": "aiox_story_id",
+    "task": "aiox_task_id",
+}
+_DURATION = re.compile(rb'"duration_ms": (-?[0-9.eE+-]+)')
+SORT_KEYS = ("count", "bytes", "p50", "p95", "p99", "max")
+UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+MAX_TIME = 2**64 - 1
+
+
+def parse_time(value: str) -> int:
+    """
+    Epoch ms from "90s"/"30m"/"2h"/"7d" (ago), epoch ms, or ISO 8601 (an
+    argparse type: anything else is a usage error).
+    """
+    if value[-1:] in UNITS and value[:-1].replace(".", "", 1).isdigit():
+        return int((time.time() - float(value[:-1]) * UNITS[value[-1]]) * 1000)
+    if value.isdigit():
+        return int(value)
+    from datetime import datetime
+
+    try:
+        return int(datetime.fromisoformat(value).timestamp() * 1000)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"invalid time {value!r} (use 30m, 2h, 7d, epoch ms or ISO 8601)"
+        ) from None
+
+
+class Matches:
+    """
+    Index records of one segment that pass the filters.
+
+    The index is read as one array of uint32 words and filtered column by
+    column, so no per-record tuples are built: column() returns one field
+    of every match and event() reads a match from the log on demand. Key
+    filters (RECORD position -> value) compare hashes first, then the value
+    in each selected event.
+    """
+
+    WORDS = store.RECORD.size // 4  # uint32 words per record
+
+    def __init__(self, raw: bytes, filters: dict[int, str], since: int, until: int, reader):
+        raw = raw[:len(raw) - len(raw) % store.RECORD.size]  # Ignore a torn last record
+        self.words = array.array("I", raw)
+        if sys.byteorder == "big":
+            self.words.byteswap()  # The index is little-endian
+        self.reader = reader
+        self._columns: dict[int, list[int]] = {}
+
+        self.numbers: list[int] | None = None  # None = every record
+        for position, value in filters.items():
+            column = self._full(position)
+            key = store.key_hash(value)
+            self.numbers = [n for n in self._selected() if column[n] == key]
+
+        if since > 0 or until < MAX_TIME:
+            stamps = self.timestamps()
+            if stamps and not (since <= min(stamps) and max(stamps) <= until):
+                self.numbers = [
+                    n for n, stamp in zip(self._selected(), stamps) if since <= stamp <= until
+                ]
+
+        if filters and self.numbers:
+            # Hashes can collide: keep the events that hold the values
+            self.numbers = [n for n in self.numbers if self._holds(n, filters)]
+
+    def _holds(self, number: int, filters: dict[int, str]) -> bool:
+        """Whether record number's event has every filtered value."""
+        index = number * self.WORDS
+        event, data = _event(self.reader.event(self.words[index + 2], self.words[index + 3]))
+        for position, value in filters.items():
+            field = FIELDS[position]
+            actual = event.get("type") if field is None else data.get(field)
+            if actual is None or str(actual) != str(value):
+                return False
+        return True
+
+    def _full(self, position: int) -> list[int]:
+        """One uint32 field (RECORD position >= 1) of every record."""
+        if position not in self._columns:
+            self._columns[position] = self.words[position + 1::self.WORDS].tolist()
+        return self._columns[position]
+
+    def _selected(self) -> range | list[int]:
+        if self.numbers is None:
+            return range(len(self.words) // self.WORDS)
+        return self.numbers
+
+    def __len__(self) -> int:
+        return len(self._selected())
+
+    def column(self, position: int) -> list[int]:
+        """One uint32 index field (RECORD position >= 1) of every match."""
+        full = self._full(position)
+        return full if self.numbers is None else [full[n] for n in self.numbers]
+
+    def timestamps(self) -> list[int]:
+        """Timestamp (ms) of every match."""
+        low = self.words[0::self.WORDS]
+        high = self.words[1::self.WORDS]
+        return [low[n] | high[n] << 32 for n in self._selected()]
+
+    def record(self, number: int) -> tuple:
+        """RECORD fields of the number-th match."""
+        start = self._selected()[number] * self.WORDS
+        words = self.words[start:start + self.WORDS].tolist()
+        return (words[0] | words[1] << 32, *words[2:])
+
+    def event(self, number: int) -> bytes:
+        """Event bytes of the number-th match."""
+        index = self._selected()[number] * self.WORDS
+        return self.reader.event(self.words[index + 2], self.words[index + 3])
+
+
+def scan(filters: dict[int, str], since: int, until: int):
+    """
+    Yield Matches per segment with matching events, in store order. Events
+    are only read from the log when asked for (Matches.event).
+
+    filters maps RECORD positions to required values.
+    """
+    for base in store.segments():
+        try:
+            with open(base + ".idx", "rb") as f:
+                raw = f.read()
+        except OSError:
+            continue
+        reader = store.SegmentReader(base)
+        try:
+            matches = Matches(raw, filters, since, until, reader)
+            if len(matches):
+                yield matches
+        finally:
+            reader.close()
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of sorted values."""
+    if not values:
+        return 0.0
+    rank = math.ceil(pct / 100 * len(values))
+    return values[max(0, min(len(values), rank) - 1)]
+
+
+def _event(raw: bytes) -> tuple[dict, dict]:
+    """(event, data) of a stored event ({} when unreadable)."""
+    try:
+        event = json.loads(raw)
+    except ValueError:
+        return {}, {}
+    data = event.get("data") if isinstance(event, dict) else None
+    return event if isinstance(event, dict) else {}, data if isinstance(data, dict) else {}
+
+
+def aggregate(segments, group_by: str) -> list[dict]:
+    """
+    Group matching events into summary rows.
+
+    Indexed keys (session, type, agent, tool) group on the index hash and
+    only parse one event per group for its name. Durations are read from
+    ToolMetrics events only, with a regex instead of a full parse.
+    """
+    indexed = INDEXED.get(group_by)
+    field = GROUP_KEYS[group_by]
+    metrics_type = store.key_hash(METRICS_EVENT)
+    groups: dict = {}
+
+    for matches in segments:
+        if indexed:
+            keys = matches.column(indexed[0])
+        else:
+            keys = []
+            for number in range(len(matches)):
+                event, data = _event(matches.event(number))
+                keys.append(event.get("type") if field is None else data.get(field))
+
+        counts = Counter(keys)
+        for key in counts:
+            if key not in groups:
+                name = key
+                if indexed:
+                    event, data = _event(matches.event(keys.index(key)))
+                    name = event.get("type") if field is None else data.get(field)
+                groups[key] = {"key": name, "count": 0, "bytes": 0, "durations": []}
+            groups[key]["count"] += counts[key]
+
+        totals: dict = defaultdict(int)
+        for key, length in zip(keys, matches.column(2)):
+            totals[key] += length
+        for key, total in totals.items():
+            groups[key]["bytes"] += total
+
+        types = matches.column(4)
+        for number in [n for n, t in enumerate(types) if t == metrics_type]:
+            match = _DURATION.search(matches.event(number))
+            if match:
+                groups[keys[number]]["durations"].append(float(match.group(1)))
+
+    rows = []
+    for group in groups.values():
+        durations = sorted(group.pop("durations"))
+        if durations:
+            group.update({
+                "p50": percentile(durations, 50),
+                "p95": percentile(durations, 95),
+                "p99": percentile(durations, 99),
+                "max": durations[-1],
+            })
+        rows.append(group)
+    return rows
+
+
+def print_events(segments, as_json: bool, limit: int | None) -> None:
+    events = ((m.record(n), m.event(n)) for m in segments for n in range(len(m)))
+    for count, (record, raw) in enumerate(events):
+        if limit is not None and count >= limit:
+            break
+        if as_json:
+            sys.stdout.write(raw.decode("utf-8", "replace") + "\n")
+            continue
+        event, data = _event(raw)
+        when = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(record[0] / 1000))
+        session = (data.get("session_id") or "-")[:8]
+        print(
+            f"{when}  {event.get('type', '-'):<18} {session:<8}  "
+            f"{data.get('aiox_agent') or '-':<14} {data.get('tool_name') or '-':<12} {record[2]:>8}"
+        )
+
+
+def print_rows(rows: list[dict], group_by: str) -> None:
+    print(f"{group_by:<28} {'count':>8} {'bytes':>12} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'max ms':>10}")
+    for row in rows:
+        timings = "".join(
+            f" {row[k]:>10.1f}" if k in row else f" {'-':>10}" for k in ("p50", "p95", "p99", "max")
+        )
+        print(f"{str(row['key'])[:28]:<28} {row['count']:>8} {row['bytes']:>12}{timings}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query locally stored AIOX monitor events")
+    for name in INDEXED:
+        parser.add_argument(f"--{name}", help=f"Only events with this {name}")
+    parser.add_argument("--since", type=parse_time, help="Start: 30m, 2h, 7d ago, epoch ms or ISO time")
+    parser.add_argument("--until", type=parse_time, help="End (same formats as --since)")
+    parser.add_argument("--group-by", choices=GROUP_KEYS, help="Aggregate per group")
+    parser.add_argument("--sort", choices=SORT_KEYS, default="count", help="Sort groups (descending)")
+    parser.add_argument("--limit", type=int, help="Max events or groups")
+    parser.add_argument("--json", action="store_true", help="NDJSON events / JSON rows")
+    args = parser.parse_args()
+
+    filters = {INDEXED[name][0]: getattr(args, name) for name in INDEXED if getattr(args, name)}
+    since = args.since if args.since is not None else 0
+    until = args.until if args.until is not None else MAX_TIME
+    segments = scan(filters, since, until)
+
+    try:
+        if args.group_by is None:
+            print_events(segments, args.json, args.limit)
+            return
+
+        rows = aggregate(segments, args.group_by)
+        rows.sort(key=lambda row: row.get(args.sort, -1), reverse=True)
+        rows = rows[:args.limit] if args.limit is not None else rows
+        if args.json:
+            print(json.dumps(rows, indent=2))
+        else:
+            print_rows(rows, args.group_by)
+    except BrokenPipeError:
+        pass  # Piped into head
+
+
+if __name__ == "__main__":
+    main()
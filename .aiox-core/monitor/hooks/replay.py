@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Replay missed events from the local event store (lib/store.py).
+
+Started automatically when the circuit breaker closes again, or run by hand:
+
+    python3 replay.py             # send everything missed since the last replay
+    python3 replay.py --dry-run   # only count what would be sent
+
+Missed events are sent in store order, in batches (lib/batch.py; one
+request per event with AIOX_MONITOR_BATCH=0, as flush.py does). A cursor
+(store/replay.json) is committed after every batch, so each event is
+replayed once; a replay interrupted mid-batch resends at most that batch.
+Only one replay runs at a time (flock on replay.lock). A replay that gets
+through closes the circuit breaker, as a delivered hook event would.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add lib to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from lib import batch, breaker, store
+from lib.send_event import MonitorConnection, close_circuit, is_outage, is_poison
+from lib.state import state_path
+
+BATCH_SIZE = int(os.environ.get("AIOX_MONITOR_REPLAY_BATCH", "500"))
+
+
+def acquire_lock() -> int | None:
+    """Take the replay lock. Returns the held fd, or None if taken."""
+    try:
+        import fcntl
+    except ImportError:
+        return -1
+
+    fd = os.open(state_path("replay.lock"), os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        os.close(fd)
+        return None
+    return fd
+
+
+def pending_segments() -> list[tuple[str, int]]:
+    """(segment base, first record) of every segment at or after the cursor."""
+    cursor = store.read_cursor()
+    pending = []
+    for base in store.segments():
+        name = os.path.basename(base)
+        if name < cursor["segment"]:
+            continue
+        pending.append((base, cursor["record"] if name == cursor["segment"] else 0))
+    return pending
+
+
+def post_events(conn: MonitorConnection, events: list[bytes]) -> None:
+    """Send one batch: a single /events/batch request unless batching is off."""
+    if batch.ENABLED:
+        batch.post_events(conn, events)
+        return
+    for event in events:
+        try:
+            conn.post("/events", event)
+        except Exception as e:
+            if not is_poison(e):
+                raise
+
+
+def replay(conn: MonitorConnection | None, dry_run: bool = False) -> int:
+    """
+    Send missed events after the cursor. Raises on delivery failure after
+    committing the batches already sent.
+
+    Returns:
+        Number of events replayed (or found, with dry_run)
+    """
+    replayed = 0
+    for base, start in pending_segments():
+        name = os.path.basename(base)
+        reader = store.SegmentReader(base)
+        try:
+            events = []
+            position = start
+            for number, record in store.read_index(base, start):
+                position = number + 1
+                if record[7] & store.MISSED:
+                    events.append(reader.event(record[1], record[2]))
+                if len(events) >= BATCH_SIZE:
+                    if not dry_run:
+                        post_events(conn, events)
+                        store.write_cursor(name, position)
+                    replayed += len(events)
+                    events = []
+            if events and not dry_run:
+                post_events(conn, events)
+            replayed += len(events)
+            if not dry_run:
+                store.write_cursor(name, position)
+        finally:
+            reader.close()
+    return replayed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay missed AIOX monitor events")
+    parser.add_argument("--dry-run", action="store_true", help="Count missed events without sending")
+    args = parser.parse_args()
+
+    if args.dry_run:
+        print(f"{replay(None, dry_run=True)} missed events to replay")
+        return
+
+    lock = acquire_lock()
+    if lock is None:
+        return  # Another replay is running
+    if breaker.allow() == breaker.OPEN:
+        sys.exit(1)  # Server down; the next recovery starts us again
+
+    conn = MonitorConnection()
+    start = time.monotonic()
+    try:
+        count = replay(conn)
+        # A probe that got through closes the circuit, as in deliver(); then
+        # pick up what hooks stored while the replay ran
+        close_circuit(lambda payload: conn.post("/events", payload), replay=False)
+        count += replay(conn)
+    except Exception as e:
+        if is_outage(e):
+            breaker.record_failure()
+        sys.exit(1)
+    finally:
+        conn.close()
+    if count and sys.stderr.isatty():
+        print(f"Replayed {count} events in {time.monotonic() - start:.2f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+Shared fixtures for the monitor hook tests.
+
+Hook modules read their configuration from the environment at import time,
+so tests point the state directory (and any module constant they depend
+on) at per-test values with monkeypatch instead of re-importing.
+
+Run with:
+    python3 -m pytest .aiox-core/monitor/tests
+"""
+
+import os
+import sys
+
+import pytest
+
+MONITOR_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(MONITOR_DIR, "hooks"))
+sys.path.insert(0, os.path.join(MONITOR_DIR, "bench"))
+
+from lib import state  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def state_dir(tmp_path, monkeypatch):
+    """A fresh state dir (spool, breaker, store...) for every test."""
+    path = tmp_path / "state"
+    monkeypatch.setattr(state, "STATE_DIR", str(path))
+    monkeypatch.setenv("AIOX_MONITOR_STATE_DIR", str(path))
+    monkeypatch.setenv("AIOX_MONITOR_FLUSHER", "0")  # Never spawn a real flusher
+    return path
+
+
+@pytest.fixture
+def collector():
+    """Local stand-in monitor server (bench/collector.py) keeping every body."""
+    from collector import start_collector
+
+    server = start_collector(keep=True)
+    yield server
+    server.shutdown()
+    server.server_close()
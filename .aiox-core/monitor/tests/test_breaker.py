@@ -0,0 +1,123 @@
+"""Circuit breaker state transitions (lib/breaker.py) and deliver()."""
+
+import os
+
+import pytest
+
+from lib import breaker, send_event, spool, store
+from lib.state import state_path
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable breaker clock (ms)."""
+    now = [1_000_000]
+    monkeypatch.setattr(breaker, "_now_ms", lambda: now[0])
+    monkeypatch.setattr(breaker, "THRESHOLD", 3)
+    monkeypatch.setattr(breaker, "BASE_BACKOFF_MS", 1000)
+    monkeypatch.setattr(breaker, "MAX_BACKOFF_MS", 4000)
+    return now
+
+
+def open_circuit() -> None:
+    for _ in range(breaker.THRESHOLD):
+        breaker.record_failure()
+
+
+def test_closed_without_state(clock):
+    assert breaker.allow() == breaker.CLOSED
+    assert breaker.state() is None
+    assert breaker.record_success() is None
+
+
+def test_opens_at_threshold(clock):
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.allow() == breaker.CLOSED
+
+    breaker.record_failure()
+    assert breaker.allow() == breaker.OPEN
+    assert breaker.state()["retry_at"] == clock[0] + 1000
+
+
+def test_single_probe_after_backoff(clock):
+    open_circuit()
+    clock[0] += 1000
+
+    assert breaker.allow() == breaker.PROBE
+    assert breaker.allow() == breaker.OPEN  # Lease taken
+    clock[0] += 1000
+    assert breaker.allow() == breaker.PROBE  # Lease expired
+
+
+def test_failed_probe_doubles_backoff_up_to_max(clock):
+    open_circuit()
+    backoffs = []
+    for _ in range(4):
+        clock[0] = breaker.state()["retry_at"]
+        assert breaker.allow() == breaker.PROBE
+        breaker.record_failure()
+        backoffs.append(breaker.state()["backoff_ms"])
+
+    assert backoffs == [2000, 4000, 4000, 4000]
+    assert breaker.allow() == breaker.OPEN
+
+
+def test_success_closes_and_reports(clock):
+    open_circuit()
+    breaker.record_skipped("deferred", 5)
+    breaker.record_skipped("diverted", 2)
+    breaker.record_skipped("dropped")
+    clock[0] += 1500
+
+    assert breaker.record_success() == {"dropped": 1, "deferred": 5, "diverted": 2, "open_ms": 1500}
+    assert breaker.state() is None
+    assert breaker.allow() == breaker.CLOSED
+
+
+def test_skipped_after_close_keeps_circuit_clean(clock):
+    open_circuit()
+    breaker.record_success()
+
+    breaker.record_skipped("deferred")
+    assert not os.path.exists(state_path("breaker.json"))
+    assert breaker.allow() == breaker.CLOSED
+
+
+@pytest.mark.parametrize("on_open, mode, outcome", [
+    ("drop", "failed", "deferred"),
+    ("drop", "off", "dropped"),
+    ("spool", "failed", "diverted"),
+])
+def test_deliver_counts_skipped_events(clock, monkeypatch, on_open, mode, outcome):
+    monkeypatch.setattr(send_event, "ON_OPEN", on_open)
+    monkeypatch.setattr(store, "MODE", mode)
+    open_circuit()
+    posted = []
+
+    sent = send_event.deliver(b"{}\n{}", posted.append)
+
+    assert sent == (outcome == "diverted")
+    assert posted == []
+    assert breaker.state()[outcome] == 2
+    assert spool.has_active() == (outcome == "diverted")
+
+
+def test_deliver_records_outage(clock):
+    def down(payload):
+        raise ConnectionRefusedError()
+
+    for _ in range(breaker.THRESHOLD):
+        with pytest.raises(ConnectionRefusedError):
+            send_event.deliver(b"{}", down)
+    assert breaker.allow() == breaker.OPEN
+
+
+def test_deliver_ignores_rejected_event(clock):
+    def reject(payload):
+        raise send_event.HTTPStatusError(400, "/events")
+
+    for _ in range(breaker.THRESHOLD):
+        with pytest.raises(send_event.HTTPStatusError):
+            send_event.deliver(b"{}", reject)
+    assert breaker.allow() == breaker.CLOSED
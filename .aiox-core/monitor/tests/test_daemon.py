@@ -0,0 +1,69 @@
+"""Hook daemon: queue overflow reporting (daemon.py)."""
+
+import io
+import json
+import shutil
+import tempfile
+import threading
+import time
+
+import pytest
+
+import daemon
+from lib import batch, ipc, policy
+
+
+@pytest.fixture
+def server(monkeypatch):
+    """A daemon on a short socket path, with a one-slot queue and no worker."""
+    directory = tempfile.mkdtemp(dir="/tmp")  # Unix socket paths are short
+    path = f"{directory}/d.sock"
+    monkeypatch.setattr(daemon, "QUEUE_SIZE", 1)
+    monkeypatch.setattr(ipc, "DAEMON_ENABLED", True)
+    monkeypatch.setattr(ipc, "SOCKET_PATH", path)
+    monkeypatch.setattr(policy, "_policy", {})
+    server = daemon.bind_socket(path)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    shutil.rmtree(directory)
+
+
+def forward(event_type: str, data: dict) -> None:
+    assert ipc.forward_to_daemon(event_type, io.BytesIO(json.dumps(data).encode("utf-8")))
+
+
+def wait_for(condition) -> None:
+    deadline = time.monotonic() + 5
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_full_queue_drops_are_counted(server):
+    for index in range(3):
+        forward("Stop", {"session_id": "s1", "index": index})
+    wait_for(lambda: server.dropped_total == 2)
+
+    summary = server.take_dropped()
+    assert summary["dropped"] == {"Stop": {"queue_full": 2}}
+    assert summary["since"] <= summary["until"]
+    assert server.take_dropped() is None
+    assert server.dropped_total == 2
+
+
+def test_worker_reports_drops(server, monkeypatch):
+    sent = []
+    monkeypatch.setattr(batch, "ENABLED", False)
+    monkeypatch.setattr(daemon, "send_event", lambda event_type, data, post=None: sent.append((event_type, data)) or True)
+    for index in range(3):
+        forward("Stop", {"session_id": "s1", "index": index})
+    wait_for(lambda: server.dropped_total == 2)
+
+    threading.Thread(target=daemon.process_events, args=(server,), daemon=True).start()
+    wait_for(lambda: len(sent) == 2)
+
+    assert sent[0][0] == policy.SUMMARY_EVENT
+    assert sent[0][1]["dropped"] == {"Stop": {"queue_full": 2}}
+    assert sent[1][0] == "Stop" and sent[1][1]["index"] == 0
@@ -0,0 +1,117 @@
+"""Hook dispatch: admission policy and ToolMetrics (dispatch.py, lib/policy.py)."""
+
+import io
+import json
+import sys
+
+import pytest
+
+import dispatch
+from lib import ipc, policy
+from lib import send_event as send_module
+
+
+@pytest.fixture
+def sent(monkeypatch):
+    """Events sent by dispatch.main(), as (type, data)."""
+    events = []
+    monkeypatch.setattr(send_module, "send_event", lambda event_type, data, post=None: events.append((event_type, data)))
+    monkeypatch.setattr(ipc, "DAEMON_ENABLED", False)
+    monkeypatch.setattr(dispatch, "TOOL_METRICS", True)
+    monkeypatch.setattr(dispatch, "TIMINGS", False)
+    return events
+
+
+@pytest.fixture
+def use_policy(tmp_path, monkeypatch):
+    def use(value: dict) -> None:
+        path = tmp_path / "policy.json"
+        path.write_text(json.dumps(value))
+        monkeypatch.setattr(policy, "POLICY_PATH", str(path))
+        monkeypatch.setattr(policy, "_policy", None)
+
+    use({})
+    return use
+
+
+def hook(monkeypatch, event_type: str, call_id: str, tmp_path) -> None:
+    data = {
+        "session_id": "s1",
+        "cwd": str(tmp_path),
+        "tool_name": "Read",
+        "tool_use_id": call_id,
+        "tool_input": {"file_path": "/a.py"},
+    }
+    if event_type == "PostToolUse":
+        data["tool_result"] = "ok"
+    monkeypatch.setattr(sys, "stdin", io.TextIOWrapper(io.BytesIO(json.dumps(data).encode("utf-8"))))
+    dispatch.main([event_type])
+
+
+def tool_call(monkeypatch, call_id: str, tmp_path) -> None:
+    hook(monkeypatch, "PreToolUse", call_id, tmp_path)
+    hook(monkeypatch, "PostToolUse", call_id, tmp_path)
+
+
+def types(events) -> list[str]:
+    return [event_type for event_type, _ in events]
+
+
+def test_admitted_call_sends_hooks_and_metrics(monkeypatch, tmp_path, sent, use_policy):
+    tool_call(monkeypatch, "toolu_1", tmp_path)
+
+    assert types(sent) == ["PreToolUse", "PostToolUse", "ToolMetrics"]
+    metrics = sent[-1][1]
+    assert metrics["tool_use_id"] == "toolu_1" and metrics["duration_ms"] >= 0
+    assert metrics["project"] == tmp_path.name
+
+
+def test_sampled_call_keeps_metrics(monkeypatch, tmp_path, sent, use_policy):
+    use_policy({"sample": {"PreToolUse": 0, "PostToolUse": 0}})
+    tool_call(monkeypatch, "toolu_1", tmp_path)
+
+    assert types(sent) == ["ToolMetrics"]
+    assert sent[0][1]["tool_name"] == "Read"
+    assert sent[0][1]["project"] == tmp_path.name
+
+
+def test_rate_limited_call_keeps_metrics(monkeypatch, tmp_path, sent, use_policy):
+    # One token: the PreToolUse is admitted, its PostToolUse rate limited
+    use_policy({"rate": {"per_second": 0.001, "burst": 1}})
+    tool_call(monkeypatch, "toolu_1", tmp_path)
+
+    assert types(sent) == ["PreToolUse", "ToolMetrics"]
+    assert sent[-1][1]["tool_use_id"] == "toolu_1"
+
+
+def test_dropped_events_without_metrics(monkeypatch, sent, use_policy):
+    monkeypatch.setattr(dispatch, "TOOL_METRICS", False)
+
+    assert dispatch.dropped_events("PostToolUse", {"tool_use_id": "toolu_1"}) == []
+    monkeypatch.setattr(dispatch, "TOOL_METRICS", True)
+    assert dispatch.dropped_events("Stop", {"session_id": "s1"}) == []
+
+
+def test_stop_flushes_pending_drop_summary(monkeypatch, tmp_path, sent, use_policy):
+    use_policy({"sample": {"PreToolUse": 0}, "summary_interval_s": 3600})
+    hook(monkeypatch, "PreToolUse", "toolu_1", tmp_path)
+    hook(monkeypatch, "PreToolUse", "toolu_2", tmp_path)
+    assert "MonitorDropSummary" not in types(sent)  # Not due yet
+
+    hook(monkeypatch, "Stop", "-", tmp_path)
+
+    assert types(sent) == ["MonitorDropSummary", "Stop"]
+    assert sent[0][1]["dropped"] == {"PreToolUse": {"sampled": 2}}
+    hook(monkeypatch, "Stop", "-", tmp_path)
+    assert types(sent) == ["MonitorDropSummary", "Stop", "Stop"]
+
+
+def test_timings_cover_every_phase(monkeypatch, tmp_path, sent, use_policy):
+    from lib.timing import PHASES, TIMINGS_EVENT
+
+    monkeypatch.setattr(dispatch, "TIMINGS", True)
+    monkeypatch.setenv("AIOX_MONITOR_SPAWN_NS", "1")
+    hook(monkeypatch, "PostToolUse", "toolu_1", tmp_path)
+
+    (timings,) = [data for event_type, data in sent if event_type == TIMINGS_EVENT]
+    assert tuple(timings["phases"]) == PHASES
@@ -0,0 +1,99 @@
+"""Spool claim/drain cycle (lib/spool.py) and the flusher loop (flush.py)."""
+
+import json
+import os
+
+import pytest
+
+import flush
+from lib import spool
+from lib.send_event import MonitorConnection, serialize_event
+
+
+def event(index: int) -> bytes:
+    return serialize_event("Notification", {"session_id": "s1", "index": index}) + b"\n"
+
+
+@pytest.fixture
+def connect(collector, monkeypatch):
+    monkeypatch.setattr(flush, "MonitorConnection", lambda: MonitorConnection(collector.url))
+    monkeypatch.setattr(flush, "IDLE_EXIT_S", 0.0)
+    monkeypatch.setattr(flush, "POLL_S", 0.01)
+    monkeypatch.setattr(spool, "CLAIM_GRACE_S", 0.0)
+    return collector
+
+
+def delivered(collector) -> list[int]:
+    return [e["data"]["index"] for e in collector.events()]
+
+
+def test_claim_renames_active_spool():
+    spool.append(event(1))
+    segments = spool.claim_segments()
+
+    assert len(segments) == 1 and segments[0].endswith(spool.READY_SUFFIX)
+    assert not spool.has_active()
+    spool.append(event(2))
+    assert spool.claim_segments() == segments  # Leftover segments first
+    assert spool.has_active()
+
+
+def test_read_batch_leaves_partial_line():
+    spool.append(event(1) + event(2)[:10])
+    segment, = spool.claim_segments()
+
+    lines, offset = spool.read_batch(segment, 0, 10)
+    assert [json.loads(line)["data"]["index"] for line in lines] == [1]
+    assert offset == len(event(1))
+
+
+def test_committed_offset_survives_restart():
+    spool.append(event(1) + event(2) + event(3))
+    segment, = spool.claim_segments()
+    lines, offset = spool.read_batch(segment, 0, 1)
+    spool.commit_offset(segment, offset)
+
+    assert spool.read_offset(segment) == offset
+    lines, _ = spool.read_batch(segment, spool.read_offset(segment), 10)
+    assert [json.loads(line)["data"]["index"] for line in lines] == [2, 3]
+
+
+@pytest.mark.parametrize("batched", [True, False])
+def test_once_drains_everything_in_order(connect, monkeypatch, batched):
+    monkeypatch.setattr(flush.batch, "ENABLED", batched)
+    for index in range(5):
+        spool.append(event(index))
+
+    assert flush.run(once=True) == 0
+    assert delivered(connect) == list(range(5))
+    assert not spool.has_active()
+    assert os.listdir(spool.spool_dir()) == []
+
+
+def test_idle_exit_rechecks_spool(connect, monkeypatch):
+    # A hook appends right after the last claim, sees flush.lock taken and
+    # starts no flusher: the exiting flusher must still deliver its event
+    claim = spool.claim_segments
+    late = [event(7)]
+
+    def claim_then_append():
+        segments = claim()
+        if late:
+            spool.append(late.pop())
+        return segments
+
+    monkeypatch.setattr(spool, "claim_segments", claim_then_append)
+
+    assert flush.run() == 0
+    assert delivered(connect) == [7]
+    assert not spool.has_active()
+
+
+def test_second_flusher_exits(connect):
+    lock = flush.acquire_lock()
+    try:
+        spool.append(event(1))
+        assert flush.run(once=True) == 0
+        assert delivered(connect) == []
+    finally:
+        flush.release_lock(lock)
@@ -0,0 +1,107 @@
+"""Streaming truncation of hook payloads (lib/payload.py)."""
+
+import io
+import json
+
+import pytest
+
+from lib import payload
+from lib.payload import DEFAULT_SUFFIX, PayloadError, read_payload
+
+
+def parse(value, fields=None, **options):
+    return read_payload(io.BytesIO(json.dumps(value).encode("utf-8")), fields, **options)
+
+
+def test_small_payload_is_unchanged():
+    value = {"session_id": "s1", "tool_input": {"command": "ls", "n": [1, 2.5, True, None]}}
+    data, meta = parse(value)
+
+    assert data == value
+    assert "truncated" not in meta and "dropped_items" not in meta
+    assert meta["bytes"] == len(json.dumps(value))
+
+
+def test_string_cut_to_field_limit():
+    data, meta = parse({"tool_result": "x" * 5000, "cwd": "/tmp"}, {"tool_result": (100, "...")})
+
+    assert data["tool_result"] == "x" * 100 + "..."
+    assert data["cwd"] == "/tmp"
+    assert meta["truncated"] == {"tool_result": 5000}
+
+
+def test_default_limit_applies_to_other_fields():
+    data, _ = parse({"message": "y" * (payload.MAX_STRING + 10)})
+
+    assert data["message"] == "y" * payload.MAX_STRING + DEFAULT_SUFFIX
+
+
+def test_items_and_depth_capped(monkeypatch):
+    monkeypatch.setattr(payload, "MAX_ITEMS", 3)
+    monkeypatch.setattr(payload, "MAX_DEPTH", 2)
+    data, meta = parse({"list": list(range(10)), "deep": {"a": {"b": {"c": 1}}}})
+
+    assert data["list"] == [0, 1, 2]
+    assert data["deep"] == {"a": {}}
+    assert meta["dropped_items"] == 7 + 1
+
+
+def test_keys_survive_exhausted_budget():
+    # MultiEdit-like payload: the edits use up the whole budget
+    edits = [{"old_string": "o" * 600, "new_string": "n" * 600} for _ in range(100)]
+    value = {
+        "tool_name": "MultiEdit",
+        "tool_input": {"file_path": "/a.py", "edits": edits},
+        "session_id": "s1",
+        "cwd": "/repo",
+        "hook_event_name": "PreToolUse",
+        "tool_use_id": "toolu_1",
+    }
+    data, meta = parse(value, budget=4096 + payload.TOP_LEVEL_RESERVE)
+
+    assert list(data) == list(value)
+    assert {key: data[key] for key in list(value)[2:]} == {key: value[key] for key in list(value)[2:]}
+    assert data["tool_name"] == "MultiEdit"
+    kept = [text for edit in data["tool_input"]["edits"] for text in edit.values()]
+    assert sum(len(text) - len(DEFAULT_SUFFIX) for text in kept) <= 4096
+
+
+def test_keys_do_not_count_against_budget(monkeypatch):
+    monkeypatch.setattr(payload, "TOP_LEVEL_RESERVE", 0)
+    data, _ = parse({"k" * 50: "v" * 10, "tool_use_id": "abc"}, budget=13)
+
+    assert data == {"k" * 50: "v" * 10, "tool_use_id": "abc"}
+
+
+def test_budget_exhausted_empties_values_keeps_keys(monkeypatch):
+    monkeypatch.setattr(payload, "TOP_LEVEL_RESERVE", 0)
+    data, _ = parse({"a": "x" * 20, "b": "later", "c": {"d": "e"}}, budget=10)
+
+    assert data == {"a": "x" * 10 + DEFAULT_SUFFIX, "b": DEFAULT_SUFFIX, "c": {}}
+
+
+def test_escape_that_does_not_fit_ends_the_string():
+    data, meta = parse({"message": "a" * 999 + "\nbcd"})
+
+    assert data["message"] == "a" * 999 + DEFAULT_SUFFIX
+    assert meta["truncated"] == {"message": 1004}  # Raw source chars
+
+
+def test_escapes_kept_whole():
+    data, _ = parse({"message": 'say "hi"\né'})
+
+    assert data["message"] == 'say "hi"\né'
+
+
+def test_input_larger_than_chunk(monkeypatch):
+    monkeypatch.setattr(payload, "CHUNK_SIZE", 16)
+    value = {"tool_result": "z" * 200, "session_id": "s1", "nested": [{"k": "v" * 50}]}
+    data, _ = parse(value, {"tool_result": (10, "...")})
+
+    assert data == {"tool_result": "z" * 10 + "...", "session_id": "s1", "nested": [{"k": "v" * 50}]}
+
+
+@pytest.mark.parametrize("raw", [b'{"a": ', b'{"a": "x', b'{"a" 1}', b"{nope}"])
+def test_invalid_payload(raw):
+    with pytest.raises(PayloadError):
+        read_payload(io.BytesIO(raw))
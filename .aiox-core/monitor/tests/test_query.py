@@ -0,0 +1,98 @@
+"""Offline queries over the local event store (query.py)."""
+
+import json
+import sys
+
+import pytest
+
+import query
+from lib import store
+
+
+def event(event_type: str, timestamp: int, **data) -> bytes:
+    return json.dumps({"type": event_type, "timestamp": timestamp, "data": data}).encode("utf-8")
+
+
+@pytest.fixture
+def events():
+    return [
+        event("PreToolUse", 1000, session_id="s1", tool_name="Read", aiox_agent="dev"),
+        event("ToolMetrics", 2000, session_id="s1", tool_name="Read", duration_ms=30.0, project="p1"),
+        event("ToolMetrics", 3000, session_id="s2", tool_name="Bash", duration_ms=10.0, project="p1"),
+        event("ToolMetrics", 4000, session_id="s2", tool_name="Read", duration_ms=20.0, project="p2"),
+        event("Stop", 5000, session_id="s2"),
+    ]
+
+
+def test_query_filters(events, monkeypatch):
+    monkeypatch.setattr(store, "SEGMENT_BYTES", 400)  # Spread over segments
+    for payload in events:
+        store.append([payload])
+    assert len(store.segments()) > 1
+
+    def matching(filters, since=0, until=query.MAX_TIME):
+        return [m.event(n) for m in query.scan(filters, since, until) for n in range(len(m))]
+
+    assert matching({}) == events
+    assert matching({3: "s2"}) == events[2:]
+    assert matching({4: "ToolMetrics", 6: "Read"}) == [events[1], events[3]]
+    assert matching({}, since=2000, until=4000) == events[1:4]
+    assert matching({3: "s2"}, since=4500) == [events[4]]
+    assert matching({3: "nope"}) == []
+
+
+def test_filters_check_values_on_hash_collision(events, monkeypatch):
+    monkeypatch.setattr(store, "key_hash", lambda value: 1 if value else 0)  # Every key collides
+    store.append(events)
+
+    found = [m.event(n) for m in query.scan({3: "s2", 6: "Read"}, 0, query.MAX_TIME) for n in range(len(m))]
+    assert found == [events[3]]
+    assert list(query.scan({5: "qa"}, 0, query.MAX_TIME)) == []
+
+
+def test_matches_columns(events):
+    store.append(events)
+    (matches,) = query.scan({3: "s2"}, 0, query.MAX_TIME)
+
+    assert matches.timestamps() == [3000, 4000, 5000]
+    assert matches.column(2) == [len(e) for e in events[2:]]
+    assert matches.record(0)[0] == 3000 and matches.record(0)[2] == len(events[2])
+
+
+def test_torn_index_record_is_ignored(events):
+    store.append(events[:2])
+    (base,) = store.segments()
+    with open(base + ".idx", "ab") as f:
+        f.write(b"\x01\x02\x03")
+
+    (matches,) = query.scan({}, 0, query.MAX_TIME)
+    assert len(matches) == 2
+
+
+def test_aggregate(events):
+    store.append(events)
+
+    by_tool = {row["key"]: row for row in query.aggregate(query.scan({}, 0, query.MAX_TIME), "tool")}
+    assert by_tool["Read"]["count"] == 3
+    assert by_tool["Read"]["bytes"] == len(events[0]) + len(events[1]) + len(events[3])
+    assert (by_tool["Read"]["p50"], by_tool["Read"]["max"]) == (20.0, 30.0)
+    assert by_tool["Bash"]["p99"] == 10.0
+    assert by_tool[None]["count"] == 1 and "p50" not in by_tool[None]
+
+    by_project = {row["key"]: row["count"] for row in query.aggregate(query.scan({}, 0, query.MAX_TIME), "project")}
+    assert by_project == {None: 2, "p1": 2, "p2": 1}
+
+
+def test_parse_time():
+    assert query.parse_time("1700000000000") == 1700000000000
+    assert query.parse_time("1970-01-01T00:00:01+00:00") == 1000
+    assert 0 < query.parse_time("2h") < query.parse_time("30m")
+
+
+def test_invalid_time_is_a_usage_error(monkeypatch, capsys):
+    monkeypatch.setattr(sys, "argv", ["query.py", "--since", "yesterday"])
+
+    with pytest.raises(SystemExit) as exit_info:
+        query.main()
+    assert exit_info.value.code == 2
+    assert "invalid time 'yesterday'" in capsys.readouterr().err
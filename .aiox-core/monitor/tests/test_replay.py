@@ -0,0 +1,93 @@
+"""Replay of missed events from the local store (replay.py)."""
+
+import sys
+
+import pytest
+
+import replay
+from lib import batch, breaker, store
+from lib.send_event import MonitorConnection, serialize_event
+
+
+def event(index: int) -> bytes:
+    return serialize_event("PostToolUse", {"session_id": "s1", "index": index})
+
+
+def indexes(collector) -> list[int]:
+    return [e["data"]["index"] for e in collector.events()]
+
+
+@pytest.fixture
+def conn(collector):
+    connection = MonitorConnection(collector.url)
+    yield connection
+    connection.close()
+
+
+@pytest.mark.parametrize("batched", [True, False])
+def test_replays_missed_events_once(collector, conn, monkeypatch, batched):
+    monkeypatch.setattr(batch, "ENABLED", batched)
+    monkeypatch.setattr(replay, "BATCH_SIZE", 2)
+    store.append([event(0), event(1)], missed=True)
+    store.append([event(2)], missed=False)  # Delivered: archived only
+    store.append([event(3), event(4)], missed=True)
+
+    assert replay.replay(conn) == 4
+    assert indexes(collector) == [0, 1, 3, 4]
+    paths = {path for path, _, _ in collector.bodies}
+    assert paths == ({"/events/batch"} if batched else {"/events"})
+
+    assert replay.replay(conn) == 0  # Cursor committed
+    store.append([event(5)], missed=True)
+    assert replay.replay(conn) == 1
+    assert indexes(collector)[-1] == 5
+
+
+def test_dry_run_sends_nothing(collector, conn):
+    store.append([event(0), event(1)], missed=True)
+
+    assert replay.replay(None, dry_run=True) == 2
+    assert collector.bodies == []
+    assert replay.replay(conn) == 2
+
+
+def test_unbatched_replay_skips_rejected_events(collector, conn, monkeypatch):
+    monkeypatch.setattr(batch, "ENABLED", False)
+    store.append([event(0), b"not json", event(1)], missed=True)
+    rejected = []
+    post = conn.post
+
+    def reject_invalid(path, body, headers=None):
+        if body == b"not json":
+            from lib.send_event import HTTPStatusError
+
+            rejected.append(body)
+            raise HTTPStatusError(400, path)
+        return post(path, body, headers)
+
+    monkeypatch.setattr(conn, "post", reject_invalid)
+
+    assert replay.replay(conn) == 3
+    assert rejected == [b"not json"]
+    assert indexes(collector) == [0, 1]
+
+
+def test_successful_replay_closes_circuit(collector, monkeypatch):
+    now = [1_000_000]
+    monkeypatch.setattr(breaker, "_now_ms", lambda: now[0])
+    monkeypatch.setattr(replay, "MonitorConnection", lambda: MonitorConnection(collector.url))
+    monkeypatch.setattr(sys, "argv", ["replay.py"])
+    for _ in range(breaker.THRESHOLD):
+        breaker.record_failure()
+    breaker.record_skipped("deferred", 2)
+    store.append([event(0), event(1)], missed=True)
+    now[0] = breaker.state()["retry_at"]
+
+    replay.main()
+
+    assert breaker.state() is None
+    assert breaker.allow() == breaker.CLOSED
+    received = collector.events()
+    assert [e["data"]["index"] for e in received[:2]] == [0, 1]
+    assert received[2]["type"] == "MonitorRecovered"
+    assert received[2]["data"]["deferred"] == 2
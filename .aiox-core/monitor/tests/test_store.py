@@ -0,0 +1,109 @@
+"""Durable local event store (lib/store.py)."""
+
+import json
+import os
+
+import pytest
+
+from lib import store
+
+
+def event(event_type: str, timestamp: int, **data) -> bytes:
+    return json.dumps({"type": event_type, "timestamp": timestamp, "data": data}).encode("utf-8")
+
+
+@pytest.fixture
+def events():
+    return [
+        event("PreToolUse", 1000, session_id="s1", tool_name="Read", aiox_agent="dev"),
+        event("ToolMetrics", 2000, session_id="s1", tool_name="Read", duration_ms=30.0, project="p1"),
+        event("ToolMetrics", 3000, session_id="s2", tool_name="Bash", duration_ms=10.0, project="p1"),
+        event("ToolMetrics", 4000, session_id="s2", tool_name="Read", duration_ms=20.0, project="p2"),
+        event("Stop", 5000, session_id="s2"),
+    ]
+
+
+def stored() -> list[tuple]:
+    """(record, event bytes) of every stored event, in store order."""
+    result = []
+    for base in store.segments():
+        reader = store.SegmentReader(base)
+        try:
+            for _, record in store.read_index(base):
+                result.append((record, reader.event(record[1], record[2])))
+        finally:
+            reader.close()
+    return result
+
+
+def test_index_round_trip(events):
+    store.append(events[:2], missed=True)
+    store.append(events[2:], missed=False)
+
+    records = stored()
+    assert [raw for _, raw in records] == events
+    timestamp, _, length, session, event_type, agent, tool, flags = records[0][0]
+    assert (timestamp, length) == (1000, len(events[0]))
+    assert (session, event_type, agent, tool) == (
+        store.key_hash("s1"), store.key_hash("PreToolUse"), store.key_hash("dev"), store.key_hash("Read")
+    )
+    assert [record[7] for record, _ in records] == [store.MISSED] * 2 + [0] * 3
+    assert records[4][0][6] == 0  # No tool_name: key 0
+
+
+def test_unparsable_event_is_stored(monkeypatch):
+    monkeypatch.setattr(store.time, "time", lambda: 7.0)
+    store.append([b"not json"])
+
+    ((record, raw),) = stored()
+    assert raw == b"not json"
+    assert record[0] == 7000 and record[3:7] == (0, 0, 0, 0)
+
+
+def test_segment_rollover(events, monkeypatch):
+    monkeypatch.setattr(store, "SEGMENT_BYTES", 1)
+    for payload in events:
+        store.append([payload])
+
+    assert len(store.segments()) == len(events)
+    assert [raw for _, raw in stored()] == events
+
+
+def test_torn_index_record_is_ignored(events):
+    store.append(events[:2])
+    (base,) = store.segments()
+    with open(base + ".idx", "ab") as f:
+        f.write(b"\x01\x02\x03")
+
+    assert [number for number, _ in store.read_index(base)] == [0, 1]
+    assert [number for number, _ in store.read_index(base, start=1)] == [1]
+
+
+def test_retention_by_size_and_age(events, monkeypatch):
+    monkeypatch.setattr(store, "SEGMENT_BYTES", 1)
+    for payload in events[:3]:
+        store.append([payload])
+    first, second, third = store.segments()
+
+    monkeypatch.setattr(store, "MAX_BYTES", os.path.getsize(third + ".log") + os.path.getsize(second + ".log"))
+    store.enforce_retention()
+    assert store.segments() == [second, third]
+
+    old = os.path.getmtime(second + ".log") - store.RETENTION_DAYS * 86400 - 60
+    os.utime(second + ".log", (old, old))
+    store.enforce_retention()
+    assert store.segments() == [third]
+    assert not os.path.exists(second + ".idx")
+
+
+@pytest.mark.parametrize("mode, sent, stored_flags", [
+    ("failed", False, [store.MISSED]),
+    ("failed", True, []),
+    ("all", True, [0]),
+    ("off", False, []),
+])
+def test_keep(events, monkeypatch, mode, sent, stored_flags):
+    monkeypatch.setattr(store, "MODE", mode)
+    store.keep(events[:1], sent)
+
+    assert [record[7] for record, _ in stored()] == stored_flags
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Benchmark for scripts/check-markdown-links.py --jobs
+
+Times a full scan (no cache) of the real docs/ tree and of a synthetic tree
+at several --jobs levels, checks every level produces the same results as
+--jobs 1, and prints speedup and parallel efficiency per level.
+
+Usage:
+    python scripts/bench-markdown-links.py                    # docs/ + 50k synthetic files
+    python scripts/bench-markdown-links.py --files 5000 --jobs 1,2,4
+    python scripts/bench-markdown-links.py --no-synthetic     # docs/ only
+
+Exit codes:
+    0 - Results identical at every --jobs level
+    1 - Results differ between levels
+"""
+
+import argparse
+import importlib.util
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def load_checker():
+    """Import check-markdown-links.py (hyphenated name) as a module."""
+    spec = importlib.util.spec_from_file_location(
+        "check_markdown_links", os.path.join(SCRIPT_DIR, "check-markdown-links.py")
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module  # Pool workers unpickle functions by module name
+    spec.loader.exec_module(module)
+    return module
+
+
+def build_tree(root: str, files: int, seed: int = 1) -> None:
+    """Synthetic docs: nested dirs of ~40 files, each with prose and ~12 links."""
+    rng = random.Random(seed)
+    paths = [os.path.join(f"area-{i // 2000}", f"section-{i // 40}", f"page-{i}.md") for i in range(files)]
+    prose = "Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod tempor.\n"
+    for index, path in enumerate(paths):
+        full = os.path.join(root, path)
+        os.makedirs(os.path.dirname(full), exist_ok=True)
+        lines = [f"# Page {index}\n\n"]
+        for _ in range(12):
+            lines.append(prose * rng.randint(1, 4))
+            target = rng.choice(paths)
+            if rng.random() < 0.1:
+                target = target.replace(".md", "-missing.md")
+            link = os.path.relpath(target, os.path.dirname(path))
+            marker = " *(coming soon)*" if rng.random() < 0.05 else ""
+            lines.append(f"See [page]({link}#details){marker} and [site](https://example.com).\n\n")
+        with open(full, "w", encoding="utf-8") as f:
+            f.writelines(lines)
+
+
+def summarize(results: dict) -> tuple:
+    """Comparable digest of scan results (every finding, in order)."""
+    return tuple(
+        (key, tuple((fp, info["line"], info["link"]) for fp, info in results[key]))
+        for key in ("broken", "coming_soon", "incorrect_marking", "broken_anchor", "valid")
+    ) + (results["files_scanned"],)
+
+
+def bench(checker, docs_dir: str, levels: list, runs: int) -> bool:
+    """Print timings per --jobs level. Returns False if results differ."""
+    files = len(checker.list_docs(docs_dir))
+    print(f"{docs_dir}: {files} files")
+    print(f"  {'jobs':>4} {'seconds':>9} {'files/s':>10} {'speedup':>8} {'efficiency':>10}")
+    base_time = reference = None
+    same = True
+    for jobs in levels:
+        best = float("inf")
+        for _ in range(runs):
+            start = time.perf_counter()
+            results = checker.scan_docs(docs_dir, None, jobs)
+            best = min(best, time.perf_counter() - start)
+        digest = summarize(results)
+        if reference is None:
+            reference, base_time = digest, best
+        elif digest != reference:
+            same = False
+        speedup = base_time / best
+        flag = "" if digest == reference else "  RESULTS DIFFER"
+        print(f"  {jobs:>4} {best:>9.3f} {files / best:>10.0f} {speedup:>7.2f}x {speedup / jobs:>9.0%}{flag}")
+    print()
+    return same
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark check-markdown-links.py --jobs")
+    parser.add_argument("--jobs", default="1,2,4,8", help="Comma-separated --jobs levels")
+    parser.add_argument("--files", type=int, default=50000, help="Synthetic tree size")
+    parser.add_argument("--runs", type=int, default=1, help="Best of N runs per level")
+    parser.add_argument("--dir", default="docs", help="Real docs tree")
+    parser.add_argument("--no-synthetic", action="store_true", help="Skip the synthetic tree")
+    args = parser.parse_args()
+
+    checker = load_checker()
+    levels = [int(n) for n in args.jobs.split(",")]
+    print(f"CPUs: {os.cpu_count()}\n")
+
+    same = True
+    if os.path.isdir(args.dir):
+        same &= bench(checker, args.dir, levels, args.runs)
+
+    if not args.no_synthetic:
+        root = tempfile.mkdtemp(prefix="md-links-bench-")
+        try:
+            start = time.perf_counter()
+            build_tree(os.path.join(root, "docs"), args.files)
+            print(f"(built synthetic tree in {time.perf_counter() - start:.1f}s)")
+            cwd = os.getcwd()
+            os.chdir(root)
+            try:
+                same &= bench(checker, "docs", levels, args.runs)
+            finally:
+                os.chdir(cwd)
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+
+    sys.exit(0 if same else 1)
+
+
+if __name__ == "__main__":
+    main()
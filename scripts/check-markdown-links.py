@@ -8,34 +8,107 @@ Inspired by Obsidian's broken link checker.
 Usage:
     python scripts/check-markdown-links.py              # Default report
     python scripts/check-markdown-links.py --json       # JSON output for CI
+    python scripts/check-markdown-links.py --ndjson     # Stream findings as NDJSON while scanning
+    python scripts/check-markdown-links.py --json -v    # Include valid links
     python scripts/check-markdown-links.py --fix        # Auto-fix broken links (add coming soon)
+    python scripts/check-markdown-links.py --fix --dry-run  # Show the fixes as a diff, write nothing
     python scripts/check-markdown-links.py --summary    # Quick summary only
+    python scripts/check-markdown-links.py --no-cache   # Ignore the link cache
+    python scripts/check-markdown-links.py --jobs 8     # Parse files in 8 processes
+    python scripts/check-markdown-links.py --watch      # Re-check on every change
+    python scripts/check-markdown-links.py --graph      # Orphans, unreachable pages, hubs
+    python scripts/check-markdown-links.py --graph csv  # Export links as CSV (or json)
+
+Each file is read in one pass by a markdown tokenizer (MarkdownScanner):
+links in fenced code, inline code and HTML comments are ignored; inline
+links and images (parentheses in paths, <dest>, titles), reference links
+and HTML href/src are found. A link is "coming soon" if the marker follows
+it before the next link on the line.
+
+Links extracted from each file are cached in .aiox/cache/markdown-links.json
+together with whether each target exists. A run only re-parses files whose
+size/mtime (and then content hash) changed, and only re-checks targets whose
+directory changed (entries added, deleted or renamed); results are the same
+as a full scan. Stale files are parsed as the scan reaches them, so findings
+stream from the first file; links that were valid are cached without their
+line, which is read back from the file if they are reported later.
+
+Targets are resolved against in-memory directory listings (one listing per
+directory, not one stat per link), matching names case-sensitively on every
+filesystem. Broken links that only differ from an existing file in case are
+reported with the file they match ('case_match').
+
+Anchors (file.md#section, #section) are checked against the headings of the
+target file, slugged as GitHub does (duplicates get -1, -2...), and its HTML
+id/name attributes. Each file's anchors are collected while it is parsed
+(and cached with its links), so every link to it shares them.
+
+--graph reports orphans (no inbound links), pages unreachable from
+docs/README.md (or index.md), the most linked pages and the most linked
+"coming soon" targets; --graph json/csv exports the links for other tools.
+
+Valid links are only counted unless they are listed (--verbose); --graph
+keeps just their targets, file by file.
+--ndjson writes each finding as one JSON line as soon as its file is
+checked and ends with a summary line; it keeps counts only, so its memory
+stays flat however many links the tree has.
 
 Exit codes:
     0 - All links valid (or only coming soon)
     1 - Broken links found (needs attention)
     2 - Incorrect markings found (exists but marked coming soon)
+    3 - Broken anchors found (file exists, #anchor does not)
 """
 
 import argparse
+import csv
+import difflib
+import hashlib
 import json
 import os
 import re
+import stat
 import sys
+import time
+from array import array
 from collections import defaultdict
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
+from urllib.parse import unquote
 
 # Configuration
 DOCS_DIR = "docs"
-LINK_PATTERN = re.compile(r'\[([^\]]*)\]\(([^)]+)\)')
 COMING_SOON_MARKER = " *(coming soon)*"
+MARKER_PATTERN = re.compile(r'\s*\*\(coming soon\)\*', re.IGNORECASE)
+CACHE_FILE = os.path.join(".aiox", "cache", "markdown-links.json")
+CACHE_VERSION = 5
+RESULT_KEYS = ('broken', 'coming_soon', 'incorrect_marking', 'broken_anchor', 'valid')
+# Reported per finding; column/end_column are the 1-based span of the link token
+INFO_FIELDS = ('line', 'column', 'end_column', 'text', 'link', 'resolved', 'line_content')
+GRAPH_ROOTS = ('README.md', 'index.md')
+
+# Markdown tokenizer (MarkdownScanner)
+SCHEME_PATTERN = re.compile(r'[A-Za-z][A-Za-z0-9+.-]+:')
+INLINE_PATTERN = re.compile(r'\\.|`+|<|!?\[')
+BRACKET_PATTERN = re.compile(r'\\.|`+|[\[\]]')
+HEADING_PATTERN = re.compile(r'#{1,6}(?:[ \t]+(.*?))?(?:[ \t]+#+)?[ \t]*$')
+SETEXT_PATTERN = re.compile(r' {0,3}(?:=+|-+)[ \t]*$')
+DEFINITION_PATTERN = re.compile(r'\[((?:[^\]\\]|\\.)+)\]:[ \t]*(?:<([^>]*)>|(\S+))')
+AUTOLINK_PATTERN = re.compile(r'<[A-Za-z][A-Za-z0-9+.-]{1,31}:[^\s<>]*>')
+TAG_PATTERN = re.compile(r'<[A-Za-z][A-Za-z0-9-]*(?:\s[^<>]*)?/?>')
+SLUG_LINK_PATTERN = re.compile(r'!?\[([^\]]*)\]\([^)]*\)')
+SLUG_HTML_PATTERN = re.compile(r'<[^>]+>|&#?\w+;')
+SLUG_EMPHASIS_PATTERN = re.compile(r'(?<!\w)_+|_+(?!\w)')
+SLUG_DROP_PATTERN = re.compile(r'[^\w\- ]')
+ATTRIBUTE_PATTERN = re.compile(
+    r'''\s(href|src|id|name)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'=<>`]+))''', re.IGNORECASE
+)
 
 
 def normalize_path(source_file: str, link: str) -> Optional[str]:
     """Resolve a relative link to an absolute path."""
-    # Skip external links, mailto, and anchors
-    if link.startswith(('http://', 'https://', 'mailto:', '#')):
+    # Skip external links (any scheme: http, mailto, data...) and anchors
+    if link.startswith(('#', '//')) or SCHEME_PATTERN.match(link):
         return None
 
     # Remove anchor from link
@@ -51,139 +124,1260 @@ def normalize_path(source_file: str, link: str) -> Optional[str]:
     return os.path.normpath(os.path.join(source_dir, link))
 
 
-def is_coming_soon(line: str, link: str) -> bool:
-    """Check if a link is marked as coming soon."""
-    link_escaped = re.escape(f"]({link})")
-    return bool(re.search(link_escaped + r'.*coming soon', line, re.IGNORECASE))
-
+def github_slug(heading: str) -> str:
+    """Anchor GitHub generates for a heading's text (before de-duplication)."""
+    text = heading
+    if '](' in text:
+        text = SLUG_LINK_PATTERN.sub(r'\1', text)  # Links/images -> their text
+    if '<' in text or '&' in text:
+        text = SLUG_HTML_PATTERN.sub('', text)  # HTML tags and entities
+    if '_' in text:
+        text = SLUG_EMPHASIS_PATTERN.sub('', text)  # _emphasis_, not snake_case
+    return SLUG_DROP_PATTERN.sub('', text.strip().lower()).replace(' ', '-')
+
+
+def _code_span_end(line: str, start: int, ticks: str) -> Optional[int]:
+    """End of the code span opened by ticks (a backtick run) before start."""
+    size = len(ticks)
+    at = line.find(ticks, start)
+    while at != -1:
+        end = at + size
+        if line[end:end + 1] != '`':
+            return end
+        while line[end:end + 1] == '`':
+            end += 1  # Longer run: does not close this span
+        at = line.find(ticks, end)
+    return None
+
+
+def _bracket_end(line: str, start: int, stop: int) -> int:
+    """Index of the ']' closing the '[' before start (nesting, escapes, code spans)."""
+    depth = 0
+    search = BRACKET_PATTERN.search
+    while True:
+        match = search(line, start, stop)
+        if match is None:
+            return -1
+        token = match.group()
+        start = match.end()
+        if token == '[':
+            depth += 1
+        elif token == ']':
+            if depth == 0:
+                return match.start()
+            depth -= 1
+        elif token[0] == '`':
+            start = _code_span_end(line, start, token) or start
+
+
+def _link_destination(line: str, start: int) -> Optional[tuple]:
+    """(destination, end) of the '(dest "title")' part of an inline link."""
+    size = len(line)
+    i = start
+    while i < size and line[i] in ' \t':
+        i += 1
+    if i < size and line[i] == '<':
+        close = line.find('>', i + 1)
+        if close == -1:
+            return None
+        dest = line[i + 1:close]
+        i = close + 1
+    else:
+        begin = i
+        depth = 0
+        while i < size:
+            char = line[i]
+            if char == '\\':
+                i += 2
+                continue
+            if char == '(':
+                depth += 1
+            elif char == ')':
+                if depth == 0:
+                    break
+                depth -= 1
+            elif char in ' \t':
+                break
+            i += 1
+        dest = line[begin:i]
+    while i < size and line[i] in ' \t':
+        i += 1
+    if i < size and line[i] in '"\'(':
+        close = line.find(')' if line[i] == '(' else line[i], i + 1)
+        if close == -1:
+            return None
+        i = close + 1
+        while i < size and line[i] in ' \t':
+            i += 1
+    if i < size and line[i] == ')':
+        return dest, i + 1
+    return None
+
+
+def _label(text: str) -> str:
+    """Reference label as matched: case-insensitive, whitespace collapsed."""
+    return ' '.join(text.split()).casefold()
+
+
+class MarkdownScanner:
+    """
+    Single pass over a markdown file collecting its links and anchors.
+
+    Block state (fenced code, YAML front matter, multi-line HTML comments)
+    is tracked across lines; within a line, code spans and escapes are
+    skipped and inline links/images (balanced parentheses, <dest>, titles),
+    reference links ([text][ref], [ref][], [ref]) resolved against the
+    file's definitions, and HTML href/src attributes are tokenized. Anchors
+    are heading slugs (duplicates get -1, -2... as on GitHub) and id/name
+    attributes of HTML tags.
+    """
+
+    def __init__(self):
+        self.tokens = []  # (line_num, start, end, text, kind, target)
+        self.definitions = {}
+        self.anchors = []
+        self.slugs = defaultdict(int)
+        self.in_comment = False
+
+    def add_heading(self, text: str) -> None:
+        slug = base = github_slug(text)
+        while slug in self.slugs:
+            self.slugs[base] += 1
+            slug = f"{base}-{self.slugs[base]}"
+        self.slugs[slug] += 0
+        self.anchors.append(slug)
+
+    def scan(self, lines: list) -> None:
+        fence = None
+        previous = ''
+        for line_num, line in enumerate(lines, 1):
+            if fence:
+                stripped = line.strip()
+                if stripped.startswith(fence) and not stripped.strip(fence[0]):
+                    fence = None  # A closing fence is at least as long, nothing after it
+                continue
+            stripped = line.lstrip()
+            first = stripped[:1]
+            if not first:
+                previous = ''
+                continue
+            if self.in_comment:
+                previous = ''
+                self.scan_inline(line_num, line.rstrip('\r\n'))
+                continue
+
+            if line_num == 1 and line.rstrip() == '---':
+                fence = '---'  # YAML front matter
+                continue
+            if first in '`~' and stripped[:3] in ('```', '~~~'):
+                fence = stripped[:len(stripped) - len(stripped.lstrip(first))]
+                previous = ''
+                continue
+            if first == '#' and len(line) - len(stripped) < 4:
+                match = HEADING_PATTERN.match(stripped)
+                if match:
+                    self.add_heading(match.group(1) or '')
+                    previous = ''
+                    self.scan_inline(line_num, line.rstrip('\r\n'))
+                    continue
+            elif first in '=-' and previous and SETEXT_PATTERN.match(line):
+                self.add_heading(previous)
+                previous = ''
+                continue
+            elif first == '[':
+                match = DEFINITION_PATTERN.match(stripped)
+                if match:
+                    label = _label(match.group(1))
+                    if label not in self.definitions:
+                        self.definitions[label] = (match.group(2) or match.group(3) or '').strip()
+                    previous = ''
+                    continue
 
-def scan_file(filepath: str) -> dict:
-    """Scan a markdown file for link issues."""
+            previous = line
+            if '[' in line or '<' in line:
+                self.scan_inline(line_num, line.rstrip('\r\n'))
+                if self.in_comment:
+                    previous = ''
+
+    def scan_inline(self, line_num: int, line: str, start: int = 0, stop: Optional[int] = None) -> None:
+        """Tokenize the links of line[start:stop]."""
+        if stop is None:
+            stop = len(line)
+        if self.in_comment:
+            close = line.find('-->', start, stop)
+            if close == -1:
+                return
+            self.in_comment = False
+            start = close + 3
+
+        search = INLINE_PATTERN.search
+        position = start
+        while True:
+            match = search(line, position, stop)
+            if match is None:
+                return
+            token = match.group()
+            begin = match.start()
+            position = match.end()
+
+            if token[0] == '\\':
+                continue
+            if token[0] == '`':
+                position = _code_span_end(line, position, token) or position
+                continue
+            if token == '<':
+                if line.startswith('<!--', begin):
+                    close = line.find('-->', begin + 4, stop)
+                    if close == -1:
+                        self.in_comment = True
+                        return
+                    position = close + 3
+                    continue
+                match = AUTOLINK_PATTERN.match(line, begin, stop) or TAG_PATTERN.match(line, begin, stop)
+                if match is None:
+                    continue
+                position = match.end()
+                for name, *values in ATTRIBUTE_PATTERN.findall(match.group()):
+                    value = ''.join(values)
+                    if name.lower() in ('id', 'name'):
+                        self.anchors.append(value)
+                    elif value:
+                        self.tokens.append((line_num, begin, position, '', 'html', value))
+                continue
+
+            # '[' or '!['
+            text_start = position
+            text_end = _bracket_end(line, text_start, stop)
+            if text_end == -1:
+                continue
+            text = line[text_start:text_end]
+            after = text_end + 1
+            next_char = line[after:after + 1]
+            if next_char == '(':
+                parsed = _link_destination(line, after + 1)
+                if parsed is None:
+                    continue
+                dest, end = parsed
+                self.tokens.append((line_num, begin, end, text, 'inline', dest))
+            elif next_char == '[':
+                close = line.find(']', after + 1, stop)
+                if close == -1:
+                    continue
+                end = close + 1
+                self.tokens.append((line_num, begin, end, text, 'ref', _label(line[after + 1:close] or text)))
+            else:
+                end = after
+                self.tokens.append((line_num, begin, end, text, 'ref', _label(text)))
+            if '[' in text or '<' in text:
+                self.scan_inline(line_num, line, text_start, text_end)  # Images in link text
+            position = end
+
+    def links(self) -> list:
+        """(line_num, start, end, text, destination) of every resolved link."""
+        links = []
+        for line_num, start, end, text, kind, target in self.tokens:
+            if kind == 'ref':
+                target = self.definitions.get(target)
+                if target is None:
+                    continue  # [text] without a definition is plain text
+            links.append((line_num, start, end, text, target))
+        links.sort(key=lambda link: (link[0], link[1]))
+        return links
+
+
+def parse_markdown(filepath: str, lines: list) -> tuple:
+    """
+    Links and anchors of a file's lines, in one pass (no filesystem access).
+
+    Returns:
+        (links, anchors) - links as dicts with line, text, link, resolved,
+        line_content, coming_soon and anchor
+    """
+    scanner = MarkdownScanner()
+    scanner.scan(lines)
+    found = scanner.links()
+
+    links = []
+    for index, (line_num, start, end, text, link) in enumerate(found):
+        path, _, anchor = link.partition('#')
+        if not path and anchor:
+            resolved = os.path.normpath(filepath)  # Same-file anchor
+        else:
+            resolved = normalize_path(filepath, link)
+
+        if resolved is None:
+            continue
+
+        # Marked "coming soon" if the marker follows it before the next link
+        line = lines[line_num - 1].rstrip('\r\n')
+        next_start = len(line)
+        for other in found[index + 1:]:
+            if other[0] != line_num:
+                break
+            if other[1] >= end:
+                next_start = other[1]
+                break
+        coming_soon = 'coming soon' in line[end:next_start].lower()
+
+        links.append({
+            'line': line_num,
+            'text': text,
+            'link': link,
+            'resolved': resolved,
+            'line_content': line.rstrip(),
+            'column': start + 1,
+            'end_column': end,
+            'coming_soon': coming_soon,
+            'anchor': unquote(anchor) if anchor else None,
+        })
+    return links, scanner.anchors
+
+
+def extract_links(filepath: str, lines: list) -> list:
+    """Extract the internal links of a file's lines (no filesystem access)."""
+    return parse_markdown(filepath, lines)[0]
+
+
+def extract_anchors(lines: list) -> list:
+    """Anchors a markdown file defines (see MarkdownScanner)."""
+    return parse_markdown('', lines)[1]
+
+
+def classify_links(links: list, exists, case_match=None, anchors=None, keep_valid: bool = True,
+                   valid_targets: bool = False) -> dict:
+    """
+    Sort extracted links into result buckets; exists(resolved) -> bool.
+
+    case_match(resolved), if given, names the file a broken link only
+    reaches on a case-insensitive filesystem (stored as 'case_match').
+    anchors(resolved), if given, returns the anchors of an existing target
+    (None if they cannot be checked); links to a missing anchor go to
+    'broken_anchor'. Valid links are always counted ('valid_links') but only
+    listed with keep_valid; otherwise, with valid_targets, just their resolved
+    targets are kept ('valid_targets', for the link graph).
+    """
     results = {
         'broken': [],
         'coming_soon': [],
         'incorrect_marking': [],
-        'valid': []
+        'broken_anchor': [],
+        'valid': [],
+        'valid_links': 0,
+        'valid_targets': [],
     }
 
-    try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-
-        for line_num, line in enumerate(lines, 1):
-            for match in LINK_PATTERN.finditer(line):
-                text, link = match.group(1), match.group(2)
-                resolved = normalize_path(filepath, link)
-
-                if resolved is None:
-                    continue
-
-                exists = os.path.exists(resolved)
-                coming_soon = is_coming_soon(line, link)
-
-                info = {
-                    'line': line_num,
-                    'text': text,
-                    'link': link,
-                    'resolved': resolved,
-                    'line_content': line.rstrip()
-                }
-
-                if exists and coming_soon:
-                    results['incorrect_marking'].append(info)
-                elif not exists and coming_soon:
-                    results['coming_soon'].append(info)
-                elif not exists:
-                    results['broken'].append(info)
-                else:
-                    results['valid'].append(info)
-
-    except Exception as e:
-        print(f"Error scanning {filepath}: {e}", file=sys.stderr)
+    for link in links:
+        found = exists(link['resolved'])
+
+        if found and link['coming_soon']:
+            key = 'incorrect_marking'
+        elif not found and link['coming_soon']:
+            key = 'coming_soon'
+        elif not found:
+            key = 'broken'
+        elif link['anchor'] and anchors is not None and not anchor_exists(link['anchor'], anchors(link['resolved'])):
+            key = 'broken_anchor'
+        else:
+            results['valid_links'] += 1
+            if not keep_valid:
+                if valid_targets:
+                    results['valid_targets'].append(link['resolved'])
+                continue
+            key = 'valid'
+
+        info = {field: link.get(field) for field in INFO_FIELDS}
+        if key == 'broken' and case_match is not None:
+            match = case_match(link['resolved'])
+            if match:
+                info['case_match'] = match
+        results[key].append(info)
 
     return results
 
 
-def fix_broken_link(filepath: str, line_num: int, link: str) -> bool:
-    """Add 'coming soon' marker to a broken link."""
+def fill_line_content(filepath: str, results: dict) -> None:
+    """Read back the line_content of reported links cached without it."""
+    missing = [info for key in RESULT_KEYS for info in results[key] if info['line_content'] is None]
+    if not missing:
+        return
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-
-        line_idx = line_num - 1
-        line = lines[line_idx]
-
-        # Find the link and add marker after it
-        pattern = re.escape(f"]({link})")
-        if re.search(pattern + r'\s*\*\(coming soon\)\*', line, re.IGNORECASE):
-            return False  # Already marked
-
-        new_line = re.sub(
-            pattern,
-            f"]({link}){COMING_SOON_MARKER}",
-            line
-        )
-
-        if new_line != line:
-            lines[line_idx] = new_line
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.writelines(lines)
-            return True
-
+        lines = read_lines(filepath)
+    except (OSError, UnicodeDecodeError):
+        lines = []
+    for info in missing:
+        line_idx = info['line'] - 1
+        info['line_content'] = lines[line_idx].rstrip() if line_idx < len(lines) else ''
+
+
+def anchor_exists(anchor: str, anchors: Optional[set]) -> bool:
+    """Whether a fragment names an anchor (browsers also try it lowercased)."""
+    return anchors is None or anchor in anchors or anchor.lower() in anchors
+
+
+class PathIndex:
+    """
+    Directory listings in memory, so resolving a link is a set lookup.
+
+    entries: directory -> names in it (None if not a directory)
+    folded:  directory -> casefolded name -> names (built on demand)
+
+    walk() lists a whole tree up front; directories outside it (links to
+    ../src/...) are listed on first use. Names are matched exactly, so a
+    link whose case differs from the file is broken on every filesystem,
+    as it is on GitHub and Linux; case_match() finds the file it was meant
+    for.
+    """
+
+    def __init__(self):
+        self.entries = {}
+        self.folded = {}
+        self.listed = 0
+
+    def _scan(self, directory: str) -> Optional[list]:
+        """List a directory (dangling symlinks left out); returns its subdirectories."""
+        names = set()
+        subdirs = []
+        try:
+            with os.scandir(directory or '.') as it:
+                for entry in it:
+                    if entry.is_symlink() and not os.path.exists(entry.path):
+                        continue
+                    names.add(entry.name)
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.name)
+        except OSError:
+            self.entries[directory] = None
+            return None
+        self.entries[directory] = names
+        self.listed += 1
+        return subdirs
+
+    def walk(self, root: str) -> None:
+        """List every directory under root (symlinked ones on first use)."""
+        root = os.path.normpath(root)
+        pending = [root]
+        while pending:
+            directory = pending.pop()
+            subdirs = self._scan(directory)
+            pending.extend(os.path.join(directory, name) for name in subdirs or ())
+
+    def listing(self, directory: str) -> Optional[set]:
+        if directory not in self.entries:
+            parent, name = os.path.split(directory)
+            if name in ('', '.', '..') or name in (self.listing(parent) or ()):
+                self._scan(directory)
+            else:
+                self.entries[directory] = None  # Parent missing, or name differs in case
+        return self.entries[directory]
+
+    def exists(self, path: str) -> bool:
+        """os.path.exists() for a normalized path, case-sensitive everywhere."""
+        parent, name = os.path.split(path)
+        if name in ('', '.', '..'):
+            return self.listing(path) is not None
+        return name in (self.listing(parent) or ())
+
+    def case_match(self, path: str) -> Optional[str]:
+        """The existing path equal to path ignoring case, if path is missing."""
+        parent, name = os.path.split(path)
+        if name in ('', '.', '..'):
+            return None
+        names = self.listing(parent)
+        if names is None:
+            parent = self.case_match(parent)
+            names = self.listing(parent) if parent else None
+            if names is None:
+                return None
+            if name in names:
+                return os.path.join(parent, name)
+        if parent not in self.folded:
+            folded = defaultdict(list)
+            for entry in names:
+                folded[entry.casefold()].append(entry)
+            self.folded[parent] = folded
+        matches = self.folded[parent].get(name.casefold())
+        return os.path.join(parent, sorted(matches)[0]) if matches else None
+
+
+class AnchorIndex:
+    """
+    Anchors per markdown file, parsed once and shared by every link to it.
+
+    Scanned files come with their anchors (add(), from the scan or the
+    cache); other markdown targets are parsed on first use. Non-markdown
+    targets have no checkable anchors (None).
+    """
+
+    def __init__(self):
+        self.anchors = {}
+        self.parsed = 0
+
+    def add(self, filepath: str, anchors: list) -> None:
+        self.anchors[os.path.normpath(filepath)] = set(anchors)
+
+    def get(self, path: str) -> Optional[set]:
+        if path not in self.anchors:
+            anchors = None
+            if path.lower().endswith(('.md', '.markdown')):
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        anchors = set(extract_anchors(f.readlines()))
+                    self.parsed += 1
+                except (OSError, UnicodeDecodeError):
+                    pass
+            self.anchors[path] = anchors
+        return self.anchors[path]
+
+
+class LinkCache:
+    """
+    Links extracted per file and target existence, persisted between runs.
+
+    files:    source -> {'mtime_ns', 'size', 'sha1', 'links', 'anchors'}
+              (line_content is left out of links that were valid when
+              parsed; fill_line_content() reads it back if they are reported)
+    targets:  resolved target -> exists
+    dirs:     parent dir of targets -> mtime_ns (None if missing)
+    reverse:  resolved target -> source files linking to it
+
+    A target is only looked up again when its directory's mtime changed,
+    which happens whenever an entry is created, deleted or renamed in it;
+    lookups go through a PathIndex, one listing per changed directory.
+    """
+
+    def __init__(self, path: str, docs_dir: str):
+        self.path = path
+        self.key = [os.getcwd(), os.path.abspath(docs_dir)]
+        self.files = {}
+        self.targets = {}
+        self.dirs = {}
+        self.reverse = defaultdict(set)
+        self.index = PathIndex()
+        self.parsed = 0
+        self.rechecked = 0
+        self.dirty = True  # Until loaded intact
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') != CACHE_VERSION or data.get('key') != self.key:
+            return
+        self.files = data['files']
+        self.targets = data['targets']
+        self.dirs = data['dirs']
+        for target, sources in data['reverse'].items():
+            self.reverse[target] = set(sources)
+        self.dirty = False
+
+    def fresh(self, filepath: str) -> bool:
+        """Whether the cached links of a file are current (same size/mtime)."""
+        entry = self.files.get(filepath)
+        try:
+            st = os.stat(filepath)
+        except OSError:
+            return False
+        return bool(entry) and entry['mtime_ns'] == st.st_mtime_ns and entry['size'] == st.st_size
+
+    def sha1(self, filepath: str) -> Optional[str]:
+        entry = self.files.get(filepath)
+        return entry['sha1'] if entry else None
+
+    def update(self, filepath: str, mtime_ns: int, size: int, sha1: str,
+               links: Optional[list], anchors: Optional[list] = None, issues: Optional[set] = None) -> None:
+        """
+        Store a file read by read_file (links None: content unchanged).
+        issues, if given, holds the (line, column) of the links reported as
+        issues; the others are stored without their line_content.
+        """
+        entry = self.files.get(filepath)
+        if links is not None or entry is None:
+            self.forget(filepath)
+            stored = []
+            for link in links or ():
+                self.reverse[link['resolved']].add(filepath)
+                if issues is not None and (link['line'], link['column']) not in issues:
+                    link = {field: value for field, value in link.items() if field != 'line_content'}
+                stored.append(link)
+            entry = {'sha1': sha1, 'links': stored, 'anchors': sorted(set(anchors or ()))}
+            self.parsed += 1
+        entry.update(mtime_ns=mtime_ns, size=size)
+        self.files[filepath] = entry
+        self.dirty = True
+
+    def forget(self, filepath: str) -> None:
+        """Drop a source file, and targets no other file links to."""
+        entry = self.files.pop(filepath, None)
+        self.dirty = True
+        for link in entry['links'] if entry else ():
+            sources = self.reverse.get(link['resolved'])
+            if sources is None:
+                continue
+            sources.discard(filepath)
+            if not sources:
+                del self.reverse[link['resolved']]
+                self.targets.pop(link['resolved'], None)
+
+    def refresh_targets(self) -> set:
+        """
+        Re-check targets in directories that changed since the last run.
+
+        Returns:
+            Source files linking to a target that appeared or disappeared
+        """
+        by_dir = defaultdict(list)
+        for target in self.targets:
+            by_dir[os.path.dirname(target)].append(target)
+
+        affected = set()
+        for directory, targets in by_dir.items():
+            mtime = _mtime_ns(directory)
+            if directory in self.dirs and self.dirs[directory] == mtime:
+                continue
+            self.dirs[directory] = mtime
+            self.dirty = True
+            for target in targets:
+                exists = self.index.exists(target)
+                self.rechecked += 1
+                if exists != self.targets[target]:
+                    self.targets[target] = exists
+                    affected |= self.reverse.get(target, set())
+        return affected
+
+    def exists(self, target: str) -> bool:
+        if target not in self.targets:
+            directory = os.path.dirname(target)
+            if directory not in self.dirs:
+                self.dirs[directory] = _mtime_ns(directory)
+            self.targets[target] = self.index.exists(target)
+            self.rechecked += 1
+            self.dirty = True
+        return self.targets[target]
+
+    def save(self, seen: set) -> None:
+        """Write the cache if anything changed, dropping files not seen."""
+        for filepath in [f for f in self.files if f not in seen]:
+            self.forget(filepath)
+        if not self.dirty or not self.path:
+            return
+        used = {os.path.dirname(t) for t in self.targets}
+        data = {
+            'version': CACHE_VERSION,
+            'key': self.key,
+            'targets': self.targets,
+            'dirs': {d: m for d, m in self.dirs.items() if d in used},
+            'reverse': {t: sorted(s) for t, s in self.reverse.items()},
+        }
+        separators = (',', ':')
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, 'w', encoding='utf-8') as f:
+                # One entry at a time: never the whole cache as one string
+                f.write(json.dumps(data, separators=separators)[:-1] + ',"files":{')
+                for index, (filepath, entry) in enumerate(self.files.items()):
+                    f.write(f"{',' if index else ''}{json.dumps(filepath)}:{json.dumps(entry, separators=separators)}")
+                f.write('}}')
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print(f"Could not write link cache {self.path}: {e}", file=sys.stderr)
+
+
+def split_lines(data: bytes) -> list:
+    """Decode a file's bytes into lines, split as readlines() does in text mode."""
+    return data.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n').split('\n')
+
+
+def read_lines(filepath: str) -> list:
+    with open(filepath, 'rb') as f:
+        return split_lines(f.read())
+
+
+def read_file(filepath: str, known_sha1: Optional[str] = None) -> tuple:
+    """
+    Stat, hash and parse one file (runs in worker processes with --jobs).
+
+    Returns:
+        (mtime_ns, size, sha1, links, anchors) - links and anchors are None
+        if the content still hashes to known_sha1
+    """
+    st = os.stat(filepath)
+    with open(filepath, 'rb') as f:
+        data = f.read()
+    sha1 = hashlib.sha1(data).hexdigest()
+    if sha1 == known_sha1:
+        return st.st_mtime_ns, st.st_size, sha1, None, None
+    return (st.st_mtime_ns, st.st_size, sha1, *parse_markdown(filepath, split_lines(data)))
+
+
+def _read_file_safe(job: tuple):
+    """read_file for a pool: returns the exception instead of raising it."""
+    try:
+        return read_file(*job)
     except Exception as e:
-        print(f"Error fixing {filepath}:{line_num}: {e}", file=sys.stderr)
+        return e
 
-    return False
 
+def map_files(func, items: list, jobs: int = 1) -> Iterator:
+    """
+    func over items, in item order; with jobs > 1 sharded across a process
+    pool (chunks keep the per-task overhead low on large trees).
+    """
+    if jobs <= 1 or len(items) < 2:
+        yield from map(func, items)
+        return
+    from concurrent.futures import ProcessPoolExecutor
+
+    chunksize = max(1, len(items) // (jobs * 8))
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        yield from pool.map(func, items, chunksize=chunksize)
 
-def fix_incorrect_marking(filepath: str, line_num: int, link: str) -> bool:
-    """Remove 'coming soon' marker from a link to existing file."""
-    try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
 
-        line_idx = line_num - 1
-        line = lines[line_idx]
+def _mtime_ns(path: str) -> Optional[int]:
+    try:
+        return os.stat(path or '.').st_mtime_ns
+    except OSError:
+        return None
 
-        # Remove the coming soon marker after this specific link
-        pattern = re.escape(f"]({link})") + r'\s*\*\(coming soon\)\*'
-        new_line = re.sub(pattern, f"]({link})", line, flags=re.IGNORECASE)
 
-        if new_line != line:
-            lines[line_idx] = new_line
-            with open(filepath, 'w', encoding='utf-8') as f:
+def mark_coming_soon(line: str, end: int) -> str:
+    """Add 'coming soon' marker after the link token ending at column end."""
+    return line[:end] + COMING_SOON_MARKER + line[end:]
+
+
+def unmark_coming_soon(line: str, end: int) -> str:
+    """
+    Remove the 'coming soon' marker following the link token ending at
+    column end (line unchanged if it is not the standard marker).
+    """
+    match = MARKER_PATTERN.search(line, end)
+    if match is None:
+        return line
+    return line[:match.start()] + line[match.end():]
+
+
+FIXERS = {'broken': mark_coming_soon, 'incorrect_marking': unmark_coming_soon}
+
+
+def fixable(kind: str, info: dict) -> bool:
+    """Whether --fix can make the edit for a finding (a marker it can remove)."""
+    if kind == 'incorrect_marking':
+        return MARKER_PATTERN.search(info['line_content'], info['end_column']) is not None
+    return kind in FIXERS
+
+
+def fix_file(filepath: str, edits: list, dry_run: bool = False) -> tuple:
+    """
+    Apply all (kind, info) edits of a file in one pass: one read and, if
+    anything changed, one atomic write (temp file + rename). Each edit is
+    made at the end of its link token (info['end_column']), right to left
+    within a line so earlier spans stay valid. Line endings are kept.
+
+    Returns:
+        ({kind: edits applied}, new lines or None if unchanged, unified
+        diff, [(kind, info)] of edits that could not be made)
+    """
+    with open(filepath, 'r', encoding='utf-8', newline='') as f:
+        original = f.readlines()
+
+    lines = list(original)
+    fixed = defaultdict(int)
+    unfixable = []
+    for kind, info in sorted(edits, key=lambda edit: (edit[1]['line'], edit[1]['end_column']), reverse=True):
+        line_idx = info['line'] - 1
+        new_line = None
+        if 0 <= line_idx < len(lines) and original[line_idx].rstrip() == info['line_content']:
+            new_line = FIXERS[kind](lines[line_idx], info['end_column'])
+        if new_line is None or new_line == lines[line_idx]:
+            unfixable.append((kind, info))
+            continue
+        lines[line_idx] = new_line
+        fixed[kind] += 1
+    unfixable.reverse()
+
+    if lines == original:
+        return fixed, None, '', unfixable
+    diff = ''.join(difflib.unified_diff(original, lines, f"a/{filepath}", f"b/{filepath}"))
+    if not dry_run:
+        tmp = f"{filepath}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, 'w', encoding='utf-8', newline='') as f:
                 f.writelines(lines)
-            return True
+            os.chmod(tmp, stat.S_IMODE(os.stat(filepath).st_mode))
+            os.replace(tmp, filepath)
+        except OSError:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+    return fixed, lines, diff, unfixable
+
+
+def fix_results(results: dict, dry_run: bool = False) -> tuple:
+    """
+    Fix broken links (add coming soon) and incorrect markings (remove it),
+    grouped per file so each file is read and written once.
+
+    Returns:
+        ({kind: edits applied}, {file: new lines}, [unified diff per file],
+        [(file, kind, info)] of findings that need a manual edit)
+    """
+    edits = defaultdict(list)
+    for kind in FIXERS:
+        for fp, info in results[kind]:
+            edits[fp].append((kind, info))
+
+    fixed = defaultdict(int)
+    rewritten = {}
+    diffs = []
+    unfixable = []
+    for filepath, file_edits in edits.items():
+        try:
+            file_fixed, lines, diff, file_unfixable = fix_file(filepath, file_edits, dry_run)
+        except Exception as e:
+            print(f"Error fixing {filepath}: {e}", file=sys.stderr)
+            continue
+        for kind, count in file_fixed.items():
+            fixed[kind] += count
+        unfixable.extend((filepath, kind, info) for kind, info in file_unfixable)
+        if lines is not None:
+            rewritten[filepath] = lines
+            diffs.append(diff)
+    return fixed, rewritten, diffs, unfixable
+
+
+def list_docs(docs_dir: str = DOCS_DIR) -> list:
+    """Markdown files under docs_dir, in walk order."""
+    return [
+        os.path.join(root, file)
+        for root, _, files in os.walk(docs_dir)
+        for file in files
+        if file.endswith('.md')
+    ]
+
+
+class DocsScan:
+    """
+    One scan of a docs directory, streamed: iterating yields (filepath,
+    results) per file, in walk order, as soon as the file is classified,
+    and keeps nothing, so findings can be reported while the scan runs.
+
+    With jobs > 1 files are read and parsed in a process pool; output is the
+    same for any jobs. Targets are resolved against a PathIndex instead of
+    being stat'd per link, and anchors against an AnchorIndex (each file's
+    anchors are collected while it is parsed; a target not scanned yet is
+    parsed when first linked to). With a cache, only stale files are parsed,
+    each one as its turn comes, and its cache entry is updated right away.
+    """
+
+    def __init__(self, docs_dir: str = DOCS_DIR, cache: Optional[LinkCache] = None,
+                 jobs: int = 1, keep_valid: bool = True, valid_targets: bool = False):
+        self.docs_dir = docs_dir
+        self.cache = cache
+        self.jobs = jobs
+        self.keep_valid = keep_valid
+        self.valid_targets = valid_targets
+        self.filepaths = list_docs(docs_dir)
+        self.anchors = AnchorIndex()
+        self.index = PathIndex()
+
+    def classify(self, links: list, filepath: Optional[str] = None) -> dict:
+        """Classify a file's links (cached links: pass filepath to fill in line_content)."""
+        if self.cache is None:
+            return classify_links(links, self.index.exists, self.index.case_match, self.anchors.get,
+                                  self.keep_valid, self.valid_targets)
+        cache = self.cache
+        results = classify_links(links, cache.exists, cache.index.case_match, self.anchors.get,
+                                 self.keep_valid, self.valid_targets)
+        if filepath is not None:
+            fill_line_content(filepath, results)
+        return results
+
+    def __iter__(self):
+        cache = self.cache
+        if cache is None:
+            self.index.walk(self.docs_dir)
+            reads = map_files(_read_file_safe, [(fp, None) for fp in self.filepaths], self.jobs)
+            for filepath, read in zip(self.filepaths, reads):
+                if isinstance(read, Exception):
+                    print(f"Error scanning {filepath}: {read}", file=sys.stderr)
+                    read = (None, None, None, [], [])
+                self.anchors.add(filepath, read[4])
+                yield filepath, self.classify(read[3])
+            return
+
+        cache.refresh_targets()
+        stale = [fp for fp in self.filepaths if not cache.fresh(fp)]
+        is_stale = set(stale)
+        for filepath in self.filepaths:
+            if filepath not in is_stale:
+                self.anchors.add(filepath, cache.files[filepath]['anchors'])
+        # Stale files come back in walk order, so they are read as the loop reaches them
+        reads = map_files(_read_file_safe, [(fp, cache.sha1(fp)) for fp in stale], self.jobs)
+        for filepath in self.filepaths:
+            read = next(reads) if filepath in is_stale else None
+            if isinstance(read, Exception):
+                print(f"Error scanning {filepath}: {read}", file=sys.stderr)
+                cache.forget(filepath)
+                read = (None, None, None, [], [])
+            if read is None or read[3] is None:  # Fresh, or content unchanged
+                if read is not None:
+                    cache.update(filepath, *read)
+                    self.anchors.add(filepath, cache.files[filepath]['anchors'])
+                yield filepath, self.classify(cache.files[filepath]['links'], filepath)
+                continue
+            self.anchors.add(filepath, read[4])
+            results = self.classify(read[3])
+            if read[0] is not None:
+                issues = {(info['line'], info['column']) for key in RESULT_KEYS[:-1] for info in results[key]}
+                cache.update(filepath, *read, issues)
+            yield filepath, results
+        cache.save(set(self.filepaths))
+
+
+def scan_docs(docs_dir: str = DOCS_DIR, cache: Optional[LinkCache] = None, jobs: int = 1,
+              keep_valid: bool = True) -> dict:
+    """
+    Scan all markdown files in docs directory (incrementally with a cache)
+    and collect the results (see DocsScan).
+
+    Valid links are only counted ('valid_links') unless keep_valid.
+    """
+    scan = DocsScan(docs_dir, cache, jobs, keep_valid)
+    per_file = dict(scan)
+
+    all_results = merge_results(scan.filepaths, [per_file[fp] for fp in scan.filepaths])
+    # Kept for update_results(); not part of the report
+    all_results['filepaths'] = scan.filepaths
+    all_results['per_file'] = per_file
+    all_results['classify'] = scan.classify
+    all_results['anchors'] = scan.anchors
+    return all_results
 
-    except Exception as e:
-        print(f"Error fixing {filepath}:{line_num}: {e}", file=sys.stderr)
 
-    return False
+def merge_results(filepaths: list, per_file: list) -> dict:
+    """Concatenate per-file results, as (filepath, info) pairs, in file order."""
+    all_results = {key: [] for key in RESULT_KEYS}
+    all_results['files_scanned'] = 0
+    all_results['valid_links'] = 0
+    for filepath, results in zip(filepaths, per_file):
+        all_results['files_scanned'] += 1
+        all_results['valid_links'] += results['valid_links']
+        for key in RESULT_KEYS:
+            all_results[key].extend([(filepath, i) for i in results[key]])
+    return all_results
 
 
-def scan_docs(docs_dir: str = DOCS_DIR) -> dict:
-    """Scan all markdown files in docs directory."""
-    all_results = {
-        'broken': [],
-        'coming_soon': [],
-        'incorrect_marking': [],
-        'valid': [],
-        'files_scanned': 0
-    }
+def update_results(results: dict, rewritten: dict) -> bool:
+    """
+    Re-classify the links of rewritten files in memory, giving the results
+    a rescan would. Returns False (results untouched) if a rewrite changed
+    the anchors of a file, which other files' links may depend on.
+    """
+    anchors = results['anchors']
+    per_file = results['per_file']
+    parsed = {filepath: parse_markdown(filepath, lines) for filepath, lines in rewritten.items()}
+    for filepath, (_, file_anchors) in parsed.items():
+        if set(file_anchors) != anchors.get(os.path.normpath(filepath)):
+            return False
+    for filepath, (links, _) in parsed.items():
+        per_file[filepath] = results['classify'](links)
+    results.update(merge_results(results['filepaths'], [per_file[fp] for fp in results['filepaths']]))
+    return True
+
+
+class Watcher:
+    """
+    --watch: the link graph of one scan kept in memory and updated as files
+    change, polling mtime snapshots (no dependencies).
+
+    Each poll stats the markdown files under docs_dir against the cache's
+    size/mtime snapshot and the directories of link targets against theirs.
+    Only affected sources are re-classified: changed files, files linking
+    to a target that appeared or disappeared, and files linking to a file
+    whose anchors changed. Changes in their issues are printed as a delta.
+    """
+
+    def __init__(self, docs_dir: str, cache: LinkCache, jobs: int = 1):
+        self.docs_dir = docs_dir
+        self.cache = cache
+        self.results = scan_docs(docs_dir, cache, jobs, keep_valid=False)
+        self.per_file = self.results['per_file']
+        self.anchors = self.results['anchors']
+        self.classify = self.results['classify']
+
+    def poll(self) -> Optional[tuple]:
+        """
+        Apply changes since the last poll.
+
+        Returns:
+            None if nothing changed, else (changed files, issues added,
+            issues removed) - issues as (kind, file, info)
+        """
+        cache = self.cache
+        filepaths = list_docs(self.docs_dir)
+        seen = set(filepaths)
+        stale = [fp for fp in filepaths if not cache.fresh(fp)]
+        deleted = [fp for fp in cache.files if fp not in seen]
+
+        cache.index = PathIndex()  # Listings may be outdated
+        affected = cache.refresh_targets()
+        if not stale and not deleted and not affected:
+            return None
+
+        scanned = {os.path.normpath(fp) for fp in cache.files}
+        for path in [p for p in self.anchors.anchors if p not in scanned]:
+            del self.anchors.anchors[path]  # Targets outside docs_dir: parse again on use
+        added, removed = [], []
+        for filepath in deleted:
+            affected |= cache.reverse.get(os.path.normpath(filepath), set())
+            cache.forget(filepath)
+            old = self.per_file.pop(filepath, None) or {}
+            removed += [(kind, filepath, info) for kind in RESULT_KEYS[:-1] for info in old.get(kind, ())]
+        for filepath in stale:
+            before = set(cache.files[filepath]['anchors']) if filepath in cache.files else None
+            try:
+                cache.update(filepath, *read_file(filepath, cache.sha1(filepath)))
+            except Exception as e:
+                print(f"Error scanning {filepath}: {e}", file=sys.stderr)
+                cache.forget(filepath)
+            entry = cache.files.get(filepath)
+            self.anchors.add(filepath, entry['anchors'] if entry else [])
+            if before != set(entry['anchors'] if entry else ()):
+                affected |= cache.reverse.get(os.path.normpath(filepath), set())
+            affected.add(filepath)
+
+        for filepath in sorted(affected & seen):
+            old = self.per_file.get(filepath) or {}
+            new = self.classify(cache.files[filepath]['links'] if filepath in cache.files else [], filepath)
+            self.per_file[filepath] = new
+            for kind in RESULT_KEYS[:-1]:  # Issues, not valid links
+                before = {(i['line'], i['link']): i for i in old.get(kind, ())}
+                after = {(i['line'], i['link']): i for i in new[kind]}
+                added += [(kind, filepath, after[k]) for k in after if k not in before]
+                removed += [(kind, filepath, before[k]) for k in before if k not in after]
+
+        self.results.update(merge_results(filepaths, [self.per_file[fp] for fp in filepaths]))
+        return stale + deleted, added, removed
+
+    def run(self, interval: float = 0.5) -> None:
+        """Poll until interrupted, printing each delta; saves the cache on exit."""
+        print_summary(self.results)
+        print(f"Watching {self.docs_dir} (Ctrl-C to stop)")
+        try:
+            while True:
+                time.sleep(interval)
+                start = time.perf_counter()
+                delta = self.poll()
+                if delta is None:
+                    continue
+                changed, added, removed = delta
+                elapsed = (time.perf_counter() - start) * 1000
+                files = ', '.join(changed[:3]) + (f" (+{len(changed) - 3})" if len(changed) > 3 else '')
+                print(f"\n[{time.strftime('%H:%M:%S')}] {files or 'link targets changed'} ({elapsed:.0f} ms)")
+                for sign, issues in (('+', added), ('-', removed)):
+                    for kind, fp, info in issues:
+                        print(f"  {sign} {kind:<17} {fp}:{info['line']} -> {info['link']}")
+                print(
+                    f"  Broken: {len(self.results['broken'])} | Incorrect: {len(self.results['incorrect_marking'])}"
+                    f" | Broken anchors: {len(self.results['broken_anchor'])}"
+                    f" | Coming Soon: {len(self.results['coming_soon'])}"
+                )
+                sys.stdout.flush()
+        except KeyboardInterrupt:
+            print()
+        finally:
+            self.cache.save(set(self.per_file))
+
+
+class LinkGraph:
+    """
+    Source -> target edges of a scan, with paths interned to integer ids.
+
+    paths:   id -> path; ids below docs are the scanned files, in walk order,
+             the rest are targets outside docs_dir or missing
+    sources, targets, status: one entry per link, in typed arrays (status
+             indexes RESULT_KEYS), so 100k+ documents cost a few bytes per
+             link instead of a dict each
+
+    A link to a directory counts as a link to its README.md when that is a
+    scanned file, as GitHub renders it.
+    """
+
+    def __init__(self, filepaths: list):
+        self.paths = [os.path.normpath(fp) for fp in filepaths]
+        self.ids = {path: index for index, path in enumerate(self.paths)}
+        self.docs = len(self.paths)
+        self.sources = array('I')
+        self.targets = array('I')
+        self.status = array('B')
+
+    @classmethod
+    def from_scan(cls, scan: 'DocsScan') -> 'LinkGraph':
+        """
+        Graph of a scan, built from its per-file stream: each file's links
+        are added as it is classified, valid ones from their targets alone
+        (scan.valid_targets), so no link is kept as a dict.
+        """
+        graph = cls(scan.filepaths)
+        valid = RESULT_KEYS.index('valid')
+        for source, (_, results) in enumerate(scan):
+            for code, key in enumerate(RESULT_KEYS):
+                for info in results[key]:
+                    graph.link(source, info['resolved'], code)
+            for target in results['valid_targets']:
+                graph.link(source, target, valid)
+        return graph
+
+    def link(self, source: int, target: str, code: int) -> None:
+        """Add a link from a scanned file (by id) to a resolved target."""
+        if target not in self.ids:
+            readme = os.path.join(target, 'README.md')
+            if self.ids.get(readme, self.docs) < self.docs:
+                target = readme
+        self.add(source, self.intern(target), code)
+
+    def intern(self, path: str) -> int:
+        node = self.ids.get(path)
+        if node is None:
+            node = self.ids[path] = len(self.paths)
+            self.paths.append(path)
+        return node
+
+    def add(self, source: int, target: int, code: int) -> None:
+        self.sources.append(source)
+        self.targets.append(target)
+        self.status.append(code)
+
+    def _existing(self, code: int) -> bool:
+        return RESULT_KEYS[code] not in ('broken', 'coming_soon')
+
+    def inbound(self) -> array:
+        """Links into each node from other files (to existing targets)."""
+        counts = array('I', bytes(4 * len(self.paths)))
+        existing = [self._existing(code) for code in range(len(RESULT_KEYS))]
+        for source, target, code in zip(self.sources, self.targets, self.status):
+            if source != target and existing[code]:
+                counts[target] += 1
+        return counts
+
+    def orphans(self, inbound: array, roots: list) -> list:
+        """Scanned files no other file links to (roots excluded)."""
+        return [self.paths[node] for node in range(self.docs) if not inbound[node] and node not in roots]
+
+    def unreachable(self, roots: list) -> list:
+        """Scanned files no chain of links leads to from the roots."""
+        # Adjacency of doc -> doc links as offsets into one array (CSR)
+        existing = [self._existing(code) for code in range(len(RESULT_KEYS))]
+        offsets = array('I', bytes(4 * (self.docs + 1)))
+        for source, target, code in zip(self.sources, self.targets, self.status):
+            if target < self.docs and existing[code]:
+                offsets[source + 1] += 1
+        for node in range(self.docs):
+            offsets[node + 1] += offsets[node]
+        adjacency = array('I', bytes(4 * offsets[self.docs]))
+        filled = array('I', offsets[:-1])
+        for source, target, code in zip(self.sources, self.targets, self.status):
+            if target < self.docs and existing[code]:
+                adjacency[filled[source]] = target
+                filled[source] += 1
+
+        seen = bytearray(self.docs)
+        pending = list(roots)
+        for root in roots:
+            seen[root] = 1
+        while pending:
+            node = pending.pop()
+            for target in adjacency[offsets[node]:offsets[node + 1]]:
+                if not seen[target]:
+                    seen[target] = 1
+                    pending.append(target)
+        return [self.paths[node] for node in range(self.docs) if not seen[node]]
+
+    def coming_soon(self) -> list:
+        """(target, links) for targets of links marked coming soon, most linked first."""
+        code = RESULT_KEYS.index('coming_soon')
+        counts = defaultdict(int)
+        for target, status in zip(self.targets, self.status):
+            if status == code:
+                counts[target] += 1
+        return [(self.paths[node], count) for node, count in sorted(counts.items(), key=lambda c: (-c[1], c[0]))]
+
+    def roots(self, docs_dir: str) -> list:
+        """README.md / index.md at the top of docs_dir."""
+        names = [os.path.normpath(os.path.join(docs_dir, name)) for name in GRAPH_ROOTS]
+        return [self.ids[name] for name in names if self.ids.get(name, self.docs) < self.docs]
+
+    def analyze(self, docs_dir: str, top: int = 20) -> dict:
+        roots = self.roots(docs_dir)
+        inbound = self.inbound()
+        hubs = sorted(range(len(self.paths)), key=lambda node: -inbound[node])[:top]
+        return {
+            'documents': self.docs,
+            'other_targets': len(self.paths) - self.docs,
+            'links': len(self.sources),
+            'roots': [self.paths[node] for node in roots],
+            'orphans': self.orphans(inbound, roots),
+            'unreachable': self.unreachable(roots),
+            'hubs': [(self.paths[node], inbound[node]) for node in hubs if inbound[node]],
+            'coming_soon': self.coming_soon()[:top],
+        }
+
+
+def print_graph(graph: LinkGraph, docs_dir: str, output: str = 'text', top: int = 20):
+    """Print link graph analytics (text), or export the graph (json/csv)."""
+    stats = graph.analyze(docs_dir, top)
+    if output == 'csv':
+        writer = csv.writer(sys.stdout)
+        writer.writerow(['source', 'target', 'status'])
+        paths = graph.paths
+        for source, target, code in zip(graph.sources, graph.targets, graph.status):
+            writer.writerow([paths[source], paths[target], RESULT_KEYS[code]])
+        return
+    if output == 'json':
+        print(json.dumps({
+            **stats,
+            'nodes': graph.paths,
+            'statuses': RESULT_KEYS,
+            'edges': {
+                'source': graph.sources.tolist(),
+                'target': graph.targets.tolist(),
+                'status': graph.status.tolist(),
+            },
+        }, separators=(',', ':')))
+        return
 
-    for root, _, files in os.walk(docs_dir):
-        for file in files:
-            if file.endswith('.md'):
-                filepath = os.path.join(root, file)
-                results = scan_file(filepath)
+    print("=" * 70)
+    print("MARKDOWN LINK GRAPH")
+    print("=" * 70)
+    print(f"  Documents: {stats['documents']} | Other targets: {stats['other_targets']} | Links: {stats['links']}")
+    print(f"  Roots: {', '.join(stats['roots']) or '(none)'}")
+    print()
+    sections = (
+        ("ORPHANS: No inbound links from other files", stats['orphans']),
+        ("UNREACHABLE: No chain of links from the roots", stats['unreachable']),
+    )
+    for title, paths in sections:
+        print(f"## {title}: {len(paths)}")
+        print("-" * 60)
+        for path in paths[:top]:
+            print(f"  {path}")
+        if len(paths) > top:
+            print(f"  ... and {len(paths) - top} more")
+        print()
+    for title, counts in (("HUBS: Most linked", stats['hubs']), ("PLANNED: Most linked 'coming soon' targets", stats['coming_soon'])):
+        print(f"## {title}")
+        print("-" * 60)
+        for path, count in counts:
+            print(f"  {count:>6}  {path}")
+        if not counts:
+            print("  (none)")
+        print()
 
-                all_results['files_scanned'] += 1
-                all_results['broken'].extend([(filepath, i) for i in results['broken']])
-                all_results['coming_soon'].extend([(filepath, i) for i in results['coming_soon']])
-                all_results['incorrect_marking'].extend([(filepath, i) for i in results['incorrect_marking']])
-                all_results['valid'].extend([(filepath, i) for i in results['valid']])
 
-    return all_results
+def case_mismatches(results: dict) -> int:
+    """Broken links that only resolve on a case-insensitive filesystem."""
+    return sum(1 for _, info in results['broken'] if 'case_match' in info)
 
 
 def print_report(results: dict, verbose: bool = True):
@@ -198,7 +1392,8 @@ def print_report(results: dict, verbose: bool = True):
     print("-" * 60)
     if verbose and results['broken']:
         for fp, info in sorted(results['broken'], key=lambda x: x[0]):
-            print(f"  {fp}:{info['line']} -> {info['link']}")
+            hint = f" (case differs: {info['case_match']})" if 'case_match' in info else ""
+            print(f"  {fp}:{info['line']} -> {info['link']}{hint}")
     print()
 
     # Incorrect markings
@@ -209,8 +1404,16 @@ def print_report(results: dict, verbose: bool = True):
             print(f"  {fp}:{info['line']} -> {info['link']}")
     print()
 
+    # Broken anchors
+    print(f"## 3. BROKEN ANCHORS: File exists, #anchor not found: {len(results['broken_anchor'])}")
+    print("-" * 60)
+    if verbose and results['broken_anchor']:
+        for fp, info in sorted(results['broken_anchor'], key=lambda x: x[0]):
+            print(f"  {fp}:{info['line']} -> {info['link']}")
+    print()
+
     # Coming soon (planned content)
-    print(f"## 3. PLANNED CONTENT: Links marked 'coming soon': {len(results['coming_soon'])}")
+    print(f"## 4. PLANNED CONTENT: Links marked 'coming soon': {len(results['coming_soon'])}")
     print("-" * 60)
     if verbose and results['coming_soon']:
         by_dest = defaultdict(list)
@@ -225,9 +1428,11 @@ def print_report(results: dict, verbose: bool = True):
     print("SUMMARY")
     print("=" * 70)
     print(f"  Files scanned: {results['files_scanned']}")
-    print(f"  Valid links: {len(results['valid'])}")
+    print(f"  Valid links: {results['valid_links']}")
     print(f"  Broken links (ACTION: mark coming soon): {len(results['broken'])}")
+    print(f"  ...of which only resolve ignoring case (ACTION: fix case): {case_mismatches(results)}")
     print(f"  Incorrect markings (ACTION: remove coming soon): {len(results['incorrect_marking'])}")
+    print(f"  Broken anchors (ACTION: fix heading reference): {len(results['broken_anchor'])}")
     print(f"  Planned content (coming soon): {len(results['coming_soon'])}")
 
     # Unique destinations to create
@@ -235,46 +1440,115 @@ def print_report(results: dict, verbose: bool = True):
     print(f"  Unique destinations to create: {len(unique_dests)}")
 
 
-def print_json(results: dict):
-    """Print results as JSON for CI integration."""
-    output = {
-        'summary': {
-            'files_scanned': results['files_scanned'],
-            'valid_links': len(results['valid']),
-            'broken_links': len(results['broken']),
-            'incorrect_markings': len(results['incorrect_marking']),
-            'coming_soon_links': len(results['coming_soon']),
-        },
-        'broken': [
-            {'file': fp, **info}
-            for fp, info in results['broken']
-        ],
-        'incorrect_marking': [
-            {'file': fp, **info}
-            for fp, info in results['incorrect_marking']
-        ],
-        'coming_soon_destinations': list(set(
-            info['link'] for _, info in results['coming_soon']
-        ))
+def json_summary(results: dict) -> dict:
+    """Counts for --json and --ndjson."""
+    return {
+        'files_scanned': results['files_scanned'],
+        'valid_links': results['valid_links'],
+        'broken_links': len(results['broken']),
+        'case_mismatches': case_mismatches(results),
+        'incorrect_markings': len(results['incorrect_marking']),
+        'broken_anchors': len(results['broken_anchor']),
+        'coming_soon_links': len(results['coming_soon']),
     }
-    print(json.dumps(output, indent=2))
+
+
+def print_json(results: dict, verbose: bool = False):
+    """
+    Print results as JSON for CI integration (valid links too if verbose).
+
+    Written one finding at a time, so the document is never built as one
+    string; the output is the same as json.dumps(..., indent=2).
+    """
+    keys = ['broken', 'incorrect_marking', 'broken_anchor'] + (['valid'] if verbose else [])
+    out = sys.stdout
+    out.write('{\n  "summary": ')
+    out.write(json.dumps(json_summary(results), indent=2).replace('\n', '\n  '))
+    for key in keys:
+        out.write(f',\n  "{key}": ')
+        if not results[key]:
+            out.write('[]')
+            continue
+        for index, (fp, info) in enumerate(results[key]):
+            out.write(',\n    ' if index else '[\n    ')
+            out.write(json.dumps({'file': fp, **info}, indent=2).replace('\n', '\n    '))
+        out.write('\n  ]')
+    destinations = sorted(set(info['link'] for _, info in results['coming_soon']))
+    out.write(',\n  "coming_soon_destinations": ')
+    out.write(json.dumps(destinations, indent=2).replace('\n', '\n  '))
+    out.write('\n}\n')
+
+
+def print_ndjson(scan: 'DocsScan') -> dict:
+    """
+    Stream findings as newline-delimited JSON while the scan runs: one
+    object per finding ({"type": kind, "file": ..., ...}, valid links only
+    if the scan keeps them), flushed per file, then a {"type": "summary"}
+    line with the --json summary.
+
+    Findings are only counted once written, so memory does not grow with
+    the number of findings.
+
+    Returns:
+        The summary (as json_summary() returns it)
+    """
+    counts = {key: 0 for key in RESULT_KEYS}
+    files = valid = mismatches = 0
+    out = sys.stdout
+    for filepath, file_results in scan:
+        files += 1
+        valid += file_results['valid_links']
+        mismatches += sum(1 for info in file_results['broken'] if 'case_match' in info)
+        for key in RESULT_KEYS:
+            counts[key] += len(file_results[key])
+            for info in file_results[key]:
+                out.write(json.dumps({'type': key, 'file': filepath, **info}) + '\n')
+        out.flush()
+    summary = {
+        'files_scanned': files,
+        'valid_links': valid,
+        'broken_links': counts['broken'],
+        'case_mismatches': mismatches,
+        'incorrect_markings': counts['incorrect_marking'],
+        'broken_anchors': counts['broken_anchor'],
+        'coming_soon_links': counts['coming_soon'],
+    }
+    out.write(json.dumps({'type': 'summary', **summary}) + '\n')
+    return summary
+
+
+def exit_code(summary: dict) -> int:
+    """Exit code for a json_summary() (see module docstring)."""
+    if summary['broken_links'] > 0:
+        return 1
+    elif summary['incorrect_markings'] > 0:
+        return 2
+    elif summary['broken_anchors'] > 0:
+        return 3
+    return 0
 
 
 def print_summary(results: dict):
     """Print a quick summary only."""
     broken = len(results['broken'])
     incorrect = len(results['incorrect_marking'])
+    anchors = len(results['broken_anchor'])
     coming_soon = len(results['coming_soon'])
 
-    status = "PASS" if broken == 0 and incorrect == 0 else "FAIL"
+    status = "PASS" if broken == 0 and incorrect == 0 and anchors == 0 else "FAIL"
 
     print(f"Link Check: {status}")
-    print(f"  Broken: {broken} | Incorrect: {incorrect} | Coming Soon: {coming_soon}")
+    print(f"  Broken: {broken} | Incorrect: {incorrect} | Broken anchors: {anchors} | Coming Soon: {coming_soon}")
 
+    if case_mismatches(results) > 0:
+        print(f"  {case_mismatches(results)} broken links only resolve on case-insensitive filesystems")
     if broken > 0:
         print(f"  Run with --fix to auto-mark broken links as 'coming soon'")
-    if incorrect > 0:
+    manual = sum(1 for _, info in results['incorrect_marking'] if not fixable('incorrect_marking', info))
+    if incorrect > manual:
         print(f"  Run with --fix to remove incorrect 'coming soon' markers")
+    if manual > 0:
+        print(f"  {manual} incorrect markings are not the standard marker: remove them by hand")
 
 
 def main():
@@ -288,11 +1562,26 @@ def main():
         action='store_true',
         help='Output results as JSON'
     )
+    parser.add_argument(
+        '--ndjson',
+        action='store_true',
+        help='Stream findings as newline-delimited JSON while scanning (for CI)'
+    )
+    parser.add_argument(
+        '--verbose', '-v',
+        action='store_true',
+        help='Include valid links in --json/--ndjson output'
+    )
     parser.add_argument(
         '--fix',
         action='store_true',
         help='Auto-fix issues (add/remove coming soon markers)'
     )
+    parser.add_argument(
+        '--dry-run',
+        action='store_true',
+        help='With --fix, print the changes as a diff without writing files'
+    )
     parser.add_argument(
         '--summary',
         action='store_true',
@@ -303,49 +1592,117 @@ def main():
         default=DOCS_DIR,
         help=f'Directory to scan (default: {DOCS_DIR})'
     )
+    parser.add_argument(
+        '--cache',
+        default=CACHE_FILE,
+        help=f'Link cache file (default: {CACHE_FILE})'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Full scan without reading or writing the link cache'
+    )
+    parser.add_argument(
+        '--watch',
+        action='store_true',
+        help='Keep running: re-check files as they change and print what changed'
+    )
+    parser.add_argument(
+        '--interval',
+        type=float,
+        default=0.5,
+        help='Seconds between polls in --watch mode (default: 0.5)'
+    )
+    parser.add_argument(
+        '--graph',
+        nargs='?',
+        const='text',
+        choices=('text', 'json', 'csv'),
+        help='Link graph analytics (orphans, unreachable pages, hubs), or export it as json/csv'
+    )
+    parser.add_argument(
+        '--top',
+        type=int,
+        default=20,
+        help='Entries per list in --graph output (default: 20)'
+    )
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=1,
+        help='Parallel scan processes (0 = one per CPU, default: 1)'
+    )
 
     args = parser.parse_args()
+    if args.dry_run and not args.fix:
+        parser.error('--dry-run requires --fix')
+    if args.watch and (args.fix or args.json):
+        parser.error('--watch cannot be combined with --fix or --json')
+    if args.graph and (args.fix or args.json or args.watch):
+        parser.error('--graph cannot be combined with --fix, --json or --watch')
+    if args.ndjson and (args.fix or args.json or args.watch or args.graph):
+        parser.error('--ndjson cannot be combined with --fix, --json, --watch or --graph')
+    jobs = args.jobs if args.jobs > 0 else os.cpu_count() or 1
+    # Valid links are only counted unless they are printed
+    keep_valid = args.verbose
+
+    if args.watch:
+        # Without --no-cache the graph starts from (and is saved to) the cache
+        cache = LinkCache('' if args.no_cache else args.cache, args.dir)
+        Watcher(args.dir, cache, jobs).run(args.interval)
+        return
+
+    if args.ndjson:
+        cache = None if args.no_cache else LinkCache(args.cache, args.dir)
+        summary = print_ndjson(DocsScan(args.dir, cache, jobs, keep_valid))
+        sys.exit(exit_code(summary))
+
+    if args.graph:
+        cache = None if args.no_cache else LinkCache(args.cache, args.dir)
+        scan = DocsScan(args.dir, cache, jobs, keep_valid=False, valid_targets=True)
+        print_graph(LinkGraph.from_scan(scan), args.dir, args.graph, args.top)
+        return
+
+    def scan():
+        cache = None if args.no_cache else LinkCache(args.cache, args.dir)
+        return scan_docs(args.dir, cache, jobs, keep_valid)
 
     # Scan documentation
-    results = scan_docs(args.dir)
+    results = scan()
 
     # Auto-fix if requested
     if args.fix:
-        fixed_broken = 0
-        fixed_incorrect = 0
-
-        # Fix broken links (add coming soon)
-        for fp, info in results['broken']:
-            if fix_broken_link(fp, info['line'], info['link']):
-                fixed_broken += 1
-
-        # Fix incorrect markings (remove coming soon)
-        for fp, info in results['incorrect_marking']:
-            if fix_incorrect_marking(fp, info['line'], info['link']):
-                fixed_incorrect += 1
-
-        print(f"Fixed {fixed_broken} broken links (added 'coming soon')")
-        print(f"Fixed {fixed_incorrect} incorrect markings (removed 'coming soon')")
+        fixed, rewritten, diffs, unfixable = fix_results(results, dry_run=args.dry_run)
+
+        if args.dry_run:
+            sys.stdout.write(''.join(diffs))
+            print(f"Would fix {fixed['broken']} broken links (add 'coming soon')")
+            print(f"Would fix {fixed['incorrect_marking']} incorrect markings (remove 'coming soon')")
+            print(f"Files that would change: {len(rewritten)}")
+        else:
+            print(f"Fixed {fixed['broken']} broken links (added 'coming soon')")
+            print(f"Fixed {fixed['incorrect_marking']} incorrect markings (removed 'coming soon')")
+        if unfixable:
+            print(f"Could not fix {len(unfixable)} (edit by hand):")
+            for fp, kind, info in unfixable:
+                print(f"  {fp}:{info['line']} -> {info['link']} ({kind})")
         print()
 
-        # Re-scan after fixes
-        results = scan_docs(args.dir)
+        if not args.dry_run:
+            # Update results for the rewritten files (re-scan if anchors moved)
+            if not update_results(results, rewritten):
+                results = scan()
 
     # Output results
     if args.json:
-        print_json(results)
+        print_json(results, args.verbose)
     elif args.summary:
         print_summary(results)
     else:
         print_report(results)
 
     # Exit code
-    if len(results['broken']) > 0:
-        sys.exit(1)
-    elif len(results['incorrect_marking']) > 0:
-        sys.exit(2)
-    else:
-        sys.exit(0)
+    sys.exit(exit_code(json_summary(results)))
 
 
 if __name__ == "__main__":
@@ -51,9 +51,26 @@ echo "📚 Installing library files..."
 cp "$HOOKS_SOURCE/lib/__init__.py" "$HOOKS_TARGET/lib/"
 cp "$HOOKS_SOURCE/lib/send_event.py" "$HOOKS_TARGET/lib/"
 cp "$HOOKS_SOURCE/lib/enrich.py" "$HOOKS_TARGET/lib/"
+cp "$HOOKS_SOURCE/lib/state.py" "$HOOKS_TARGET/lib/"
+cp "$HOOKS_SOURCE/lib/spool.py" "$HOOKS_TARGET/lib/"
+cp "$HOOKS_SOURCE/lib/ipc.py" "$HOOKS_TARGET/lib/"
+cp "$HOOKS_SOURCE/lib/breaker.py" "$HOOKS_TARGET/lib/"
+cp "$HOOKS_SOURCE/lib/payload.py" "$HOOKS_TARGET/lib/"
+cp "$HOOKS_SOURCE/lib/blobs.py" "$HOOKS_TARGET/lib/"
+cp "$HOOKS_SOURCE/lib/context.py" "$HOOKS_TARGET/lib/"
+cp "$HOOKS_SOURCE/lib/agents.py" "$HOOKS_TARGET/lib/"
+cp "$HOOKS_SOURCE/lib/metrics.py" "$HOOKS_TARGET/lib/"
+cp "$HOOKS_SOURCE/lib/policy.py" "$HOOKS_TARGET/lib/"
+cp "$HOOKS_SOURCE/lib/batch.py" "$HOOKS_TARGET/lib/"
+cp "$HOOKS_SOURCE/lib/store.py" "$HOOKS_TARGET/lib/"
+cp "$HOOKS_SOURCE/lib/timing.py" "$HOOKS_TARGET/lib/"
+cp "$HOOKS_SOURCE/lib/sinks.py" "$HOOKS_TARGET/lib/"
+cp "$HOOKS_SOURCE/lib/redact.py" "$HOOKS_TARGET/lib/"
 
-# Copy hook files
+# Copy hook dispatcher and per-event wrappers
 echo "🪝 Installing hooks..."
+cp "$HOOKS_SOURCE/dispatch.py" "$HOOKS_TARGET/"
+echo "   ✓ dispatch.py"
 for hook in pre_tool_use post_tool_use user_prompt_submit stop subagent_stop notification pre_compact; do
     if [ -f "$HOOKS_SOURCE/${hook}.py" ]; then
         cp "$HOOKS_SOURCE/${hook}.py" "$HOOKS_TARGET/"
@@ -62,9 +79,28 @@ for hook in pre_tool_use post_tool_use user_prompt_submit stop subagent_stop not
     fi
 done
 
+# Copy spool flusher (used with AIOX_MONITOR_DELIVERY=spool)
+cp "$HOOKS_SOURCE/flush.py" "$HOOKS_TARGET/"
+echo "   ✓ flush.py"
+
+# Copy hook daemon (opt-in with AIOX_MONITOR_DAEMON=1)
+cp "$HOOKS_SOURCE/daemon.py" "$HOOKS_TARGET/"
+echo "   ✓ daemon.py"
+
+# Copy event store replay (started when the monitor comes back)
+cp "$HOOKS_SOURCE/replay.py" "$HOOKS_TARGET/"
+echo "   ✓ replay.py"
+
+# Copy offline query CLI for the event store
+cp "$HOOKS_SOURCE/query.py" "$HOOKS_TARGET/"
+echo "   ✓ query.py"
+
 # Make all Python files executable
 chmod +x "$HOOKS_TARGET"/*.py 2>/dev/null || true
 
+# Precompile bytecode so the first hook run doesn't pay compilation
+python3 -m compileall -q "$HOOKS_TARGET" >/dev/null 2>&1 || true
+
 echo ""
 echo "✅ Hooks installed successfully!"
 echo ""
@@ -77,5 +113,8 @@ echo "║                                                                ║"
 echo "║  2. (Optional) Set custom server URL:                          ║"
 echo "║     export AIOX_MONITOR_URL=http://localhost:4001              ║"
 echo "║                                                                ║"
-echo "║  3. Start using Claude Code - events will be captured!         ║"
+echo "║  3. (Optional) Spool events instead of blocking on HTTP:       ║"
+echo "║     export AIOX_MONITOR_DELIVERY=spool                         ║"
+echo "║                                                                ║"
+echo "║  4. Start using Claude Code - events will be captured!         ║"
 echo "╚════════════════════════════════════════════════════════════════╝"